@@ -0,0 +1,169 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+from requests import Response
+
+"""
+Defines classes for capturing the outcome of operations that send many requests to
+MarkLogic on behalf of many URIs, such as deleting, patching, or transforming
+documents in bulk.
+"""
+
+
+class BulkFailure:
+    """
+    Captures a single failed request within a bulk operation.
+
+    :param uris: the URIs that were included in the failed request.
+    :param response: the response returned by MarkLogic, if one was received.
+    :param error: the exception that was raised, if the request could not be
+    completed.
+    """
+
+    def __init__(
+        self, uris: list[str], response: Response = None, error: Exception = None
+    ):
+        self.uris = uris
+        self.response = response
+        self.error = error
+
+    @property
+    def message(self) -> str:
+        """
+        Returns the error message from MarkLogic if a response was received, and the
+        text of the exception otherwise.
+        """
+        if self.response is not None:
+            return self.response.text
+        return str(self.error)
+
+    @property
+    def details(self) -> dict:
+        """
+        Returns the "errorResponse" object from a MarkLogic REST error response -
+        containing keys such as "statusCode", "messageCode", and "message" - or an
+        empty dict if the response does not contain one.
+        """
+        if self.response is None:
+            return {}
+        try:
+            body = self.response.json()
+        except ValueError:
+            return {}
+        return body.get("errorResponse", {}) if isinstance(body, dict) else {}
+
+    def __repr__(self):
+        return "{!r}".format({"uris": self.uris, "message": self.message})
+
+
+class BulkResult:
+    """
+    Aggregates the outcome of each request sent by a bulk operation. Every URI
+    processed by the operation is either in the list of succeeded URIs or in exactly
+    one failure.
+    """
+
+    def __init__(self):
+        self.succeeded: list[str] = []
+        self.failures: list[BulkFailure] = []
+
+    @property
+    def ok(self) -> bool:
+        return len(self.failures) == 0
+
+    @property
+    def failed(self) -> list[str]:
+        """
+        Returns the URIs associated with every failed request.
+        """
+        return [uri for failure in self.failures for uri in failure.uris]
+
+    @property
+    def failures_by_uri(self) -> dict:
+        """
+        Returns a dict mapping each failed URI to its BulkFailure.
+        """
+        return {uri: failure for failure in self.failures for uri in failure.uris}
+
+    def add_success(self, uris: list[str]) -> None:
+        self.succeeded.extend(uris)
+
+    def add_failure(
+        self, uris: list[str], response: Response = None, error: Exception = None
+    ) -> None:
+        self.failures.append(BulkFailure(uris, response, error))
+
+    def __repr__(self):
+        return "{!r}".format(
+            {"succeeded": len(self.succeeded), "failed": len(self.failed)}
+        )
+
+
+class BulkProgress:
+    """
+    Reports the outcome of a single batch within a bulk operation that streams its
+    progress, along with the state of the operation after the batch completed.
+
+    :param uris: the URIs in the batch.
+    :param failure: a BulkFailure if the batch failed; None otherwise.
+    :param processed: the number of URIs processed so far, including this batch.
+    :param failed: the number of URIs in failed batches so far, including this batch.
+    :param checkpoint: the URI after which every batch has completed, whether
+    successfully or not; pass this to the operation to resume after an interruption.
+    """
+
+    def __init__(
+        self,
+        uris: list[str],
+        failure: BulkFailure,
+        processed: int,
+        failed: int,
+        checkpoint: str,
+    ):
+        self.uris = uris
+        self.failure = failure
+        self.processed = processed
+        self.failed = failed
+        self.checkpoint = checkpoint
+
+    @property
+    def ok(self) -> bool:
+        return self.failure is None
+
+    def __repr__(self):
+        return "{!r}".format(
+            {
+                "uris": len(self.uris),
+                "ok": self.ok,
+                "processed": self.processed,
+                "failed": self.failed,
+                "checkpoint": self.checkpoint,
+            }
+        )
+
+
+class SyncResult(BulkResult):
+    """
+    Captures the outcome of synchronizing a local copy of documents with MarkLogic. The
+    succeeded URIs are those of the new and changed documents that were read.
+
+    :param deleted: the URIs of the documents that were recorded by a previous
+    synchronization but that no longer exist or no longer match the query criteria.
+    :param unchanged: the number of documents that had not changed since they were
+    last read.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.deleted: list[str] = []
+        self.unchanged = 0
+
+    def __repr__(self):
+        return "{!r}".format(
+            {
+                "succeeded": len(self.succeeded),
+                "failed": len(self.failed),
+                "deleted": len(self.deleted),
+                "unchanged": self.unchanged,
+            }
+        )
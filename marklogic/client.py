@@ -2,18 +2,59 @@
 
 
 import json
+import threading
+import weakref
 import requests
+from contextlib import contextmanager
+from typing import Union
 
 from marklogic.cloud_auth import MarkLogicCloudAuth
-from marklogic.documents import DocumentManager
-from marklogic.internal.eval import process_multipart_mixed_response
-from marklogic.rows import RowManager
-from marklogic.transactions import TransactionManager, Transaction
-from requests.auth import HTTPDigestAuth
+from marklogic.internal.cache import TTLCache
+from marklogic.timeouts import TIME_ARGUMENTS, Deadline
+from marklogic.transactions import Transaction
+from requests.adapters import HTTPAdapter
+from requests.auth import AuthBase, HTTPBasicAuth, HTTPDigestAuth
 from urllib.parse import urljoin
 
 
 class Client(requests.Session):
+    """
+    A requests Session for communicating with MarkLogic. The managers exposed via the
+    "documents", "rows", "query_options", and "transactions" properties - along with
+    the libraries they depend on for encoding and decoding requests and responses -
+    are imported when first used so that importing this module remains fast for
+    short-lived processes.
+
+    If "http2" is True, requests are sent via an HTTP2Adapter, which requires the
+    "http2" extra to be installed. Requests associated with a transaction are always
+    sent via the connection dedicated to the transaction.
+
+    If "timeout" is set, it is used as the requests timeout - either a number of
+    seconds or a tuple of connect and read timeouts - for any request that does not
+    specify its own. Every request also accepts a "deadline" argument - either a
+    Deadline or a number of seconds - and a "cancellation" argument, a
+    CancellationToken; see marklogic.timeouts for more information.
+
+    A single Client can be shared by many threads. Managers are created once, under a
+    lock, and every request is sent via a shared pool that retains up to
+    "max_connections" connections per host; set it to the number of threads that
+    send requests concurrently so that connections are reused rather than discarded.
+    Authentication state that applies to a single request, such as a digest
+    challenge, is kept per thread.
+
+    If "profile" is True, the time spent on each stage of every request - from building
+    the request to parsing its response - is recorded by the Profiler exposed via the
+    "profiler" property; see marklogic.profiling for more information.
+
+    The "compression" argument determines the Accept-Encoding header of every request.
+    If True, the default header of requests is retained, which accepts every encoding
+    that urllib3 can decode; if False, only uncompressed responses are accepted, which
+    avoids the cost of decompression when MarkLogic is on the same network. A string
+    is used as the header itself. A compressed response
+    is decompressed as it is read, including when multipart responses containing
+    documents are parsed as they are received.
+    """
+
     def __init__(
         self,
         base_url: str = None,
@@ -28,9 +69,40 @@ class Client(requests.Session):
         password: str = None,
         cloud_api_key: str = None,
         cloud_token_duration: int = 0,
+        http2: bool = False,
+        timeout=None,
+        profile: bool = False,
+        max_connections: int = 10,
+        compression: Union[bool, str] = True,
     ):
         super(Client, self).__init__()
         self.verify = verify
+        if isinstance(compression, str):
+            self.headers["Accept-Encoding"] = compression
+        elif not compression:
+            self.headers["Accept-Encoding"] = "identity"
+        self.timeout = timeout
+        self.profiler = None
+        if profile:
+            from marklogic.profiling import Profiler
+
+            self.profiler = Profiler()
+        self._local = threading.local()
+        self._managers_lock = threading.Lock()
+        self._transactions_lock = threading.Lock()
+        self._transactions_by_id = weakref.WeakValueDictionary()
+        # Holds results of eval and invoke calls made with a cache TTL.
+        self.eval_cache = TTLCache()
+
+        self._http2 = http2
+        self._max_connections = max_connections
+        # Adapters that each hold a single connection, leased by transactions and
+        # retained once a transaction ends so that their connections are reused.
+        self._idle_adapters = []
+        self._adapters_lock = threading.Lock()
+        self._adapter = self._create_adapter(max_connections)
+        self.mount("https://", self._adapter)
+        self.mount("http://", self._adapter)
 
         if cloud_api_key:
             port = 443 if port == 0 else port
@@ -54,8 +126,27 @@ class Client(requests.Session):
     def request(self, method, url, *args, **kwargs):
         """
         Overrides the requests function to generate the complete URL before the request
-        is sent.
+        is sent. A request that includes the ID of a transaction created via this
+        client in its "txid" parameter is sent via that transaction.
+
+        Also applies this client's default timeout, and limits the timeout to the time
+        remaining until the deadline, if any. Raises DeadlineExceeded if the deadline
+        has passed and OperationCancelled if the cancellation token was cancelled.
         """
+        transaction = self._transaction_for_params(kwargs.get("params"))
+        if transaction is not None:
+            return transaction.request(method, url, *args, **kwargs)
+        deadline = kwargs.pop("deadline", None)
+        cancellation = kwargs.pop("cancellation", None)
+        if cancellation is not None:
+            cancellation.check()
+        if self.timeout is not None:
+            kwargs.setdefault("timeout", self.timeout)
+        if deadline is not None:
+            if not isinstance(deadline, Deadline):
+                deadline = Deadline(deadline)
+            deadline.check()
+            kwargs["timeout"] = deadline.limit(kwargs.get("timeout"))
         if hasattr(self, "base_path"):
             if url.startswith("/"):
                 url = url[1:]
@@ -71,25 +162,169 @@ class Client(requests.Session):
         'request' method is invoked.
         """
         request.url = urljoin(self.base_url, request.url)
-        return super(Client, self).prepare_request(request, *args, **kwargs)
+        profiler = self.profiler
+        if profiler is None:
+            return super(Client, self).prepare_request(request, *args, **kwargs)
+        auth = request.auth or self.auth
+        if auth is not None:
+            request.auth = _ProfiledAuth(auth, profiler)
+        with profiler.stage("request_build"):
+            return super(Client, self).prepare_request(request, *args, **kwargs)
+
+    def send(self, request, **kwargs):
+        """
+        Overrides the requests function so that, when profiling, the time spent
+        sending a request is recorded separately from the time spent reading the body
+        of its response.
+        """
+        profiler = self.profiler
+        if profiler is None:
+            return super(Client, self).send(request, **kwargs)
+        stream = kwargs.pop("stream", False)
+        body = request.body
+        body_length = len(body) if isinstance(body, (bytes, str)) else 0
+        with profiler.stage("send", body_length):
+            response = super(Client, self).send(request, stream=True, **kwargs)
+        response.profiler = profiler
+        if not stream:
+            with profiler.stage("receive") as frame:
+                frame.bytes = len(response.content)
+        return response
+
+    def get_adapter(self, url):
+        """
+        Overrides the requests function so that requests sent while this thread is
+        pinned to a transaction use the adapter dedicated to that transaction. If an
+        adapter other than the one created by this client has been mounted for the
+        URL, it is used instead, and the transaction relies on its cookies alone for
+        host affinity.
+        """
+        adapter = super(Client, self).get_adapter(url)
+        transaction = getattr(self._local, "transaction", None)
+        if transaction is None or adapter is not self._adapter:
+            return adapter
+        return transaction.get_adapter(self._lease_adapter)
+
+    def release_adapter(self, adapter) -> None:
+        """
+        Returns an adapter leased by a transaction that has ended, retaining it for
+        the next transaction unless "max_connections" adapters are already idle.
+        """
+        with self._adapters_lock:
+            if len(self._idle_adapters) < self._max_connections:
+                self._idle_adapters.append(adapter)
+                return
+        adapter.close()
+
+    def close(self):
+        """
+        Overrides the requests function to also close the connections retained for
+        transactions.
+        """
+        with self._adapters_lock:
+            adapters, self._idle_adapters = self._idle_adapters, []
+        for adapter in adapters:
+            adapter.close()
+        super(Client, self).close()
+
+    def _lease_adapter(self):
+        with self._adapters_lock:
+            if self._idle_adapters:
+                return self._idle_adapters.pop()
+        return self._create_adapter(1, block=True)
+
+    def _create_adapter(self, max_connections: int, block: bool = False):
+        """
+        Creates an adapter for the transport configured for this client. If "block"
+        is True, a request waits for one of the adapter's connections to be available
+        rather than opening another one.
+        """
+        if self._http2:
+            from marklogic.http2 import HTTP2Adapter
+
+            return HTTP2Adapter(max_connections, max_connections)
+        return HTTPAdapter(pool_maxsize=max_connections, pool_block=block)
+
+    def register_transaction(self, transaction: Transaction) -> None:
+        """
+        Registers a transaction so that any request including its ID in the "txid"
+        parameter is sent via the transaction. The transaction is not retained once it
+        is no longer referenced elsewhere.
+        """
+        with self._transactions_lock:
+            self._transactions_by_id[transaction.id] = transaction
+
+    @contextmanager
+    def pinned_to(self, transaction: Transaction):
+        """
+        Pins every request sent by the current thread within the context to the
+        connection dedicated to the given transaction.
+        """
+        previous = getattr(self._local, "transaction", None)
+        self._local.transaction = transaction
+        try:
+            yield
+        finally:
+            self._local.transaction = previous
+
+    def _transaction_for_params(self, params) -> Transaction:
+        if getattr(self._local, "transaction", None) is not None:
+            return None
+        if isinstance(params, dict) and params.get("txid"):
+            with self._transactions_lock:
+                return self._transactions_by_id.get(params["txid"])
+        return None
+
+    def _manager(self, name: str, create):
+        """
+        Returns the manager stored under the given attribute name, creating it via the
+        given function if it does not yet exist. A lock ensures that concurrent
+        threads share a single manager.
+        """
+        manager = self.__dict__.get(name)
+        if manager is None:
+            with self._managers_lock:
+                manager = self.__dict__.get(name)
+                if manager is None:
+                    manager = create()
+                    setattr(self, name, manager)
+        return manager
 
     @property
     def documents(self):
-        if not hasattr(self, "_documents"):
-            self._documents = DocumentManager(session=self)
-        return self._documents
+        def create():
+            from marklogic.documents import DocumentManager
+
+            return DocumentManager(session=self)
+
+        return self._manager("_documents", create)
 
     @property
     def rows(self):
-        if not hasattr(self, "_rows"):
-            self._rows = RowManager(session=self)
-        return self._rows
+        def create():
+            from marklogic.rows import RowManager
+
+            return RowManager(session=self)
+
+        return self._manager("_rows", create)
+
+    @property
+    def query_options(self):
+        def create():
+            from marklogic.search import QueryOptionsManager
+
+            return QueryOptionsManager(session=self)
+
+        return self._manager("_query_options", create)
 
     @property
     def transactions(self):
-        if not hasattr(self, "_transactions"):
-            self._transactions = TransactionManager(session=self)
-        return self._transactions
+        def create():
+            from marklogic.transactions import TransactionManager
+
+            return TransactionManager(session=self)
+
+        return self._manager("_transactions", create)
 
     def eval(
         self,
@@ -98,6 +333,8 @@ class Client(requests.Session):
         vars: dict = None,
         tx: Transaction = None,
         return_response: bool = False,
+        cache_ttl: float = None,
+        compact: bool = False,
         **kwargs,
     ):
         """
@@ -114,6 +351,11 @@ class Client(requests.Session):
         object should be returned (True) or if only the data should be returned (False)
         upon a success (2xx) response. Note that if the status code of the response is
         not 2xx, then the entire response is always returned.
+        :param cache_ttl: optional number of seconds for which a successful response
+        is cached in 'eval_cache', keyed by the script and its vars. Only use this for
+        scripts that do not perform updates. See 'invoke' for more information.
+        :param compact: if True, a document returned by the script is represented by
+        a CompactDocument instead of a Document.
         """
         data = {}
         if javascript:
@@ -123,15 +365,18 @@ class Client(requests.Session):
         else:
             raise ValueError("Must define either 'javascript' or 'xquery' argument.")
         if vars:
-            data["vars"] = json.dumps(vars)
-        params = kwargs.pop("params", {})
-        if tx:
-            params["txid"] = tx.id
-        response = self.post("v1/eval", data=data, params=params, **kwargs)
-        return (
-            process_multipart_mixed_response(response)
-            if response.status_code == 200 and not return_response
-            else response
+            data["vars"] = json.dumps(vars, sort_keys=True)
+        language = "javascript" if javascript else "xquery"
+        cache_key = (language, data[language], data.get("vars"))
+        return self._send_eval(
+            "v1/eval",
+            data,
+            cache_key,
+            tx,
+            return_response,
+            cache_ttl,
+            compact,
+            **kwargs,
         )
 
     def invoke(
@@ -140,6 +385,8 @@ class Client(requests.Session):
         vars: dict = None,
         tx: Transaction = None,
         return_response: bool = False,
+        cache_ttl: float = None,
+        compact: bool = False,
         **kwargs,
     ):
         """
@@ -155,16 +402,164 @@ class Client(requests.Session):
         object should be returned (True) or if only the data should be returned (False)
         upon a success (2xx) response. Note that if the status code of the response is
         not 2xx, then the entire response is always returned.
+        :param cache_ttl: optional number of seconds for which a successful response
+        is cached in 'eval_cache', keyed by the module and its vars. Concurrent calls
+        with the same module and vars result in a single request to MarkLogic. The
+        cache is not used when a transaction, 'return_response', or request arguments
+        other than timeouts are given.
+        Cached results can be removed via 'invalidate_eval_cache'.
+        :param compact: if True, a document returned by the module is represented by
+        a CompactDocument instead of a Document.
         """
         data = {"module": module}
         if vars:
-            data["vars"] = json.dumps(vars)
+            data["vars"] = json.dumps(vars, sort_keys=True)
+        cache_key = ("module", module, data.get("vars"))
+        return self._send_eval(
+            "v1/invoke",
+            data,
+            cache_key,
+            tx,
+            return_response,
+            cache_ttl,
+            compact,
+            **kwargs,
+        )
+
+    def eval_batch(
+        self,
+        items: list,
+        language: str = "javascript",
+        tx: Transaction = None,
+        return_response: bool = False,
+        **kwargs,
+    ):
+        """
+        Evaluates many scripts via a single POST to the endpoint defined at
+        https://docs.marklogic.com/REST/POST/v1/eval. The scripts are evaluated in
+        order on MarkLogic via xdmp.eval or xdmp.xqueryEval, which requires the
+        "xdmp-eval" privilege. Returns a list with an EvalResult for each script; an
+        error raised by one script is captured in its EvalResult and does not affect
+        the other scripts.
+
+        :param items: a list in which each item is either a script or a tuple of a
+        script and a dict of its vars.
+        :param language: the language of every script; either "javascript" or
+        "xquery".
+        :param tx: optional REST transaction in which to service this request.
+        :param return_response: boolean specifying if the entire original response
+        object should be returned (True) or if only the data should be returned (False)
+        upon a success (2xx) response. Note that if the status code of the response is
+        not 2xx, then the entire response is always returned.
+        """
+        if language not in ["javascript", "xquery"]:
+            msg = f"Invalid value for 'language' argument: {language}; "
+            msg += "must be one of 'javascript' or 'xquery'."
+            raise ValueError(msg)
+
+        from marklogic.internal.eval import BATCH_SCRIPT, split_batch_results
+
+        batch = []
+        for item in items:
+            script, vars = (item, None) if isinstance(item, str) else item
+            batch.append({"language": language, "script": script, "vars": vars})
+        response = self.eval(
+            javascript=BATCH_SCRIPT,
+            vars={"items": json.dumps(batch)},
+            tx=tx,
+            return_response=True,
+            **kwargs,
+        )
+        if response.status_code != 200 or return_response:
+            return response
+
+        from marklogic.internal.eval import process_multipart_mixed_response
+
+        parts = process_multipart_mixed_response(response)
+        return split_batch_results(parts, len(batch))
+
+    def invalidate_eval_cache(
+        self,
+        module: str = None,
+        javascript: str = None,
+        xquery: str = None,
+        vars: dict = None,
+    ) -> int:
+        """
+        Removes cached eval and invoke results and returns the number of results
+        removed. If no arguments are given, every result is removed; otherwise, only
+        results matching every given argument are removed.
+
+        :param module: the URI of an invoked module.
+        :param javascript: a JavaScript script.
+        :param xquery: an XQuery script.
+        :param vars: the vars that a module or script was called with.
+        """
+        criteria = {}
+        if module:
+            criteria[0] = "module"
+            criteria[1] = module
+        elif javascript:
+            criteria[0] = "javascript"
+            criteria[1] = javascript
+        elif xquery:
+            criteria[0] = "xquery"
+            criteria[1] = xquery
+        if vars is not None:
+            criteria[2] = json.dumps(vars, sort_keys=True) if vars else None
+        return self.eval_cache.invalidate(
+            lambda key: all(key[index] == value for index, value in criteria.items())
+        )
+
+    def _send_eval(
+        self,
+        path: str,
+        data: dict,
+        cache_key: tuple,
+        tx: Transaction,
+        return_response: bool,
+        cache_ttl: float,
+        compact: bool = False,
+        **kwargs,
+    ):
         params = kwargs.pop("params", {})
         if tx:
             params["txid"] = tx.id
-        response = self.post("v1/invoke", data=data, params=params, **kwargs)
+
+        def send():
+            return self.post(path, data=data, params=params, **kwargs)
+
+        # A cached response is shared by every caller, so it is not returned to a
+        # caller that asks for the response itself.
+        use_cache = cache_ttl and not return_response
+        if use_cache and not params and not kwargs.keys() - TIME_ARGUMENTS:
+            response = self.eval_cache.get_or_load(
+                cache_key, send, cache_ttl, lambda r: r.status_code == 200
+            )
+        else:
+            response = send()
+
+        from marklogic.internal.eval import process_multipart_mixed_response
+
         return (
-            process_multipart_mixed_response(response)
+            process_multipart_mixed_response(response, compact)
             if response.status_code == 200 and not return_response
             else response
         )
+
+
+class _ProfiledAuth(AuthBase):
+    """
+    Records the time spent by the given auth in computing the authentication of each
+    request.
+    """
+
+    def __init__(self, auth, profiler):
+        if isinstance(auth, tuple) and len(auth) == 2:
+            auth = HTTPBasicAuth(*auth)
+        self._auth = auth
+        self._profiler = profiler
+
+    def __call__(self, request):
+        with self._profiler.stage("auth"):
+            return self._auth(request)
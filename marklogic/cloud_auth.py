@@ -2,6 +2,7 @@
 
 
 import logging
+import threading
 import requests
 from requests import Response, Session, Request
 from requests.auth import AuthBase
@@ -20,6 +21,10 @@ class MarkLogicCloudAuth(AuthBase):
     MarkLogic - which may indicate that the token has expired - a new token can be
     generated and the original request can be resent using the same Session that
     initially sent it.
+
+    Can be used by many threads at once. Whether a request has been resent is tracked
+    per thread, and when several threads receive a 401 for the same expired token,
+    only the first generates a new token.
     """
 
     def __init__(
@@ -33,15 +38,25 @@ class MarkLogicCloudAuth(AuthBase):
         self._base_url = base_url
         self._api_key = api_key
         self._cloud_token_duration = cloud_token_duration
+        self._token_lock = threading.Lock()
+        self._local = threading.local()
         self._generate_token()
 
         # See https://docs.python-requests.org/en/latest/user/advanced/#event-hooks for
         # more information on requests hooks.
         self._session.hooks["response"].append(self._renew_token_if_necessary)
 
-        # Used for keeping track of whether a request has been resent with a new token
-        # after receiving a 401; avoids an infinite loop of retrying requests.
-        self.resent_request_on_401 = False
+    @property
+    def resent_request_on_401(self) -> bool:
+        """
+        Tracks whether the current thread has resent a request with a new token after
+        receiving a 401; avoids an infinite loop of retrying requests.
+        """
+        return getattr(self._local, "resent_request_on_401", False)
+
+    @resent_request_on_401.setter
+    def resent_request_on_401(self, value: bool) -> None:
+        self._local.resent_request_on_401 = value
 
     def __call__(self, request: Request):
         # Invoked via the requests authentication framework.
@@ -71,7 +86,10 @@ class MarkLogicCloudAuth(AuthBase):
         if response.status_code == 401 and not self.resent_request_on_401:
             logger.debug("Received 401; will generate new token and try request again")
             self.resent_request_on_401 = True
-            self._generate_token()
+            with self._token_lock:
+                sent = response.request.headers.get("Authorization")
+                if sent == f"Bearer {self._access_token}":
+                    self._generate_token()
             self._add_authorization_header(response.request)
             return self._session.send(response.request, *args, **kwargs)
         self.resent_request_on_401 = False
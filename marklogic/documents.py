@@ -1,20 +1,38 @@
 # Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
 
 
+import copy
 import json
+import logging
+import os
+import sys
+import time
 from collections import OrderedDict
 from email.message import Message
-from typing import Union
-
-from marklogic.transactions import Transaction
+from typing import Callable, Iterable, Iterator, Union
+
+from marklogic.bulk import BulkFailure, BulkProgress, BulkResult, SyncResult
+from marklogic.internal.batch import (
+    CheckpointTracker,
+    chunk_items,
+    chunk_uris_by_url_length,
+    run_batches,
+)
+from marklogic.internal.util import query_data_and_content_type
+from marklogic.profiling import profiler_for, stage
+from marklogic.search import SearchResponse
+from marklogic.timeouts import DeadlineExceeded, OperationCancelled, checker
+from marklogic.transactions import Transaction, TransactionManager
 from requests import Response, Session
-from requests_toolbelt.multipart.decoder import MultipartDecoder
 from urllib3.fields import RequestField
 from urllib3.filepost import encode_multipart_formdata
 
+logger = logging.getLogger(__name__)
+
 """
 Defines classes to simplify usage of the documents REST endpoint defined at
-https://docs.marklogic.com/REST/client/management.
+https://docs.marklogic.com/REST/client/management. The multipart parser is only
+imported when a multipart response is first decoded.
 """
 
 
@@ -231,6 +249,118 @@ class Document(Metadata):
         return disposition
 
 
+class CompactDocument(Document):
+    """
+    A memory-efficient representation of a document read from MarkLogic, intended for
+    reading a large number of documents. Attributes are stored in slots, and metadata
+    is retained as the raw JSON returned by MarkLogic until any metadata attribute is
+    first accessed.
+
+    As a subclass of Document, it supports the same attributes and methods and can
+    thus be written back to MarkLogic. The attributes that are specific to writing a
+    document - such as 'extension' and 'repair' - are None unless assigned.
+    """
+
+    __slots__ = (
+        "uri",
+        "content",
+        "content_type",
+        "version_id",
+        "extension",
+        "directory",
+        "repair",
+        "extract",
+        "temporal_document",
+        "_raw_metadata",
+        "_collections",
+        "_permissions",
+        "_quality",
+        "_metadata_values",
+        "_properties",
+    )
+
+    def __init__(
+        self,
+        uri: str = None,
+        content=None,
+        content_type: str = None,
+        version_id: str = None,
+        raw_metadata: bytes = None,
+    ):
+        """
+        :param uri: the URI of the document.
+        :param content: the content of the document.
+        :param content_type: the MIME type of the document.
+        :param version_id: the version ID of the document, if returned by MarkLogic.
+        :param raw_metadata: the metadata of the document as JSON returned by
+        MarkLogic; it is parsed when any metadata attribute is first accessed.
+        """
+        # Document.__init__ is not invoked, as it would assign each metadata attribute
+        # and thus parse the raw metadata.
+        self.uri = uri
+        self.content = content
+        self.content_type = content_type
+        self.version_id = version_id
+        self.extension = None
+        self.directory = None
+        self.repair = None
+        self.extract = None
+        self.temporal_document = None
+        self._raw_metadata = raw_metadata
+        self._collections = None
+        self._permissions = None
+        self._quality = None
+        self._metadata_values = None
+        self._properties = None
+
+    def _parse_metadata(self) -> None:
+        raw = self._raw_metadata
+        if raw is None:
+            return
+        self._raw_metadata = None
+        metadata = json.loads(raw)
+        self._collections = metadata.get("collections")
+        self._quality = metadata.get("quality")
+        self._metadata_values = metadata.get("metadataValues")
+        self._properties = metadata.get("properties")
+        if metadata.get("permissions"):
+            self._permissions = {
+                perm["role-name"]: perm["capabilities"]
+                for perm in metadata["permissions"]
+            }
+
+    def _metadata_property(name: str):
+        attribute = "_" + name
+
+        def get(self):
+            self._parse_metadata()
+            return getattr(self, attribute)
+
+        def set(self, value):
+            self._parse_metadata()
+            setattr(self, attribute, value)
+
+        return property(get, set)
+
+    collections = _metadata_property("collections")
+    permissions = _metadata_property("permissions")
+    quality = _metadata_property("quality")
+    metadata_values = _metadata_property("metadata_values")
+    properties = _metadata_property("properties")
+    del _metadata_property
+
+    def __repr__(self):
+        return "{!r}".format(
+            {
+                "uri": self.uri,
+                "content": self.content,
+                "content_type": self.content_type,
+                "version_id": self.version_id,
+                **self.metadata,
+            }
+        )
+
+
 class DefaultMetadata(Metadata):
     """
     Defines default metadata for use when writing many documents at one time.
@@ -294,48 +424,403 @@ def _extract_values_from_header(part) -> dict:
     }
 
 
-def multipart_response_to_documents(response: Response) -> list[Document]:
+def multipart_response_to_documents(
+    response: Response, compact: bool = False
+) -> list[Union[Document, CompactDocument]]:
     """
     Returns a list of Documents, one for each URI found in the various parts in the
     given multipart response. The response is assumed to correspond to the structure
     defined by https://docs.marklogic.com/REST/GET/v1/documents when the Accept header
     is "multipart/mixed".
+
+    :param compact: if True, a CompactDocument is returned for each URI instead, with
+    its metadata parsed only when accessed.
     """
-    decoder = MultipartDecoder.from_response(response)
-
-    uris_to_documents = OrderedDict()
-
-    for part in decoder.parts:
-        header_values = _extract_values_from_header(part)
-        uri = header_values["uri"]
-        if header_values["category"] == "content":
-            content = part.content
-            content_type = header_values.get("content_type")
-            if content_type == "application/json":
-                content = json.loads(content)
-            elif content_type in ["application/xml", "text/xml", "text/plain"]:
-                content = content.decode(part.encoding)
-
-            version_id = header_values.get("version_id")
-            if uris_to_documents.get(uri):
-                doc: Document = uris_to_documents[uri]
-                doc.content = content
-                doc.content_type = content_type
-                doc.version_id = version_id
+    from marklogic.internal.multipart import iter_parts
+
+    profiler = profiler_for(response)
+    with stage(profiler, "multipart_decode") as frame:
+        document_class = CompactDocument if compact else Document
+
+        uris_to_documents = OrderedDict()
+
+        for part in iter_parts(response):
+            frame.bytes += len(part.content)
+            header_values = _extract_values_from_header(part)
+            uri = header_values["uri"]
+            if header_values["category"] == "content":
+                content_type = header_values.get("content_type")
+                with stage(profiler, "content_parse", len(part.content)):
+                    content = part.content
+                    if content_type == "application/json":
+                        content = json.loads(content)
+                    elif content_type in ["application/xml", "text/xml", "text/plain"]:
+                        content = content.decode(part.encoding)
+                if compact and content_type:
+                    # Shares a single string across documents with the same type.
+                    content_type = sys.intern(content_type)
+
+                version_id = header_values.get("version_id")
+                if uris_to_documents.get(uri):
+                    doc: Document = uris_to_documents[uri]
+                    doc.content = content
+                    doc.content_type = content_type
+                    doc.version_id = version_id
+                else:
+                    uris_to_documents[uri] = document_class(
+                        uri, content, content_type=content_type, version_id=version_id
+                    )
             else:
-                uris_to_documents[uri] = Document(
-                    uri, content, content_type=content_type, version_id=version_id
+                doc = (
+                    uris_to_documents[uri]
+                    if uris_to_documents.get(uri)
+                    else document_class(uri, None)
                 )
+                uris_to_documents[uri] = doc
+                if compact:
+                    doc._raw_metadata = part.content
+                else:
+                    with stage(profiler, "metadata_parse", len(part.content)):
+                        dict_to_metadata(json.loads(part.content), doc)
+
+        return list(uris_to_documents.values())
+
+
+def _documents_or_response(
+    response: Response, return_response: bool, compact: bool
+) -> Union[list[Union[Document, CompactDocument]], Response]:
+    """
+    Returns the documents in a multipart response that was requested with stream=True,
+    such that its body is parsed as it is received. If a 200 was not received or the
+    response itself was requested, its body is read so that the connection is released
+    and the response is returned instead.
+    """
+    if response.status_code == 200 and not return_response:
+        return multipart_response_to_documents(response, compact)
+    with stage(profiler_for(response), "receive") as frame:
+        frame.bytes = len(response.content)
+    return response
+
+
+# Returns the next page of URIs, in lexicon order, that match the given query and
+# follow the given URI.
+_URIS_AFTER_SCRIPT = """
+var after, limit, q, collections, ctsquery;
+const queries = [];
+if (q) queries.push(cts.parse(q));
+const colls = JSON.parse(collections);
+if (colls.length) queries.push(cts.collectionQuery(colls));
+if (ctsquery) queries.push(cts.query(JSON.parse(ctsquery)));
+const options = ["limit=" + (Number(limit) + 1)];
+const uris = cts.uris(after || null, options, cts.andQuery(queries)).toArray();
+Sequence.from(uris.filter(uri => uri !== after).slice(0, Number(limit)));
+"""
+
+# Same as _URIS_AFTER_SCRIPT, but returns a single object containing the URIs along
+# with the timestamp of the last update of each document, which is the value that
+# MarkLogic returns as the versionId of a document.
+_VERSIONS_AFTER_SCRIPT = """
+var after, limit, q, collections, ctsquery;
+const queries = [];
+if (q) queries.push(cts.parse(q));
+const colls = JSON.parse(collections);
+if (colls.length) queries.push(cts.collectionQuery(colls));
+if (ctsquery) queries.push(cts.query(JSON.parse(ctsquery)));
+const options = ["limit=" + (Number(limit) + 1)];
+const uris = cts.uris(after || null, options, cts.andQuery(queries)).toArray()
+  .filter(uri => uri !== after).slice(0, Number(limit));
+const versions = uris.map(uri => {
+  const timestamp = xdmp.documentTimestamp(uri);
+  return timestamp === null ? null : String(timestamp);
+});
+const result = {"uris": uris, "versions": versions};
+result;
+"""
+
+# Applies a JavaScript REST transform to each of the given URIs and replaces the
+# content of each document while retaining its metadata.
+_APPLY_TRANSFORM_SCRIPT = """
+declareUpdate();
+var uris, transform, params;
+const path = "/marklogic.rest.transform/" + transform + "/assets/transform.sjs";
+const transformModule = require(path);
+const transformParams = JSON.parse(params);
+for (const uri of JSON.parse(uris)) {
+  const doc = cts.doc(uri);
+  if (doc) {
+    const contentType = xdmp.uriContentType(uri);
+    const context = {uri: uri, inputType: contentType, outputType: contentType};
+    const result = transformModule.transform(context, transformParams, doc);
+    if (result != null) {
+      xdmp.documentInsert(uri, result, {
+        permissions: xdmp.documentGetPermissions(uri),
+        collections: xdmp.documentGetCollections(uri),
+        quality: xdmp.documentGetQuality(uri),
+        metadata: xdmp.documentGetMetadata(uri)
+      });
+    }
+  }
+}
+"""
+
+
+# The number of URIs listed, along with their versions, in each request sent while
+# synchronizing documents; listing a URI is far cheaper than reading its document.
+_SYNC_PAGE_SIZE = 1000
+
+
+def _read_sync_index(path: str) -> dict:
+    """
+    Returns the version of each document recorded in the given sync index, or an
+    empty dict if the index does not exist yet.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)["versions"]
+
+
+def _write_sync_index(path: str, versions: dict) -> None:
+    """
+    Writes the given versions to a temporary file that then replaces the sync index,
+    so that an interrupted write does not corrupt the index.
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump({"versions": versions}, file)
+    os.replace(temp_path, path)
+
+
+def _search_params(
+    params: dict,
+    q: str,
+    start: int,
+    page_length: int,
+    options: str,
+    collections: list[str],
+    tx: Transaction,
+) -> dict:
+    """
+    Returns a copy of the given params with the parameters that are common to every
+    request to the v1/search endpoint added to it.
+    """
+    params = dict(params or {})
+    params["format"] = "json"  # This refers to the metadata format.
+    if collections:
+        params["collection"] = collections
+    if q:
+        params["q"] = q
+    if start:
+        params["start"] = start
+    if page_length:
+        params["pageLength"] = page_length
+    if options:
+        params["options"] = options
+    if tx:
+        params["txid"] = tx.id
+    return params
+
+
+def _encode_parts(
+    parts: Union[Document, list[Union[DefaultMetadata, Document]]],
+) -> tuple:
+    """
+    Returns the multipart body for writing the given parts, along with the
+    multipart/mixed content type that identifies its boundary.
+    """
+    fields = []
+
+    if isinstance(parts, Document):
+        parts = [parts]
+
+    for part in parts:
+        if isinstance(part, DefaultMetadata):
+            fields.append(part.to_metadata_request_field())
         else:
-            doc = (
-                uris_to_documents[uri]
-                if uris_to_documents.get(uri)
-                else Document(uri, None)
+            metadata_field = part.to_metadata_request_field()
+            if metadata_field:
+                fields.append(metadata_field)
+            content_field = part.to_request_field()
+            if content_field:
+                fields.append(content_field)
+
+    data, content_type = encode_multipart_formdata(fields)
+    return data, "".join(("multipart/mixed",) + content_type.partition(";")[1:])
+
+
+# Status codes indicating that a failed write was not caused by the documents in it.
+_NOT_ISOLATABLE_STATUS_CODES = {401, 403, 407, 429, 502, 503, 504}
+
+
+def _split_for_isolation(docs: list[Document], message: str) -> list[list[Document]]:
+    """
+    Splits a failed batch into the lists of documents to retry, with the list to be
+    retried first being last. A document whose URI is the only one named in the
+    error message is retried on its own.
+    """
+    named = [doc for doc in docs if doc.uri and doc.uri in message]
+    if len(named) == 1:
+        return [[doc for doc in docs if doc is not named[0]], named]
+    middle = len(docs) // 2
+    return [docs[middle:], docs[:middle]]
+
+
+class _TransactionalWriter:
+    """
+    Writes batches of documents within one or more transactions. The body of each
+    batch is encoded while the previous batch is being written, and the duration of
+    each write is tracked so that a transaction is ended before its time limit is
+    likely to be exceeded. If the deadline passes or the operation is cancelled, the
+    current transaction is rolled back.
+    """
+
+    # Fraction of a transaction's time limit that writes and the commit may consume.
+    TIME_LIMIT_RATIO = 0.8
+
+    def __init__(
+        self,
+        manager: "DocumentManager",
+        metadata: DefaultMetadata,
+        commit_every: int,
+        transaction_args: dict,
+        write_args: dict,
+    ):
+        self._manager = manager
+        self._metadata = metadata
+        self._commit_every = commit_every
+        self._transaction_args = transaction_args
+        self._write_args = write_args
+        self._check = checker(write_args)
+        self._time_limit = transaction_args.get("time_limit")
+        self._transactions = TransactionManager(manager._session)
+        self._tx = None
+        self._tx_uris = []
+        self._tx_started = None
+        self._slowest_write = 0.0
+        self._stopped = False
+        self.result = BulkResult()
+
+    def write(self, batches: Iterable[list[Document]]) -> BulkResult:
+        try:
+            self._write(batches)
+        except (DeadlineExceeded, OperationCancelled) as error:
+            if self._tx:
+                self._rollback(f"Rolled back due to: {error}")
+            error.result = self.result
+            raise
+        if self._tx:
+            self._end_transaction()
+        return self.result
+
+    def _write(self, batches: Iterable[list[Document]]) -> None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        profiler = profiler_for(self._manager._session)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = None
+            for batch in batches:
+                parts = [self._metadata] + batch if self._metadata else batch
+                with stage(profiler, "request_build") as frame:
+                    data, content_type = _encode_parts(parts)
+                    frame.bytes = len(data)
+                if pending:
+                    self._complete(*pending)
+                    pending = None
+                if self._stopped:
+                    break
+                if self._check:
+                    self._check()
+                if not self._prepare_transaction(len(batch)):
+                    break
+                uris = [doc.uri for doc in batch]
+                future = executor.submit(
+                    self._manager._post_multipart,
+                    data,
+                    content_type,
+                    self._tx,
+                    **self._write_args,
+                )
+                pending = (uris, time.monotonic(), future)
+            if pending:
+                self._complete(*pending)
+
+    def _prepare_transaction(self, batch_size: int) -> bool:
+        """
+        Ensures a transaction is available for writing a batch of the given size,
+        committing the current transaction first if it is full or if writing another
+        batch is likely to exceed its time limit. Returns False if a single transaction
+        is being used and it cannot accommodate the batch.
+        """
+        if self._tx and self._should_end_transaction(batch_size):
+            if not self._commit_every:
+                message = "Writing another batch would likely exceed the time limit"
+                self._rollback(message)
+                return False
+            self._end_transaction()
+        if not self._tx:
+            self._tx_started = time.monotonic()
+            self._tx = self._transactions.create(**self._transaction_args)
+            self._tx_uris = []
+        return True
+
+    def _should_end_transaction(self, batch_size: int) -> bool:
+        if self._commit_every and len(self._tx_uris) + batch_size > self._commit_every:
+            return True
+        if self._time_limit:
+            # Allows for both the next write and the commit.
+            elapsed = time.monotonic() - self._tx_started
+            needed = elapsed + self._slowest_write * 2
+            return needed > self._time_limit * self.TIME_LIMIT_RATIO
+        return False
+
+    def _complete(self, uris: list[str], started: float, future) -> None:
+        try:
+            response = future.result()
+            error = None
+        except Exception as ex:
+            response = None
+            error = ex
+        self._slowest_write = max(self._slowest_write, time.monotonic() - started)
+        if error is None and response.status_code == 200:
+            self._tx_uris.extend(uris)
+            return
+        self.result.add_failure(uris, response, error)
+        self._rollback("Rolled back due to a failed write in the same transaction")
+        if isinstance(error, (DeadlineExceeded, OperationCancelled)):
+            raise error
+        if not self._commit_every:
+            self._stopped = True
+
+    def _end_transaction(self) -> None:
+        """
+        Commits the current transaction after verifying via its status that it is
+        still active.
+        """
+        tx, uris = self._tx, self._tx_uris
+        self._tx = None
+        try:
+            status = tx.get_status()
+        except Exception as error:
+            status = {}
+            logger.warning(f"Unable to get status of transaction {tx.id}: {error}")
+        if "transaction-status" not in status:
+            tx.rollback()
+            self.result.add_failure(
+                uris, error=ValueError(f"Transaction {tx.id} is no longer active")
             )
-            uris_to_documents[uri] = doc
-            dict_to_metadata(json.loads(part.content), doc)
+            return
+        response = tx.commit()
+        if response.status_code == 204:
+            self.result.add_success(uris)
+        else:
+            self.result.add_failure(uris, response)
 
-    return list(uris_to_documents.values())
+    def _rollback(self, message: str) -> None:
+        tx, uris = self._tx, self._tx_uris
+        self._tx = None
+        tx.rollback()
+        if uris:
+            self.result.add_failure(uris, error=RuntimeError(message))
 
 
 class DocumentManager:
@@ -367,32 +852,164 @@ class DocumentManager:
         how the REST endpoint uses metadata.
         :param tx: if set, the request will be associated with the given transaction.
         """
-        fields = []
+        with stage(profiler_for(self._session), "request_build") as frame:
+            data, content_type = _encode_parts(parts)
+            frame.bytes = len(data)
+        return self._post_multipart(data, content_type, tx, **kwargs)
 
-        if isinstance(parts, Document):
-            parts = [parts]
+    def write_embeddings(
+        self,
+        documents: list[Document],
+        embeddings: Iterable,
+        embedding_key: str = "embedding",
+        metadata: DefaultMetadata = None,
+        tx: Transaction = None,
+        **kwargs,
+    ) -> Response:
+        """
+        Writes JSON documents, each with a vector embedding, via a single POST to the
+        endpoint defined at https://docs.marklogic.com/REST/POST/v1/documents . Each
+        embedding is encoded as described by 'marklogic.vectors.base64_encode' and
+        added to the content of its document under the given key. The content of each
+        document is serialized once and the encoded embedding is appended to it
+        directly, without the encoding being added to the content first.
+
+        :param documents: the documents to write; the content of each must be a dict
+        or None. The documents are not modified.
+        :param embeddings: an embedding for each document, in the same order; each is
+        either a list of floats or a buffer of float32 values, such as bytes, an array
+        of type "f", or a row of a float32 NumPy array, which is encoded as-is.
+        :param embedding_key: the key under which each encoded embedding is added.
+        :param metadata: optional default metadata applied to every document.
+        :param tx: if set, the request will be associated with the given transaction.
+        """
+        from marklogic.vectors import base64_encode_many
 
-        for part in parts:
-            if isinstance(part, DefaultMetadata):
-                fields.append(part.to_metadata_request_field())
+        encoded = base64_encode_many(embeddings)
+        if len(encoded) != len(documents):
+            raise ValueError(
+                f"Number of embeddings ({len(encoded)}) does not match number of "
+                f"documents ({len(documents)})."
+            )
+        key = json.dumps(embedding_key).encode("utf-8")
+        parts = [metadata] if metadata else []
+        for doc, vector in zip(documents, encoded):
+            if doc.content is not None and not isinstance(doc.content, dict):
+                raise ValueError(f"Content of document {doc.uri} must be a dict.")
+            body = json.dumps(doc.content if doc.content else {}).encode("utf-8")
+            separator = b"" if body == b"{}" else b", "
+            part = copy.copy(doc)
+            part.content = b"".join((body[:-1], separator, key, b': "', vector, b'"}'))
+            part.content_type = doc.content_type or "application/json"
+            parts.append(part)
+        return self.write(parts, tx, **kwargs)
+
+    def write_many(
+        self,
+        documents: Iterable[Document],
+        metadata: DefaultMetadata = None,
+        batch_size: int = 100,
+        thread_count: int = 4,
+        isolate_failures: bool = True,
+        **kwargs,
+    ) -> BulkResult:
+        """
+        Writes a stream of documents in batches via POST requests to the endpoint
+        defined at https://docs.marklogic.com/REST/POST/v1/documents , with batches
+        being written in parallel. Each request is atomic, so a single invalid
+        document - such as one with malformed XML or a permission referencing an
+        unknown role - causes every other document in its batch to not be written.
+
+        When 'isolate_failures' is True, a batch that MarkLogic rejects is split and
+        each part is retried, so that every valid document is written and each
+        failure identifies only the documents that caused it. If the error message
+        names exactly one document in the batch, that document is retried on its own
+        and the rest of the batch is retried together; otherwise, the batch is split
+        in half. A single invalid document thus costs a small number of additional
+        requests - at most two per halving of the batch. Batches that fail due to an
+        error other than an invalid document, such as authentication failing or the
+        server being unavailable, are not split.
+
+        :param documents: an iterable of documents to write; it is consumed lazily.
+        :param metadata: optional default metadata applied to every document.
+        :param batch_size: the number of documents to write in each request.
+        :param thread_count: the number of batches to write in parallel.
+        :param isolate_failures: whether to split and retry a batch that fails.
+        """
+        check = checker(kwargs)
+
+        def write_batch(batch: list[Document]) -> BulkResult:
+            return self._write_isolating(batch, metadata, isolate_failures, kwargs)
+
+        result = BulkResult()
+        try:
+            for batch, batch_result, error in run_batches(
+                write_batch, chunk_items(documents, batch_size), thread_count, check
+            ):
+                if error is not None:
+                    result.add_failure([doc.uri for doc in batch], error=error)
+                else:
+                    result.add_success(batch_result.succeeded)
+                    result.failures.extend(batch_result.failures)
+        except (DeadlineExceeded, OperationCancelled) as error:
+            error.result = result
+            raise
+        return result
+
+    def _write_isolating(
+        self,
+        batch: list[Document],
+        metadata: DefaultMetadata,
+        isolate_failures: bool,
+        kwargs: dict,
+    ) -> BulkResult:
+        """
+        Writes the batch, splitting and retrying it as described in 'write_many'
+        until every document has either been written or been isolated in a failure.
+        """
+        result = BulkResult()
+        pending = [batch]
+        while pending:
+            docs = pending.pop()
+            uris = [doc.uri for doc in docs]
+            parts = [metadata] + docs if metadata else docs
+            response, error = None, None
+            try:
+                response = self.write(parts, **kwargs)
+            except (DeadlineExceeded, OperationCancelled) as ex:
+                # Documents not yet written are reported as failures so that no
+                # further requests are sent for this batch.
+                for remaining in [docs] + pending:
+                    result.add_failure([doc.uri for doc in remaining], error=ex)
+                return result
+            except Exception as ex:
+                error = ex
+            if error is None and response.status_code == 200:
+                result.add_success(uris)
+            elif (
+                isolate_failures
+                and len(docs) > 1
+                and response is not None
+                and response.status_code not in _NOT_ISOLATABLE_STATUS_CODES
+            ):
+                pending.extend(_split_for_isolation(docs, response.text))
             else:
-                metadata_field = part.to_metadata_request_field()
-                if metadata_field:
-                    fields.append(metadata_field)
-                content_field = part.to_request_field()
-                if content_field:
-                    fields.append(content_field)
-
-        data, content_type = encode_multipart_formdata(fields)
+                result.add_failure(uris, response, error)
+        return result
 
-        params = kwargs.pop("params", {})
+    def _post_multipart(
+        self, data: bytes, content_type: str, tx: Transaction = None, **kwargs
+    ) -> Response:
+        """
+        Sends an encoded multipart body to the endpoint defined at
+        https://docs.marklogic.com/REST/POST/v1/documents .
+        """
+        params = dict(kwargs.pop("params", None) or {})
         if tx:
             params["txid"] = tx.id
 
-        headers = kwargs.pop("headers", {})
-        headers["Content-Type"] = "".join(
-            ("multipart/mixed",) + content_type.partition(";")[1:]
-        )
+        headers = dict(kwargs.pop("headers", None) or {})
+        headers["Content-Type"] = content_type
         if not headers.get("Accept"):
             headers["Accept"] = "application/json"
 
@@ -406,6 +1023,7 @@ class DocumentManager:
         categories: list[str] = None,
         tx: Transaction = None,
         return_response: bool = False,
+        compact: bool = False,
         **kwargs,
     ) -> Union[list[Document], Response]:
         """
@@ -418,8 +1036,10 @@ class DocumentManager:
         URI. By default, only content will be returned for each URI. See the endpoint
         documentation for further information.
         :param tx: if set, the request will be associated with the given transaction.
+        :param compact: if True, a CompactDocument is returned for each URI instead of
+        a Document, reducing the memory used when reading many documents.
         """
-        params = kwargs.pop("params", {})
+        params = dict(kwargs.pop("params", None) or {})
         params["uri"] = uris if isinstance(uris, list) else [uris]
         params["format"] = "json"  # This refers to the metadata format.
         if categories:
@@ -427,17 +1047,12 @@ class DocumentManager:
         if tx:
             params["txid"] = tx.id
 
-        headers = kwargs.pop("headers", {})
+        headers = dict(kwargs.pop("headers", None) or {})
         headers["Accept"] = "multipart/mixed"
         response = self._session.get(
-            "/v1/documents", params=params, headers=headers, **kwargs
-        )
-
-        return (
-            multipart_response_to_documents(response)
-            if response.status_code == 200 and not return_response
-            else response
+            "/v1/documents", params=params, headers=headers, stream=True, **kwargs
         )
+        return _documents_or_response(response, return_response, compact)
 
     def search(
         self,
@@ -450,6 +1065,7 @@ class DocumentManager:
         collections: list[str] = None,
         tx: Transaction = None,
         return_response: bool = False,
+        compact: bool = False,
         **kwargs,
     ) -> Union[list[Document], Response]:
         """
@@ -470,56 +1086,525 @@ class DocumentManager:
         :param options: name of a query options instance to use.
         :param collections: restrict results to documents in these collections.
         :param tx: if set, the request will be associated with the given transaction.
+        :param compact: if True, a CompactDocument is returned for each URI instead of
+        a Document, reducing the memory used when reading many documents.
         """
-        params = kwargs.pop("params", {})
-        params["format"] = "json"  # This refers to the metadata format.
+        params = _search_params(
+            kwargs.pop("params", None), q, start, page_length, options, collections, tx
+        )
+        if categories:
+            params["category"] = categories
+        headers = dict(kwargs.pop("headers", None) or {})
+        headers["Accept"] = "multipart/mixed"
+        response = self._post_search(query, headers, params, stream=True, **kwargs)
+        return _documents_or_response(response, return_response, compact)
+
+    def search_summary(
+        self,
+        q: str = None,
+        query: Union[dict, str] = None,
+        start: int = None,
+        page_length: int = None,
+        options: str = None,
+        collections: list[str] = None,
+        view: str = None,
+        tx: Transaction = None,
+        return_response: bool = False,
+        **kwargs,
+    ) -> Union[SearchResponse, Response]:
+        """
+        Returns the search response defined at
+        https://docs.marklogic.com/REST/POST/v1/search - containing the total, facets,
+        and snippets of a search along with the URI of each matching document - as a
+        SearchResponse, without the content of any matching document. Accepts the
+        same query arguments as the "search" method.
+
+        :param view: optional part of the search response to return; one of "all",
+        "results", "facets", or "metadata". Use "facets" to avoid generating snippets
+        when only the total and facets are needed.
+        """
+        params = _search_params(
+            kwargs.pop("params", None), q, start, page_length, options, collections, tx
+        )
+        if view:
+            params["view"] = view
+        headers = dict(kwargs.pop("headers", None) or {})
+        headers["Accept"] = "application/json"
+        response = self._post_search(query, headers, params, **kwargs)
+        return (
+            SearchResponse(response)
+            if response.status_code == 200 and not return_response
+            else response
+        )
+
+    def estimate(
+        self,
+        q: str = None,
+        query: Union[dict, str] = None,
+        options: str = None,
+        collections: list[str] = None,
+        tx: Transaction = None,
+        **kwargs,
+    ) -> Union[int, Response]:
+        """
+        Returns the number of documents matching a search, as estimated from the
+        indexes, without returning any results or snippets. Accepts the same query
+        arguments as the "search" method. The response is returned if the search
+        fails.
+        """
+        result = self.search_summary(
+            q,
+            query,
+            options=options,
+            collections=collections,
+            view="metadata",
+            tx=tx,
+            **kwargs,
+        )
+        return result.total if isinstance(result, SearchResponse) else result
+
+    def _post_search(
+        self, query: Union[dict, str], headers: dict, params: dict, **kwargs
+    ) -> Response:
+        if query:
+            data, headers["Content-type"] = query_data_and_content_type(query)
+            return self._session.post(
+                "/v1/search", headers=headers, params=params, data=data, **kwargs
+            )
+        return self._session.post(
+            "/v1/search", headers=headers, params=params, **kwargs
+        )
+
+    def delete(
+        self,
+        uris: Union[str, list[str]],
+        categories: list[str] = None,
+        tx: Transaction = None,
+        thread_count: int = 4,
+        max_url_length: int = 8000,
+        **kwargs,
+    ) -> BulkResult:
+        """
+        Delete one or many documents via DELETE requests to the endpoint defined at
+        https://docs.marklogic.com/REST/DELETE/v1/documents . The URIs are split into
+        as many requests as needed to keep the query string of each request under the
+        given length, and those requests are sent in parallel.
+
+        :param uris: list of URIs or a single URI to delete.
+        :param categories: optional list of the categories of data to delete for each
+        URI. By default, the document and all of its metadata are deleted. See the
+        endpoint documentation for further information.
+        :param tx: if set, each request will be associated with the given transaction.
+        The requests of a transaction share a single connection, so they are sent one
+        at a time regardless of 'thread_count'.
+        :param thread_count: the number of requests to send in parallel.
+        :param max_url_length: the maximum length of the URI parameters in the query
+        string of each request; most proxies and servers reject URLs longer than 8KB.
+        """
+        params = dict(kwargs.pop("params", None) or {})
         if categories:
             params["category"] = categories
-        if collections:
-            params["collection"] = collections
-        if q:
-            params["q"] = q
-        if start:
-            params["start"] = start
-        if page_length:
-            params["pageLength"] = page_length
-        if options:
-            params["options"] = options
         if tx:
             params["txid"] = tx.id
+            thread_count = 1
 
-        headers = kwargs.pop("headers", {})
-        headers["Accept"] = "multipart/mixed"
-        data = None
+        def delete_chunk(chunk: list[str]) -> Response:
+            return self._session.delete(
+                "/v1/documents", params={**params, "uri": chunk}, **kwargs
+            )
 
-        if query:
-            if isinstance(query, dict):
-                data = json.dumps(query)
-                headers["Content-type"] = "application/json"
-            else:
-                data = query
-                try:
-                    json.loads(query)
-                except Exception:
-                    headers["Content-type"] = "application/xml"
+        uris = [uris] if isinstance(uris, str) else uris
+        chunks = chunk_uris_by_url_length(uris, max_url_length)
+        check = checker(kwargs)
+        result = BulkResult()
+        try:
+            for chunk, response, error in run_batches(
+                delete_chunk, chunks, thread_count, check
+            ):
+                if error is None and response.status_code == 204:
+                    result.add_success(chunk)
                 else:
-                    headers["Content-type"] = "application/json"
+                    result.add_failure(chunk, response, error)
+        except (DeadlineExceeded, OperationCancelled) as error:
+            error.result = result
+            raise
+        return result
 
-        if data:
-            response = self._session.post(
-                "/v1/search",
-                headers=headers,
-                params=params,
+    def patch(
+        self,
+        uris: Union[str, list[str]],
+        patch: Union[dict, str],
+        tx: Transaction = None,
+        thread_count: int = 4,
+        **kwargs,
+    ) -> Union[Response, BulkResult]:
+        """
+        Partially update one or many documents via a PATCH to the endpoint defined at
+        https://docs.marklogic.com/REST/PATCH/v1/documents . The endpoint accepts a
+        single URI per request, so when a list of URIs is given, the same patch is
+        applied to each URI via requests sent in parallel.
+
+        :param uris: list of URIs or a single URI to patch. If a single URI is given,
+        the Response from MarkLogic is returned; otherwise, a BulkResult is returned.
+        :param patch: JSON or XML patch as defined at
+        https://docs.marklogic.com/guide/rest-dev/documents#id_11562 . The
+        "Content-type" header will be set based on whether this is a dict, a string of
+        JSON, or a string of XML.
+        :param tx: if set, each request will be associated with the given transaction.
+        The requests of a transaction share a single connection, so they are sent one
+        at a time regardless of 'thread_count'.
+        :param thread_count: the number of requests to send in parallel.
+        """
+        params = dict(kwargs.pop("params", None) or {})
+        if tx:
+            params["txid"] = tx.id
+            thread_count = 1
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        data, headers["Content-type"] = query_data_and_content_type(patch)
+
+        def patch_uri(uri: str) -> Response:
+            return self._session.patch(
+                "/v1/documents",
                 data=data,
+                headers=headers,
+                params={**params, "uri": uri},
                 **kwargs,
             )
-        else:
-            response = self._session.post(
-                "/v1/search", headers=headers, params=params, **kwargs
-            )
 
-        return (
-            multipart_response_to_documents(response)
-            if response.status_code == 200 and not return_response
-            else response
+        if isinstance(uris, str):
+            return patch_uri(uris)
+
+        check = checker(kwargs)
+        result = BulkResult()
+        try:
+            for uri, response, error in run_batches(
+                patch_uri, uris, thread_count, check
+            ):
+                if error is None and response.status_code == 204:
+                    result.add_success([uri])
+                else:
+                    result.add_failure([uri], response, error)
+        except (DeadlineExceeded, OperationCancelled) as error:
+            error.result = result
+            raise
+        return result
+
+    def apply_transform(
+        self,
+        transform: str = None,
+        module: str = None,
+        params: dict = None,
+        q: str = None,
+        collections: list[str] = None,
+        ctsquery: dict = None,
+        batch_size: int = 100,
+        thread_count: int = 4,
+        checkpoint: str = None,
+        **kwargs,
+    ) -> Iterator[BulkProgress]:
+        """
+        Applies a server-side transform to every document matching a query, without
+        any document content being sent to or from the client. URIs are retrieved from
+        the URI lexicon in batches via https://docs.marklogic.com/REST/POST/v1/eval,
+        and each batch is then transformed via a separate request, with batches being
+        processed in parallel.
+
+        This method returns a generator that yields a BulkProgress as each batch
+        completes. The generator must be consumed for the operation to proceed. Each
+        BulkProgress contains a checkpoint that can be passed to this method to resume
+        the operation after the last batch that completed.
+
+        One of 'transform' or 'module' must be defined.
+
+        :param transform: the name of a JavaScript REST transform, as installed via
+        https://docs.marklogic.com/REST/PUT/v1/config/transforms/[name] . The result of
+        the transform replaces the content of each document, and the metadata of each
+        document is retained. A transform that returns null leaves the document as is.
+        :param module: the URI of a module to invoke via
+        https://docs.marklogic.com/REST/POST/v1/invoke for each batch. The module
+        receives a "uris" variable, a JSON array of the URIs in the batch, and a
+        "params" variable, a JSON object containing the given params.
+        :param params: optional dict of parameters to pass to the transform or module.
+        :param q: optional search string, parsed via cts.parse, that documents must
+        match.
+        :param collections: optional collections that documents must belong to.
+        :param ctsquery: optional serialized cts query that documents must match.
+        :param batch_size: the number of URIs to transform in each request.
+        :param thread_count: the number of batches to transform in parallel.
+        :param checkpoint: optional URI returned by a previous invocation; only
+        documents with a URI that follows the checkpoint are transformed.
+        """
+        if transform is None and module is None:
+            raise ValueError("Must define either 'transform' or 'module' argument.")
+
+        params_json = json.dumps(params if params else {})
+        check = checker(kwargs)
+        control_args = {
+            key: kwargs[key] for key in ("deadline", "cancellation") if key in kwargs
+        }
+
+        def uri_batches() -> Iterator[tuple]:
+            after = checkpoint
+            index = 0
+            while True:
+                uris = self._uris_after(
+                    after, batch_size, q, collections, ctsquery, **control_args
+                )
+                if not uris:
+                    return
+                yield index, uris
+                index += 1
+                after = uris[-1]
+
+        def transform_batch(batch: tuple) -> Response:
+            vars = {"uris": json.dumps(batch[1]), "params": params_json}
+            if transform:
+                vars["transform"] = transform
+                data = {"javascript": _APPLY_TRANSFORM_SCRIPT, "vars": json.dumps(vars)}
+                return self._session.post("v1/eval", data=data, **kwargs)
+            data = {"module": module, "vars": json.dumps(vars)}
+            return self._session.post("v1/invoke", data=data, **kwargs)
+
+        tracker = CheckpointTracker(checkpoint)
+        processed = 0
+        failed = 0
+        for batch, response, error in run_batches(
+            transform_batch, uri_batches(), thread_count, check
+        ):
+            index, uris = batch
+            failure = None
+            if error is not None or not response.ok:
+                failure = BulkFailure(uris, response, error)
+                failed += len(uris)
+            processed += len(uris)
+            tracker.complete(index, uris[-1])
+            yield BulkProgress(uris, failure, processed, failed, tracker.checkpoint)
+
+    def _uris_after(
+        self,
+        after: str,
+        limit: int,
+        q: str,
+        collections: list[str],
+        ctsquery: dict,
+        **kwargs,
+    ) -> list[str]:
+        """
+        Returns up to 'limit' URIs that follow the given URI in the URI lexicon and
+        match the given query criteria.
+        """
+        from marklogic.internal.eval import process_multipart_mixed_response
+
+        vars = {
+            "after": after if after else "",
+            "limit": limit,
+            "q": q if q else "",
+            "collections": json.dumps(collections if collections else []),
+            "ctsquery": json.dumps(ctsquery) if ctsquery else "",
+        }
+        response = self._session.post(
+            "v1/eval",
+            data={"javascript": _URIS_AFTER_SCRIPT, "vars": json.dumps(vars)},
+            **kwargs,
+        )
+        response.raise_for_status()
+        uris = process_multipart_mixed_response(response)
+        return uris if uris else []
+
+    def _versions_after(
+        self,
+        after: str,
+        limit: int,
+        q: str,
+        collections: list[str],
+        ctsquery: dict,
+        **kwargs,
+    ) -> list[tuple]:
+        """
+        Returns a tuple of the URI and the version of each of up to 'limit' documents
+        that follow the given URI in the URI lexicon and match the given query
+        criteria; the version is None for a document deleted while being listed.
+        """
+        from marklogic.internal.eval import process_multipart_mixed_response
+
+        vars = {
+            "after": after if after else "",
+            "limit": limit,
+            "q": q if q else "",
+            "collections": json.dumps(collections if collections else []),
+            "ctsquery": json.dumps(ctsquery) if ctsquery else "",
+        }
+        response = self._session.post(
+            "v1/eval",
+            data={"javascript": _VERSIONS_AFTER_SCRIPT, "vars": json.dumps(vars)},
+            **kwargs,
+        )
+        response.raise_for_status()
+        parts = process_multipart_mixed_response(response)
+        if not parts:
+            return []
+        return list(zip(parts[0]["uris"], parts[0]["versions"]))
+
+    def sync(
+        self,
+        index: str,
+        on_documents: Callable[[list[Document]], None],
+        on_delete: Callable[[list[str]], None] = None,
+        q: str = None,
+        collections: list[str] = None,
+        ctsquery: dict = None,
+        categories: list[str] = None,
+        batch_size: int = 100,
+        thread_count: int = 4,
+        compact: bool = False,
+        **kwargs,
+    ) -> SyncResult:
+        """
+        Synchronizes a local copy of the documents matching the given query criteria
+        by reading only the documents that are new or that have changed since the
+        previous synchronization. The version of each document - the timestamp of its
+        last update, which MarkLogic also returns as its versionId - is retrieved from
+        the URI lexicon in batches via https://docs.marklogic.com/REST/POST/v1/eval
+        and compared to the version recorded in the given index file. The documents
+        with a different version are then read in batches, with batches being read in
+        parallel. The cost of a synchronization thus depends on the number of changed
+        documents instead of the number of matching documents.
+
+        The index file is a JSON file that is created if it does not exist and that
+        is rewritten when the synchronization ends, including when it ends due to an
+        error; a document in a batch that could not be read is not recorded, such
+        that it is read again by the next synchronization. Documents that are
+        recorded in the index but that are no longer found are only reported once
+        every matching document has been listed.
+
+        :param index: path of the file in which the version of each document is
+        recorded.
+        :param on_documents: function that is invoked with the list of documents in
+        each batch that is read, in the thread that called this method; this is
+        typically used to write the documents to a local store.
+        :param on_delete: optional function that is invoked with the URIs of the
+        recorded documents that no longer exist or no longer match the query
+        criteria.
+        :param q: optional search string, parsed via cts.parse, that documents must
+        match.
+        :param collections: optional collections that documents must belong to.
+        :param ctsquery: optional serialized cts query that documents must match.
+        :param categories: optional list of the categories of data to read for each
+        document; defaults to content only.
+        :param batch_size: the number of documents to read in each request.
+        :param thread_count: the number of batches to read in parallel.
+        :param compact: if True, a CompactDocument is read for each URI instead of a
+        Document.
+        """
+        versions = _read_sync_index(index)
+        check = checker(kwargs)
+        control_args = {
+            key: kwargs[key] for key in ("deadline", "cancellation") if key in kwargs
+        }
+        listed = {}
+        result = SyncResult()
+
+        def changed_uris() -> Iterator[str]:
+            after = None
+            while True:
+                page = self._versions_after(
+                    after, _SYNC_PAGE_SIZE, q, collections, ctsquery, **control_args
+                )
+                if not page:
+                    return
+                for uri, version in page:
+                    if version is None:
+                        continue
+                    listed[uri] = version
+                    if versions.get(uri) == version:
+                        result.unchanged += 1
+                    else:
+                        yield uri
+                after = page[-1][0]
+
+        def read_batch(uris: list[str]) -> Union[list[Document], Response]:
+            return self.read(uris, categories=categories, compact=compact, **kwargs)
+
+        try:
+            for uris, response, error in run_batches(
+                read_batch, chunk_items(changed_uris(), batch_size), thread_count, check
+            ):
+                if error is None and isinstance(response, list):
+                    on_documents(response)
+                    for doc in response:
+                        versions[doc.uri] = doc.version_id or listed[doc.uri]
+                    result.add_success([doc.uri for doc in response])
+                elif error is None and response.status_code == 404:
+                    # Every document in the batch was deleted after being listed.
+                    pass
+                else:
+                    result.add_failure(uris, response, error)
+                    logger.warning(
+                        f"Unable to read batch of {len(uris)} documents; "
+                        f"cause: {result.failures[-1].message}"
+                    )
+
+            result.deleted = [uri for uri in versions if uri not in listed]
+            if result.deleted:
+                if on_delete:
+                    on_delete(result.deleted)
+                for uri in result.deleted:
+                    del versions[uri]
+        except (DeadlineExceeded, OperationCancelled) as error:
+            error.result = result
+            raise
+        finally:
+            _write_sync_index(index, versions)
+        return result
+
+    def write_in_transaction(
+        self,
+        documents: Iterable[Document],
+        metadata: DefaultMetadata = None,
+        batch_size: int = 100,
+        commit_every: int = None,
+        time_limit: int = None,
+        name: str = None,
+        database: str = None,
+        **kwargs,
+    ) -> BulkResult:
+        """
+        Writes a stream of documents in batches within a transaction created via
+        https://docs.marklogic.com/REST/POST/v1/transactions . The body of each batch
+        is encoded while the previous batch is being written. Before a transaction is
+        committed, its status is checked to ensure it is still active.
+
+        By default, every document is written in a single transaction that is either
+        committed or rolled back as a unit. If a write fails, or if a time limit is
+        set and writing the next batch would likely cause the transaction to exceed
+        it, the transaction is rolled back and no further batches are written. As the
+        next batch is read from the stream and encoded while the previous batch is
+        being written, that batch has already been consumed from the stream by then,
+        but no documents after it are consumed. The same applies when the deadline
+        passes or the operation is cancelled.
+
+        If 'commit_every' is set, a transaction is instead committed after at most that
+        many documents have been written, and a new transaction is created for the
+        next batch. If a time limit is set, a transaction is also committed early when
+        writing the next batch would likely cause it to exceed the time limit. A failed
+        write causes only the transaction it belongs to to be rolled back.
+
+        :param documents: an iterable of documents to write; it is consumed lazily.
+        :param metadata: optional default metadata applied to every document.
+        :param batch_size: the number of documents to write in each request.
+        :param commit_every: optional maximum number of documents to write in each
+        transaction.
+        :param time_limit: optional time limit, in seconds, for each transaction.
+        :param name: optional name for each transaction.
+        :param database: optional database to associate with each transaction.
+        """
+        transaction_args = {
+            "name": name,
+            "time_limit": time_limit,
+            "database": database,
+        }
+        writer = _TransactionalWriter(
+            self, metadata, commit_every, transaction_args, kwargs
         )
+        return writer.write(chunk_items(documents, batch_size))
@@ -0,0 +1,429 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+import argparse
+import base64
+import io
+import json
+import logging
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from abc import ABC, abstractmethod
+from pathlib import PurePosixPath
+from typing import Callable, Iterator, Union
+
+from marklogic.bulk import BulkResult
+from marklogic.client import Client
+from marklogic.documents import DocumentManager, _extract_values_from_header
+from marklogic.internal import cli
+from marklogic.internal.batch import chunk_items, run_batches
+from marklogic.internal.util import response_has_no_content
+from marklogic.timeouts import (
+    CancellationToken,
+    Deadline,
+    DeadlineExceeded,
+    OperationCancelled,
+    checker,
+)
+
+logger = logging.getLogger(__name__)
+
+"""
+Supports exporting documents from MarkLogic to a directory, a zip or tar archive, or a
+newline-delimited JSON file. Can be run as "python -m marklogic.export"; run it with
+"--help" for its arguments.
+"""
+
+FORMATS = ("directory", "zip", "tar", "ndjson")
+
+# Appended to the path of a document to construct the path of its metadata.
+METADATA_SUFFIX = ".metadata.json"
+
+_TEXT_CONTENT_TYPES = ("application/xml", "text/xml", "text/plain")
+
+
+class DocumentExporter:
+    """
+    Reads documents in batches via https://docs.marklogic.com/REST/GET/v1/documents
+    and writes the content of each - and optionally its metadata - to a target,
+    with batches being read in parallel. The bytes of each part of a response are
+    written as-is without being parsed, and no more than twice the number of threads
+    worth of batches are held in memory at once.
+
+    The following formats are supported:
+
+    - "directory": each document is written to a file whose path is its URI relative
+      to the target directory.
+    - "zip" and "tar": each document is written to an entry whose name is its URI
+      without the leading slash. A tar archive is compressed if the target ends with
+      ".gz", ".tgz", ".bz2", or ".xz".
+    - "ndjson": each document is written as a line of JSON with "uri",
+      "contentType", "content", and "metadata" keys. JSON content is embedded as-is,
+      text and XML content as a string, and binary content as a base64 string, in which
+      case an "encoding" key with a value of "base64" is added.
+
+    For the first three formats, the metadata of a document is written as JSON to a
+    sidecar whose path is that of the document followed by ".metadata.json".
+
+    :param documents: the DocumentManager used to read documents.
+    :param target: the path of the directory, archive, or file to write to.
+    :param format: one of "directory", "zip", "tar", or "ndjson"; if not set, the
+    format is determined from the extension of the target.
+    :param metadata: if True, the metadata of each document is exported as well.
+    :param batch_size: the number of documents to read in each request.
+    :param thread_count: the number of batches to read in parallel.
+    """
+
+    def __init__(
+        self,
+        documents: DocumentManager,
+        target: str,
+        format: str = None,
+        metadata: bool = False,
+        batch_size: int = 100,
+        thread_count: int = 4,
+    ):
+        format = format if format else format_for_target(target)
+        if format not in FORMATS:
+            raise ValueError(f"Unsupported format: {format}; must be one of {FORMATS}")
+        self._documents = documents
+        self._target = target
+        self._format = format
+        self._metadata = metadata
+        self._batch_size = batch_size
+        self._thread_count = thread_count
+
+    def export(
+        self,
+        uris: list[str] = None,
+        q: str = None,
+        collections: list[str] = None,
+        ctsquery: dict = None,
+        on_batch: Callable[[BulkResult], None] = None,
+        deadline: Union[Deadline, float] = None,
+        cancellation: CancellationToken = None,
+    ) -> BulkResult:
+        """
+        Exports the documents with the given URIs or, if no URIs are given, every
+        document matching the given query criteria, which are retrieved from the URI
+        lexicon in batches. The succeeded URIs of the returned BulkResult are those of
+        the documents that were exported; a URI without a document is omitted.
+
+        :param uris: optional list of URIs to export.
+        :param q: optional search string, parsed via cts.parse, that documents must
+        match.
+        :param collections: optional collections that documents must belong to.
+        :param ctsquery: optional serialized cts query that documents must match.
+        :param on_batch: optional function that is invoked with a BulkResult for each
+        batch after the batch is written.
+        :param deadline: optional Deadline, or number of seconds, after which no
+        further batches are read; DeadlineExceeded is then raised, with its "result"
+        capturing the batches that were exported.
+        :param cancellation: optional CancellationToken for stopping the export from
+        another thread, which results in OperationCancelled being raised.
+        """
+        read_args = {"deadline": deadline, "cancellation": cancellation}
+        read_args = {k: v for k, v in read_args.items() if v is not None}
+        check = checker(read_args)
+        if uris is not None:
+            batches = chunk_items(uris, self._batch_size)
+        else:
+            batches = self._uri_batches(q, collections, ctsquery, read_args)
+
+        categories = ["content", "metadata"] if self._metadata else ["content"]
+
+        def read_batch(batch: list[str]):
+            return self._documents.read(
+                batch, categories=categories, return_response=True, **read_args
+            )
+
+        result = BulkResult()
+        writer = _WRITERS[self._format](self._target)
+        try:
+            for batch, response, error in run_batches(
+                read_batch, batches, self._thread_count, check
+            ):
+                batch_result = BulkResult()
+                if error is None and response.status_code == 200:
+                    batch_result.add_success(writer.write_response(response))
+                elif error is None and response.status_code == 404:
+                    # None of the URIs in the batch identify a document.
+                    pass
+                else:
+                    batch_result.add_failure(batch, response, error)
+                    logger.warning(
+                        f"Unable to read batch of {len(batch)} documents; "
+                        f"cause: {batch_result.failures[0].message}"
+                    )
+                result.add_success(batch_result.succeeded)
+                result.failures.extend(batch_result.failures)
+                if on_batch:
+                    on_batch(batch_result)
+        except (DeadlineExceeded, OperationCancelled) as error:
+            error.result = result
+            raise
+        finally:
+            writer.close()
+        return result
+
+    def _uri_batches(
+        self, q: str, collections: list[str], ctsquery: dict, read_args: dict
+    ) -> Iterator[list[str]]:
+        after = None
+        while True:
+            uris = self._documents._uris_after(
+                after, self._batch_size, q, collections, ctsquery, **read_args
+            )
+            if not uris:
+                return
+            yield uris
+            after = uris[-1]
+
+
+def format_for_target(target: str) -> str:
+    """
+    Returns the export format implied by the extension of the given target.
+    """
+    name = target.lower()
+    if name.endswith(".zip"):
+        return "zip"
+    if name.endswith((".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")):
+        return "tar"
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return "directory"
+
+
+def _iter_parts(response) -> Iterator[tuple]:
+    """
+    Yields a tuple of the URI, category, content type, and unparsed bytes of each
+    part of a multipart response from the v1/documents endpoint.
+    """
+    from marklogic.internal.multipart import iter_parts
+
+    if response_has_no_content(response):
+        return
+    for part in iter_parts(response):
+        values = _extract_values_from_header(part)
+        yield values["uri"], values["category"], values["content_type"], part.content
+
+
+def _relative_path(uri: str) -> str:
+    """
+    Returns the path, relative to the target, for a URI; empty, "." and ".."
+    segments are dropped so that a document cannot be written outside the target.
+    """
+    segments = [s for s in PurePosixPath(uri).parts if s not in ("/", ".", "..")]
+    if not segments:
+        raise ValueError(f"Unable to export URI to a path: {uri}")
+    return "/".join(segments)
+
+
+class _FileWriter(ABC):
+    """
+    Writes each part of a response to a named entry; subclasses define how an entry
+    is written.
+    """
+
+    def write_response(self, response) -> list[str]:
+        uris = []
+        for uri, category, _, content in _iter_parts(response):
+            name = _relative_path(uri)
+            if category == "content":
+                self._write_entry(name, content)
+                uris.append(uri)
+            else:
+                self._write_entry(name + METADATA_SUFFIX, content)
+        return uris
+
+    @abstractmethod
+    def _write_entry(self, name: str, content: bytes) -> None:
+        """
+        Writes the given content to the entry with the given name, which is a
+        relative path separated by forward slashes.
+        """
+
+    def close(self) -> None:
+        pass
+
+
+class _DirectoryWriter(_FileWriter):
+    def __init__(self, target: str):
+        self._target = target
+        os.makedirs(target, exist_ok=True)
+
+    def _write_entry(self, name: str, content: bytes) -> None:
+        path = os.path.join(self._target, *name.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(content)
+
+
+class _ZipWriter(_FileWriter):
+    def __init__(self, target: str):
+        self._zip = zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED)
+
+    def _write_entry(self, name: str, content: bytes) -> None:
+        self._zip.writestr(name, content)
+
+    def close(self) -> None:
+        self._zip.close()
+
+
+class _TarWriter(_FileWriter):
+    def __init__(self, target: str):
+        name = target.lower()
+        mode = "w"
+        if name.endswith((".gz", ".tgz")):
+            mode = "w:gz"
+        elif name.endswith(".bz2"):
+            mode = "w:bz2"
+        elif name.endswith(".xz"):
+            mode = "w:xz"
+        self._tar = tarfile.open(target, mode)
+
+    def _write_entry(self, name: str, content: bytes) -> None:
+        info = tarfile.TarInfo(name)
+        info.size = len(content)
+        info.mtime = int(time.time())
+        self._tar.addfile(info, io.BytesIO(content))
+
+    def close(self) -> None:
+        self._tar.close()
+
+
+class _NdjsonWriter:
+    """
+    Writes a line of JSON for each document. The content and metadata of a document
+    are returned in adjacent parts, so each line is written once the parts of a
+    document have been read. JSON is embedded without being parsed; because a newline
+    can only occur in JSON as whitespace, each is replaced with a space.
+    """
+
+    def __init__(self, target: str):
+        self._file = open(target, "wb")
+
+    def write_response(self, response) -> list[str]:
+        uris = []
+        pending = None
+        for uri, category, content_type, content in _iter_parts(response):
+            if pending is not None and pending["uri"] != uri:
+                self._write_line(pending)
+                pending = None
+            if pending is None:
+                pending = {"uri": uri}
+            if category == "content":
+                pending["content_type"] = content_type
+                pending["content"] = content
+                uris.append(uri)
+            else:
+                pending["metadata"] = content
+        if pending is not None:
+            self._write_line(pending)
+        return uris
+
+    def _write_line(self, document: dict) -> None:
+        content_type = document.get("content_type")
+        fields = [b'{"uri": ', json.dumps(document["uri"]).encode("utf-8")]
+        fields += [b', "contentType": ', json.dumps(content_type).encode("utf-8")]
+        content = document.get("content")
+        if content is not None:
+            fields.append(b', "content": ')
+            if content_type == "application/json":
+                fields.append(_single_line(content))
+            elif content_type in _TEXT_CONTENT_TYPES:
+                fields.append(json.dumps(content.decode("utf-8")).encode("utf-8"))
+            else:
+                fields.append(b'"' + base64.b64encode(content) + b'"')
+                fields.append(b', "encoding": "base64"')
+        if document.get("metadata") is not None:
+            fields += [b', "metadata": ', _single_line(document["metadata"])]
+        fields.append(b"}\n")
+        self._file.write(b"".join(fields))
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _single_line(content: bytes) -> bytes:
+    return content.replace(b"\r", b" ").replace(b"\n", b" ")
+
+
+_WRITERS = {
+    "directory": _DirectoryWriter,
+    "zip": _ZipWriter,
+    "tar": _TarWriter,
+    "ndjson": _NdjsonWriter,
+}
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m marklogic.export",
+        description="Exports documents from MarkLogic to a directory, archive, or "
+        "newline-delimited JSON file.",
+    )
+    parser.add_argument(
+        "target", help="directory, .zip, .tar[.gz], or .ndjson file to write to"
+    )
+    parser.add_argument("--format", choices=FORMATS, help="defaults from the target")
+    parser.add_argument("--uri", action="append", help="may be repeated")
+    parser.add_argument("--query", help="search string that documents must match")
+    parser.add_argument(
+        "--collection", action="append", default=[], help="may be repeated"
+    )
+    parser.add_argument(
+        "--metadata", action="store_true", help="export the metadata of each document"
+    )
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--quiet", action="store_true", help="do not display progress")
+    cli.add_client_arguments(parser)
+    return parser
+
+
+def main(argv: list[str] = None) -> int:
+    """
+    Runs the command-line exporter; returns 0 if every batch was exported and 1
+    otherwise.
+    """
+    args = _build_parser().parse_args(argv)
+    client = Client(**cli.client_args(args, max_connections=args.threads))
+    exporter = DocumentExporter(
+        client.documents,
+        args.target,
+        format=args.format,
+        metadata=args.metadata,
+        batch_size=args.batch_size,
+        thread_count=args.threads,
+    )
+    display = None if args.quiet else cli.progress_printer()
+    started = time.monotonic()
+    exported = [0]
+
+    def on_batch(result: BulkResult):
+        exported[0] += len(result.succeeded)
+        if display:
+            elapsed = time.monotonic() - started
+            display(f"Exported {exported[0]} documents; {exported[0] / elapsed:.0f}/s")
+
+    result = exporter.export(
+        uris=args.uri,
+        q=args.query,
+        collections=args.collection or None,
+        on_batch=on_batch,
+    )
+    if not args.quiet:
+        print(
+            f"\rExported {len(result.succeeded)} documents to {args.target}; "
+            f"{len(result.failed)} failed",
+            file=sys.stderr,
+        )
+    return 0 if result.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+import os
+import ssl
+import threading
+from http.client import HTTPMessage
+
+from requests import Response
+from requests.adapters import BaseAdapter
+from requests.cookies import extract_cookies_to_jar
+from requests.exceptions import ConnectionError, ConnectTimeout, ReadTimeout
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers, select_proxy
+
+"""
+Supports sending requests over HTTP/2 via the httpx library, which is installed via the
+"http2" extra - e.g. "pip install marklogic-python-client[http2]".
+"""
+
+# Headers that apply to a single HTTP/1.1 connection and are not permitted in HTTP/2.
+_CONNECTION_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-connection",
+    "transfer-encoding",
+    "upgrade",
+}
+
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+class HTTP2Adapter(BaseAdapter):
+    """
+    A requests transport adapter that sends requests via an httpx client with HTTP/2
+    enabled. Concurrent requests to the same host are multiplexed as streams over a
+    small number of connections instead of each requiring a connection of its own;
+    HTTP/1.1 is used when a server does not negotiate HTTP/2 during the TLS handshake.
+
+    Because this is a requests adapter, the authentication, hooks, cookie handling, and
+    proxies - including those from the environment - of the Session that sends each
+    request continue to apply. An httpx client is created for each combination of the
+    "verify", "cert", and proxy of a request.
+
+    :param max_connections: the maximum number of connections to open.
+    :param max_keepalive_connections: the maximum number of idle connections to retain.
+    """
+
+    def __init__(self, max_connections: int = 10, max_keepalive_connections: int = 10):
+        super(HTTP2Adapter, self).__init__()
+        try:
+            import httpx
+        except ImportError as error:
+            raise ImportError(
+                "HTTP/2 requires the httpx library; install it via "
+                "'pip install marklogic-python-client[http2]'."
+            ) from error
+        self._httpx = httpx
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def send(
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ) -> Response:
+        httpx = self._httpx
+        client = self._client_for(verify, cert, select_proxy(request.url, proxies))
+        headers = [
+            (name, value)
+            for name, value in request.headers.items()
+            if name.lower() not in _CONNECTION_HEADERS
+        ]
+        httpx_request = client.build_request(
+            request.method,
+            request.url,
+            headers=headers,
+            content=_to_content(request.body),
+            timeout=_to_timeout(httpx, timeout),
+        )
+        try:
+            httpx_response = client.send(httpx_request, stream=True)
+        except (httpx.ConnectTimeout, httpx.PoolTimeout) as error:
+            # A request that timed out waiting for a connection from the pool was
+            # never sent, and can thus be retried like a failed connection attempt.
+            raise ConnectTimeout(error, request=request)
+        except httpx.TimeoutException as error:
+            raise ReadTimeout(error, request=request)
+        except httpx.TransportError as error:
+            raise ConnectionError(error, request=request)
+        return self._build_response(request, httpx_response)
+
+    def close(self) -> None:
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
+
+    def _client_for(self, verify, cert, proxy):
+        key = (verify, cert if not isinstance(cert, list) else tuple(cert), proxy)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._httpx.Client(
+                    http2=True,
+                    verify=_ssl_context(verify, cert),
+                    limits=self._limits,
+                    timeout=None,
+                    follow_redirects=False,
+                    # requests has already determined the proxy from the environment.
+                    trust_env=False,
+                    proxy=proxy,
+                )
+                self._clients[key] = client
+            return client
+
+    def _build_response(self, request, httpx_response) -> Response:
+        """
+        Constructs a requests Response whose "raw" attribute streams the content of
+        the httpx response, mirroring HTTPAdapter.build_response.
+        """
+        response = Response()
+        response.status_code = httpx_response.status_code
+        headers = CaseInsensitiveDict()
+        for name, value in httpx_response.headers.multi_items():
+            headers[name] = f"{headers[name]}, {value}" if name in headers else value
+        response.headers = headers
+        response.encoding = get_encoding_from_headers(headers)
+        response.reason = httpx_response.reason_phrase
+        response.url = request.url
+        response.raw = _RawResponse(self._httpx, httpx_response, request)
+        extract_cookies_to_jar(response.cookies, request, response.raw)
+        response.request = request
+        response.connection = self
+        return response
+
+
+class _RawResponse:
+    """
+    Exposes the subset of the urllib3 response API that requests relies on when
+    reading content and extracting cookies. Content is decoded by httpx according to
+    its Content-Encoding header.
+    """
+
+    def __init__(self, httpx, httpx_response, request):
+        self._httpx = httpx
+        self._response = httpx_response
+        self._request = request
+        self._iterator = None
+        self._buffer = bytearray()
+        self.status = httpx_response.status_code
+        self.http_version = httpx_response.http_version
+        message = HTTPMessage()
+        for name, value in httpx_response.headers.multi_items():
+            message[name] = value
+        # Read by requests when extracting cookies from the response.
+        self._original_response = _OriginalResponse(message)
+
+    def stream(self, amt=_READ_CHUNK_SIZE, decode_content=True):
+        while True:
+            data = self.read(amt)
+            if not data:
+                return
+            yield data
+
+    def read(self, amt=None, decode_content=True, cache_content=False):
+        try:
+            if self._iterator is None:
+                self._iterator = self._response.iter_bytes(_READ_CHUNK_SIZE)
+            while amt is None or len(self._buffer) < amt:
+                chunk = next(self._iterator, None)
+                if chunk is None:
+                    break
+                self._buffer += chunk
+        except self._httpx.TimeoutException as error:
+            raise ReadTimeout(error, request=self._request)
+        except self._httpx.TransportError as error:
+            raise ConnectionError(error, request=self._request)
+        # The buffer is extended in place so that reading an entire body in one call
+        # does not copy it for each chunk.
+        if amt is None:
+            data, self._buffer = bytes(self._buffer), bytearray()
+        else:
+            data = bytes(self._buffer[:amt])
+            del self._buffer[:amt]
+        if not data:
+            self.close()
+        return data
+
+    def close(self) -> None:
+        self._response.close()
+
+    def release_conn(self) -> None:
+        self._response.close()
+
+
+class _OriginalResponse:
+    def __init__(self, msg: HTTPMessage):
+        self.msg = msg
+
+
+def _to_content(body):
+    if body is None or isinstance(body, (bytes, str)):
+        return body
+    if hasattr(body, "read"):
+        return _read_in_chunks(body)
+    return body
+
+
+def _read_in_chunks(file):
+    while True:
+        data = file.read(_READ_CHUNK_SIZE)
+        if not data:
+            return
+        yield data.encode("utf-8") if isinstance(data, str) else data
+
+
+def _to_timeout(httpx, timeout):
+    """
+    Converts a requests timeout - a number or a tuple of connect and read timeouts -
+    to an httpx Timeout.
+    """
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+def _ssl_context(verify, cert) -> ssl.SSLContext:
+    """
+    Constructs an SSL context from the requests "verify" and "cert" arguments.
+    """
+    if verify is False:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    elif isinstance(verify, str):
+        if os.path.isdir(verify):
+            context = ssl.create_default_context(capath=verify)
+        else:
+            context = ssl.create_default_context(cafile=verify)
+    else:
+        import certifi
+
+        context = ssl.create_default_context(cafile=certifi.where())
+    if cert:
+        if isinstance(cert, str):
+            context.load_cert_chain(cert)
+        else:
+            context.load_cert_chain(*cert)
+    return context
@@ -0,0 +1,246 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+import glob
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Union
+
+from marklogic.bulk import BulkResult
+from marklogic.documents import DefaultMetadata, Document, DocumentManager
+from marklogic.internal.batch import run_batches
+from marklogic.timeouts import (
+    CancellationToken,
+    Deadline,
+    DeadlineExceeded,
+    OperationCancelled,
+    checker,
+)
+
+logger = logging.getLogger(__name__)
+
+"""
+Supports loading files from directories and glob patterns into MarkLogic via
+https://docs.marklogic.com/REST/POST/v1/documents .
+"""
+
+
+def default_uri_function(relative_path: str) -> str:
+    """
+    Returns a URI consisting of a forward slash followed by the path of the file
+    relative to the directory that was ingested, or to the directory preceding the
+    first wildcard of a glob pattern, or the file name when a file was ingested.
+    """
+    return "/" + relative_path
+
+
+class FileIngester:
+    """
+    Writes files to MarkLogic in batches that are limited by both a number of documents
+    and a number of bytes, with batches being written in parallel. The content of each
+    file is sent as-is, allowing MarkLogic to determine the format of each document
+    based on its URI.
+
+    If a journal file is specified, the path of every file in each batch that is
+    written successfully is appended to it. When a journal already exists, any file
+    listed in it is skipped, such that an interrupted ingestion can be resumed by
+    running it again with the same journal.
+
+    :param documents: the DocumentManager used to write each batch.
+    :param uri_function: function that returns a URI for the path of a file, with the
+    path being relative to the directory that was ingested and always using forward
+    slashes as separators.
+    :param metadata: optional default metadata applied to every document.
+    :param batch_size: the maximum number of documents to write in a single request.
+    :param max_batch_bytes: the maximum number of bytes of content to write in a single
+    request; a file larger than this is written in a batch of its own.
+    :param thread_count: the number of batches to write in parallel.
+    :param journal: optional path of a file for recording successfully written files.
+    """
+
+    def __init__(
+        self,
+        documents: DocumentManager,
+        uri_function: Callable[[str], str] = default_uri_function,
+        metadata: DefaultMetadata = None,
+        batch_size: int = 100,
+        max_batch_bytes: int = 16 * 1024 * 1024,
+        thread_count: int = 4,
+        journal: str = None,
+    ):
+        self._documents = documents
+        self._uri_function = uri_function
+        self._metadata = metadata
+        self._batch_size = batch_size
+        self._max_batch_bytes = max_batch_bytes
+        self._thread_count = thread_count
+        self._journal = journal
+
+    def ingest(
+        self,
+        paths: Union[str, list[str]],
+        on_batch: Callable[[BulkResult], None] = None,
+        deadline: Union[Deadline, float] = None,
+        cancellation: CancellationToken = None,
+    ) -> BulkResult:
+        """
+        Writes every file found via the given paths, each of which can be a file, a
+        directory that is walked recursively, or a glob pattern; "**" is supported for
+        matching any number of directories.
+
+        :param paths: list of paths or a single path.
+        :param on_batch: optional function that is invoked with a BulkResult for each
+        batch after the batch is written.
+        :param deadline: optional Deadline, or number of seconds, after which no
+        further batches are written; DeadlineExceeded is then raised, with its "result"
+        capturing the batches that were written.
+        :param cancellation: optional CancellationToken for stopping the ingestion
+        from another thread, which results in OperationCancelled being raised.
+        """
+        paths = [paths] if isinstance(paths, str) else paths
+        return self._ingest_files(_find_files(paths), on_batch, deadline, cancellation)
+
+    def _ingest_files(
+        self,
+        files: Iterable[tuple],
+        on_batch: Callable[[BulkResult], None] = None,
+        deadline: Union[Deadline, float] = None,
+        cancellation: CancellationToken = None,
+    ) -> BulkResult:
+        """
+        Writes the given tuples of file path and path relative to the directory being
+        ingested; see 'ingest' for the other arguments.
+        """
+        completed = self._read_journal()
+        files = (f for f in files if f[0] not in completed)
+
+        write_args = {"deadline": deadline, "cancellation": cancellation}
+        write_args = {k: v for k, v in write_args.items() if v is not None}
+        check = checker(write_args)
+
+        def write_batch(batch: list[tuple]):
+            return self._write_batch(batch, **write_args)
+
+        result = BulkResult()
+        journal = open(self._journal, "a", encoding="utf-8") if self._journal else None
+        try:
+            for batch, response, error in run_batches(
+                write_batch, self._make_batches(files), self._thread_count, check
+            ):
+                uris = [uri for _, uri, _ in batch]
+                batch_result = BulkResult()
+                if error is None and response.status_code == 200:
+                    batch_result.add_success(uris)
+                    if journal:
+                        journal.write(json.dumps([f[0] for f in batch]) + "\n")
+                        journal.flush()
+                else:
+                    batch_result.add_failure(uris, response, error)
+                    logger.warning(
+                        f"Unable to write batch of {len(uris)} documents; "
+                        f"cause: {batch_result.failures[0].message}"
+                    )
+                result.add_success(batch_result.succeeded)
+                result.failures.extend(batch_result.failures)
+                if on_batch:
+                    on_batch(batch_result)
+        except (DeadlineExceeded, OperationCancelled) as error:
+            error.result = result
+            raise
+        finally:
+            if journal:
+                journal.close()
+        return result
+
+    def _read_journal(self) -> set:
+        return read_journal(self._journal) if self._journal else set()
+
+    def _make_batches(self, files: Iterable[tuple]) -> Iterator[list[tuple]]:
+        """
+        Groups tuples of file path, URI, and size into batches constrained by both
+        the batch size and the maximum number of bytes.
+        """
+        batch = []
+        batch_bytes = 0
+        for path, relative_path in files:
+            size = os.path.getsize(path)
+            if batch and (
+                len(batch) >= self._batch_size
+                or batch_bytes + size > self._max_batch_bytes
+            ):
+                yield batch
+                batch = []
+                batch_bytes = 0
+            batch.append((path, self._uri_function(relative_path), size))
+            batch_bytes += size
+        if batch:
+            yield batch
+
+    def _write_batch(self, batch: list[tuple], **kwargs):
+        """
+        Reads each file in the batch and writes the batch. The multipart body of a
+        request is constructed in memory, so the size of a batch is bounded by
+        max_batch_bytes rather than by how each file is read.
+        """
+        parts = [self._metadata] if self._metadata else []
+        for path, uri, _ in batch:
+            with open(path, "rb") as file:
+                parts.append(Document(uri, file.read()))
+        return self._documents.write(parts, **kwargs)
+
+
+def read_journal(path: str) -> set:
+    """
+    Returns the paths of the files recorded in the given journal, or an empty set if
+    the journal does not exist.
+    """
+    completed = set()
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as journal:
+            for line in journal:
+                # A partially written line is ignored so that its batch is written
+                # again.
+                try:
+                    completed.update(json.loads(line))
+                except ValueError:
+                    pass
+    return completed
+
+
+def _find_files(paths: list[str]) -> Iterator[tuple]:
+    """
+    Yields a tuple of the path of each file and its path relative to the directory
+    that was searched, in a stable order. For a glob pattern, the directory that was
+    searched is the one preceding the first wildcard, such that files with the same
+    name in different matched directories have different relative paths.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            root = Path(path)
+            for directory, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    file = Path(directory, filename)
+                    yield str(file), file.relative_to(root).as_posix()
+        elif any(char in path for char in "*?["):
+            root = _glob_root(path)
+            for match in sorted(glob.glob(path, recursive=True)):
+                if os.path.isfile(match):
+                    yield match, Path(match).relative_to(root).as_posix()
+        else:
+            yield path, Path(path).name
+
+
+def _glob_root(pattern: str) -> Path:
+    """
+    Returns the directory consisting of the segments of the pattern that precede the
+    first segment containing a wildcard.
+    """
+    root = []
+    for part in Path(pattern).parts[:-1]:
+        if any(char in part for char in "*?["):
+            break
+        root.append(part)
+    return Path(*root)
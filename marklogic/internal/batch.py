@@ -0,0 +1,140 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+from typing import Callable, Iterable, Iterator
+from urllib.parse import quote_plus
+
+"""
+Supports splitting work into batches and sending each batch to MarkLogic, optionally
+in parallel via the connection pool of the requests Session that sends each batch.
+"""
+
+
+def chunk_uris_by_url_length(
+    uris: Iterable[str], max_length: int, param_name: str = "uri"
+) -> Iterator[list[str]]:
+    """
+    Splits the given URIs into lists such that the query string containing each list
+    as repeated request parameters does not exceed the given length. A URI that
+    exceeds the length on its own is still returned in a list of its own so that
+    MarkLogic can report the error for it.
+    """
+    chunk = []
+    length = 0
+    for uri in uris:
+        param_length = len(param_name) + len(quote_plus(uri)) + 2
+        if chunk and length + param_length > max_length:
+            yield chunk
+            chunk = []
+            length = 0
+        chunk.append(uri)
+        length += param_length
+    if chunk:
+        yield chunk
+
+
+def chunk_items(items: Iterable, size: int) -> Iterator[list]:
+    """
+    Splits the given items into lists of the given size, with the last list possibly
+    being smaller.
+    """
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def run_batches(
+    function: Callable, batches: Iterable, thread_count: int = 1, check: Callable = None
+) -> Iterator[tuple]:
+    """
+    Invokes the given function with each batch and yields a tuple of the batch, the
+    value returned by the function, and the exception raised by the function, if any.
+    Tuples are yielded as each batch completes, which may differ from the order of the
+    batches when more than one thread is used.
+
+    Batches are consumed lazily, with no more than twice the number of threads being
+    in flight at one time. This allows for a very large iterable of batches to be
+    processed without first being read entirely into memory.
+
+    If a check function is given, it is invoked before each batch is started. Once it
+    raises an exception, no further batches are started, and the exception is raised
+    after the batches already in progress have completed and been yielded. A batch
+    is taken from the iterable before it is checked, so the batch for which the check
+    failed - and, when more than one thread is used, any batch that was queued but not
+    yet started - has been consumed from the iterable without being yielded.
+    """
+    if thread_count <= 1:
+        for batch in batches:
+            if check:
+                check()
+            try:
+                yield batch, function(batch), None
+            except Exception as error:
+                yield batch, None, error
+        return
+
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    def run(batch):
+        if check:
+            try:
+                check()
+            except Exception as error:
+                raise _NotStarted(error)
+        return function(batch)
+
+    batches = iter(batches)
+    stopped = None
+    with ThreadPoolExecutor(max_workers=thread_count) as executor:
+        pending = {}
+        while True:
+            if stopped is None:
+                try:
+                    for batch in batches:
+                        if check:
+                            check()
+                        pending[executor.submit(run, batch)] = batch
+                        if len(pending) >= thread_count * 2:
+                            break
+                except Exception as error:
+                    stopped = error
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch = pending.pop(future)
+                error = future.exception()
+                if isinstance(error, _NotStarted):
+                    stopped = stopped or error.cause
+                    continue
+                yield batch, None if error else future.result(), error
+    if stopped is not None:
+        raise stopped
+
+
+class _NotStarted(Exception):
+    def __init__(self, cause: Exception):
+        self.cause = cause
+
+
+class CheckpointTracker:
+    """
+    Tracks batches that are numbered in the order they were created but that may
+    complete in any order, and determines the last item of the most recent batch
+    before which every batch has completed.
+    """
+
+    def __init__(self, checkpoint=None):
+        self.checkpoint = checkpoint
+        self._next_index = 0
+        self._completed = {}
+
+    def complete(self, index: int, last_item) -> None:
+        self._completed[index] = last_item
+        while self._next_index in self._completed:
+            self.checkpoint = self._completed.pop(self._next_index)
+            self._next_index += 1
@@ -0,0 +1,142 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+import threading
+import time
+from collections import OrderedDict
+
+"""
+Supports caching the results of requests to MarkLogic on the client.
+"""
+
+
+class TTLCache:
+    """
+    A thread-safe cache in which each entry expires after its own time-to-live and in
+    which the least recently used entry is evicted once the cache is full. Counts of
+    hits, misses, evictions, and expirations are kept for reporting via 'stats'.
+
+    Values can be loaded via 'get_or_load', which ensures that concurrent requests for
+    the same missing key result in a single load, with every other caller waiting for
+    and then sharing the cached value. A value whose load started before an
+    invalidation is returned to the caller that loaded it but is not cached.
+
+    :param max_size: the maximum number of entries to retain.
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._coalesced = 0
+        self._loading = {}
+        # Incremented by every invalidation so that a load that was in progress at the
+        # time does not cache a result that may predate it.
+        self._generation = 0
+
+    def get(self, key):
+        """
+        Returns the value for the given key, or None if the key is not cached or its
+        entry has expired.
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            return value
+
+    def get_or_load(self, key, loader, ttl: float, should_cache=None):
+        """
+        Returns the value for the given key, invoking the loader to obtain and cache
+        it if necessary. If another thread is already loading the key, this waits for
+        that load to complete instead of invoking the loader.
+
+        :param should_cache: optional function that determines whether a loaded value
+        is cached; a thread waiting on a value that is not cached loads it itself.
+        """
+        counted = False
+        while True:
+            with self._lock:
+                value = self._lookup(key)
+                if value is not None:
+                    if counted:
+                        self._coalesced += 1
+                    else:
+                        self._hits += 1
+                    return value
+                if not counted:
+                    self._misses += 1
+                    counted = True
+                event = self._loading.get(key)
+                leader = event is None
+                if leader:
+                    event = threading.Event()
+                    self._loading[key] = event
+                    generation = self._generation
+            if not leader:
+                event.wait()
+                continue
+            try:
+                value = loader()
+                if should_cache is None or should_cache(value):
+                    self.put(key, value, ttl, generation)
+                return value
+            finally:
+                with self._lock:
+                    del self._loading[key]
+                event.set()
+
+    def _lookup(self, key):
+        # Must be called while holding the lock.
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] <= time.monotonic():
+            del self._entries[key]
+            self._expirations += 1
+            entry = None
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, ttl: float, generation: int = None) -> None:
+        """
+        Caches the given value for the given number of seconds. If a generation is
+        given, the value is only cached if the cache has not been invalidated since.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, predicate=None) -> int:
+        """
+        Removes every entry, or only the entries whose key satisfies the given
+        predicate, and returns the number of entries removed.
+        """
+        with self._lock:
+            self._generation += 1
+            keys = [k for k in self._entries if predicate is None or predicate(k)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "coalesced": self._coalesced,
+            }
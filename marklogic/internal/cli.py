@@ -0,0 +1,79 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+import argparse
+import os
+import sys
+import time
+
+"""
+Supports the command-line arguments shared by the modules that can be run via
+"python -m", such as marklogic.load and marklogic.export.
+"""
+
+
+def add_client_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Adds the arguments for connecting to MarkLogic to the given parser.
+    """
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--scheme", default="http", choices=["http", "https"])
+    parser.add_argument("--base-path", help="path prepended to each request")
+    parser.add_argument("--username")
+    parser.add_argument(
+        "--password", help="defaults to the MARKLOGIC_PASSWORD environment variable"
+    )
+    parser.add_argument("--auth", default="digest", choices=["digest", "basic"])
+    parser.add_argument(
+        "--cloud-api-key",
+        help="defaults to the MARKLOGIC_CLOUD_API_KEY environment variable",
+    )
+    parser.add_argument(
+        "--no-verify", action="store_true", help="do not verify certificates"
+    )
+    parser.add_argument(
+        "--no-compression",
+        action="store_true",
+        help="do not accept compressed responses",
+    )
+
+
+def client_args(args: argparse.Namespace, max_connections: int = 10) -> dict:
+    """
+    Returns the keyword arguments for constructing a Client from the arguments added
+    via 'add_client_arguments'.
+    """
+    result = {
+        "host": args.host,
+        "port": args.port,
+        "scheme": args.scheme,
+        "base_path": args.base_path,
+        "verify": not args.no_verify,
+        "max_connections": max_connections,
+        "compression": not args.no_compression,
+    }
+    cloud_api_key = args.cloud_api_key or os.environ.get("MARKLOGIC_CLOUD_API_KEY")
+    password = args.password or os.environ.get("MARKLOGIC_PASSWORD")
+    if cloud_api_key:
+        result["cloud_api_key"] = cloud_api_key
+    elif args.auth == "basic":
+        result["auth"] = (args.username, password)
+    else:
+        result["digest"] = (args.username, password)
+    return result
+
+
+def progress_printer(interval: float = 0.5):
+    """
+    Returns a function that displays a line of progress on stderr, replacing the
+    previous line, at most once per the given number of seconds.
+    """
+    last_display = [0.0]
+
+    def display(progress) -> None:
+        now = time.monotonic()
+        if now - last_display[0] >= interval:
+            last_display[0] = now
+            print(f"\r{progress}", end="", file=sys.stderr, flush=True)
+
+    return display
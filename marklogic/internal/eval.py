@@ -2,46 +2,63 @@
 
 import json
 
-from decimal import Decimal
-from marklogic.documents import Document
 from marklogic.internal.util import response_has_no_content
+from marklogic.profiling import profiler_for, stage
 from requests import Response
-from requests_toolbelt.multipart.decoder import MultipartDecoder
 
 """
-Supports working with data returned by the v1/eval and v1/invoke endpoints.
+Supports working with data returned by the v1/eval and v1/invoke endpoints. The
+decimal library and the multipart parser, along with the documents module, are only
+imported when a response requires them.
 """
 
 
-def process_multipart_mixed_response(response: Response) -> list:
+def process_multipart_mixed_response(response: Response, compact: bool = False) -> list:
     """
     Process a multipart REST response by putting them in a list and
     transforming each part based on the "X-Primitive" header.
 
     :param response: The original multipart/mixed response from a call to a
     MarkLogic server.
+    :param compact: if True, a node with a URI is returned as a CompactDocument
+    instead of a Document.
     """
     if response_has_no_content(response):
         return None
 
-    parts = MultipartDecoder.from_response(response).parts
-    transformed_parts = []
-    for part in parts:
-        encoding = part.encoding
-        header = part.headers["X-Primitive".encode(encoding)].decode(encoding)
-        primitive_function = __primitive_value_converters.get(header)
-        if primitive_function is not None:
-            transformed_parts.append(primitive_function(part))
-        else:
-            # Return the binary created by requests_toolbelt so we don't get an
-            # error trying to convert it to something else.
-            transformed_parts.append(part.content)
-    return transformed_parts
+    from marklogic.internal.multipart import iter_parts
+
+    profiler = profiler_for(response)
+    with stage(profiler, "multipart_decode", len(response.content)):
+        parts = iter_parts(response)
+        transformed_parts = []
+        for part in parts:
+            encoding = part.encoding
+            header = part.headers["X-Primitive".encode(encoding)].decode(encoding)
+            with stage(profiler, "content_parse", len(part.content)):
+                if compact and header in __node_content_extractors:
+                    extractor = __node_content_extractors[header]
+                    transformed_parts.append(__process_node(part, extractor, compact))
+                    continue
+                primitive_function = __primitive_value_converters.get(header)
+                if primitive_function is not None:
+                    transformed_parts.append(primitive_function(part))
+                else:
+                    # Return the binary content of the part so we don't get
+                    # an error trying to convert it to something else.
+                    transformed_parts.append(part.content)
+        return transformed_parts
 
 
+__node_content_extractors = {
+    "object-node()": lambda part: json.loads(part.text),
+    "document-node()": lambda part: part.text,
+    "binary()": lambda part: part.content,
+}
+
 __primitive_value_converters = {
     "integer": lambda part: int(part.text),
-    "decimal": lambda part: Decimal(part.text),
+    "decimal": lambda part: __to_decimal(part),
     "boolean": lambda part: "False" == part.text,
     "string": lambda part: part.text,
     "map": lambda part: json.loads(part.text),
@@ -49,18 +66,100 @@ __primitive_value_converters = {
     "array": lambda part: json.loads(part.text),
     "array-node()": lambda part: json.loads(part.text),
     "object-node()": lambda part: __process_node(
-        part, lambda part: json.loads(part.text)
+        part, __node_content_extractors["object-node()"]
+    ),
+    "document-node()": lambda part: __process_node(
+        part, __node_content_extractors["document-node()"]
+    ),
+    "binary()": lambda part: __process_node(
+        part, __node_content_extractors["binary()"]
     ),
-    "document-node()": lambda part: __process_node(part, lambda part: part.text),
-    "binary()": lambda part: __process_node(part, lambda part: part.content),
 }
 
 
-def __process_node(part, content_extractor):
+def __to_decimal(part):
+    from decimal import Decimal
+
+    return Decimal(part.text)
+
+
+def __process_node(part, content_extractor, compact: bool = False):
     content = content_extractor(part)
     if b"X-URI" in part.headers:
+        from marklogic.documents import CompactDocument, Document
+
         encoding = part.encoding
         uri = part.headers["X-URI".encode(encoding)].decode(encoding)
-        return Document(uri, content)
+        return CompactDocument(uri, content) if compact else Document(uri, content)
     else:
         return content
+
+
+# Identifies the object preceding the results of each item in a batch of scripts.
+BATCH_ITEM_KEY = "marklogic-python-batch-item"
+
+# Evaluates each item in a batch in turn, preceding the results of each item with an
+# object that identifies the item and the number of results, or the error it raised.
+BATCH_SCRIPT = (
+    """
+var items;
+const results = [];
+JSON.parse(items).forEach((item, index) => {
+  const header = {"%s": index, "count": 0};
+  try {
+    const values = item.language === "xquery"
+      ? xdmp.xqueryEval(item.script, item.vars)
+      : xdmp.eval(item.script, item.vars);
+    const array = values.toArray();
+    header.count = array.length;
+    results.push(header, ...array);
+  } catch (e) {
+    header.error = {name: e.name, message: e.message, stack: e.stack};
+    results.push(header);
+  }
+});
+Sequence.from(results);
+"""
+    % BATCH_ITEM_KEY
+)
+
+
+class EvalResult:
+    """
+    The outcome of a single script within a batch evaluated via Client.eval_batch.
+
+    :param values: a list of the values returned by the script, or None if the script
+    returned nothing or raised an error.
+    :param error: a dict with the "name", "message", and "stack" of the error raised
+    by the script, or None if the script succeeded.
+    """
+
+    def __init__(self, values: list = None, error: dict = None):
+        self.values = values
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        return "{!r}".format(self.__dict__)
+
+
+def split_batch_results(parts: list, item_count: int) -> list[EvalResult]:
+    """
+    Splits the values returned by BATCH_SCRIPT into one EvalResult per item, based on
+    the object preceding the results of each item.
+    """
+    results = [EvalResult() for _ in range(item_count)]
+    position = 0
+    parts = parts if parts else []
+    while position < len(parts):
+        header = parts[position]
+        count = header["count"]
+        values = parts[position + 1 : position + 1 + count]
+        results[header[BATCH_ITEM_KEY]] = EvalResult(
+            values if values else None, header.get("error")
+        )
+        position += 1 + count
+    return results
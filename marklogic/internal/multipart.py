@@ -0,0 +1,159 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+from typing import Iterable, Iterator
+
+from marklogic.profiling import profiler_for, stage
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+"""
+Parses multipart/mixed responses incrementally. When a response was requested with
+stream=True, its body is parsed as it is received - after being decompressed chunk by
+chunk if MarkLogic or a proxy compressed it - such that neither the full body nor a
+copy of it needs to be held in memory while its parts are being extracted.
+"""
+
+# The number of bytes read from a streamed response at a time.
+_CHUNK_SIZE = 64 * 1024
+
+_TRUNCATED = "Multipart body ended before its closing delimiter"
+
+
+class BodyPart:
+    """
+    A single part of a multipart response. Has the same attributes as the BodyPart
+    class in requests_toolbelt, including a "headers" dict whose names and values are
+    bytes.
+    """
+
+    __slots__ = ("headers", "content", "encoding")
+
+    def __init__(self, headers: CaseInsensitiveDict, content: bytes, encoding: str):
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding)
+
+
+def iter_parts(
+    response: Response, encoding: str = "utf-8", chunk_size: int = _CHUNK_SIZE
+) -> Iterator[BodyPart]:
+    """
+    Yields each part of the given multipart response. If the body of the response has
+    not been read yet, it is read in chunks as the parts are consumed, and the time
+    spent receiving each chunk is recorded as the "receive" stage when profiling. The
+    response is closed if the parts are not consumed entirely.
+    """
+    boundary = _find_boundary(response.headers.get("Content-Type", ""), encoding)
+    # requests sets _content once the body has been read in full.
+    if response._content is not False:
+        yield from parse_parts([response.content], boundary, encoding)
+        return
+    try:
+        chunks = _receive(response, chunk_size)
+        yield from parse_parts(chunks, boundary, encoding)
+    finally:
+        response.close()
+
+
+def _receive(response: Response, chunk_size: int) -> Iterator[bytes]:
+    profiler = profiler_for(response)
+    chunks = response.iter_content(chunk_size)
+    while True:
+        with stage(profiler, "receive") as frame:
+            chunk = next(chunks, None)
+            if chunk is None:
+                return
+            frame.bytes = len(chunk)
+        yield chunk
+
+
+def _find_boundary(content_type: str, encoding: str) -> bytes:
+    mimetype, *params = [value.strip() for value in content_type.split(";")]
+    if mimetype.split("/")[0].lower() == "multipart":
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "boundary":
+                return value.strip().strip('"').encode(encoding)
+    raise ValueError(f"Response does not have a multipart content type: {content_type}")
+
+
+def parse_parts(
+    chunks: Iterable[bytes], boundary: bytes, encoding: str = "utf-8"
+) -> Iterator[BodyPart]:
+    """
+    Yields each part of a multipart body that is split across the given chunks; each
+    chunk is only read once the parts preceding it have been yielded.
+    """
+    chunks = iter(chunks)
+    delimiter = b"\r\n--" + boundary
+    # Allows the first delimiter, which need not follow a line break, to be found in
+    # the same manner as every other delimiter.
+    buffer = bytearray(b"\r\n")
+
+    def fill() -> bool:
+        chunk = next(chunks, None)
+        if chunk is None:
+            return False
+        buffer.extend(chunk)
+        return True
+
+    def find(pattern: bytes, required: bool = True) -> int:
+        start = 0
+        while True:
+            index = buffer.find(pattern, start)
+            if index >= 0:
+                return index
+            # Only the bytes that could begin a match need to be searched again.
+            start = max(start, len(buffer) - len(pattern) + 1)
+            if not fill():
+                if required:
+                    raise ValueError(_TRUNCATED)
+                return -1
+
+    def require(count: int) -> None:
+        while len(buffer) < count:
+            if not fill():
+                raise ValueError(_TRUNCATED)
+
+    index = find(delimiter, required=False)
+    if index < 0:
+        return
+    del buffer[: index + len(delimiter)]
+    while True:
+        require(2)
+        if buffer.startswith(b"--"):
+            # Reads the epilogue so that a streamed response is consumed entirely.
+            for _ in chunks:
+                pass
+            return
+
+        # The rest of the delimiter line may only contain whitespace.
+        index = find(b"\r\n")
+        del buffer[: index + 2]
+
+        require(2)
+        if buffer.startswith(b"\r\n"):
+            header_block = b""
+            del buffer[:2]
+        else:
+            index = find(b"\r\n\r\n")
+            header_block = bytes(buffer[:index])
+            del buffer[: index + 4]
+
+        index = find(delimiter)
+        content = bytes(buffer[:index])
+        del buffer[: index + len(delimiter)]
+        yield BodyPart(_parse_headers(header_block), content, encoding)
+
+
+def _parse_headers(header_block: bytes) -> CaseInsensitiveDict:
+    headers = CaseInsensitiveDict()
+    for line in header_block.split(b"\r\n"):
+        name, separator, value = line.partition(b":")
+        if separator:
+            headers[name.strip()] = value.strip()
+    return headers
@@ -1,7 +1,25 @@
 # Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
 
+import json
+from typing import Union
+
 from requests import Response
 
 
 def response_has_no_content(response: Response) -> bool:
     return response.headers.get("Content-Length") == "0"
+
+
+def query_data_and_content_type(query: Union[dict, str]) -> tuple:
+    """
+    Returns the data to send for the given JSON or XML query, patch, or query options,
+    along with the associated content type. A dict is serialized to JSON, and a string
+    is assumed to be XML unless it can be parsed as JSON.
+    """
+    if isinstance(query, dict):
+        return json.dumps(query), "application/json"
+    try:
+        json.loads(query)
+    except Exception:
+        return query, "application/xml"
+    return query, "application/json"
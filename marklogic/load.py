@@ -0,0 +1,352 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+import argparse
+import heapq
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from queue import Empty
+from typing import Callable, Union
+
+from marklogic.documents import DefaultMetadata
+from marklogic.internal import cli
+from marklogic.ingest import _find_files, read_journal
+
+logger = logging.getLogger(__name__)
+
+"""
+Supports loading files into MarkLogic from many processes at once, so that encoding
+requests is not limited to the single core available to one Python process. Can be
+run as "python -m marklogic.load"; run it with "--help" for its arguments.
+"""
+
+
+class LoadProgress:
+    """
+    The aggregated progress of a load across every worker process. The "errors" list
+    contains a message for each worker process that stopped before writing every
+    file in its shard; the files in a failed batch are listed in "failed" instead.
+    """
+
+    def __init__(self, total_documents: int, total_bytes: int):
+        self.total_documents = total_documents
+        self.total_bytes = total_bytes
+        self.documents = 0
+        self.bytes = 0
+        self.failed: list[str] = []
+        self.errors: list[str] = []
+        self.started = time.monotonic()
+        self.elapsed = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return len(self.failed) == 0 and len(self.errors) == 0
+
+    @property
+    def documents_per_second(self) -> float:
+        return self.documents / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (
+            f"Loaded {self.documents}/{self.total_documents} documents "
+            f"({self.bytes / 1024 / 1024:.1f} MB); {len(self.failed)} failed; "
+            f"{len(self.errors)} worker errors; "
+            f"{self.documents_per_second:.0f} docs/s, "
+            f"{self.bytes_per_second / 1024 / 1024:.1f} MB/s"
+        )
+
+    def __repr__(self):
+        return "{!r}".format(
+            {
+                "documents": self.documents,
+                "bytes": self.bytes,
+                "failed": len(self.failed),
+                "errors": len(self.errors),
+                "elapsed": self.elapsed,
+            }
+        )
+
+
+def load(
+    paths: Union[str, list[str]],
+    client_args: dict,
+    processes: int = None,
+    uri_prefix: str = "/",
+    metadata: DefaultMetadata = None,
+    batch_size: int = 100,
+    max_batch_bytes: int = 16 * 1024 * 1024,
+    thread_count: int = 4,
+    journal: str = None,
+    failures_log: str = None,
+    on_progress: Callable[[LoadProgress], None] = None,
+) -> LoadProgress:
+    """
+    Loads every file found via the given paths - as described by
+    FileIngester.ingest - by sharding the files across a pool of processes. Each
+    process creates its own Client and writes its files via a FileIngester, and
+    reports the outcome of each batch back to this process.
+
+    :param paths: list of paths or a single path.
+    :param client_args: the keyword arguments for constructing the Client of each
+    process; these must be picklable.
+    :param processes: the number of processes; defaults to the number of CPUs.
+    :param uri_prefix: prepended to the path of each file relative to the directory
+    being loaded to construct its URI.
+    :param metadata: optional default metadata applied to every document.
+    :param batch_size: the maximum number of documents in each request.
+    :param max_batch_bytes: the maximum number of bytes of content in each request.
+    :param thread_count: the number of batches each process writes in parallel.
+    :param journal: optional path from which the journal of each process is
+    derived; any file recorded in a journal is skipped, such that an interrupted load
+    can be resumed by running it again with the same journal, even with a different
+    number of processes.
+    :param failures_log: optional path of a file to which each failed batch is
+    appended as a line of JSON containing its URIs and error message.
+    :param on_progress: optional function invoked with the LoadProgress after each
+    batch is written by any process.
+    """
+    paths = [paths] if isinstance(paths, str) else paths
+    processes = processes if processes else os.cpu_count() or 1
+    completed = _read_journals(journal)
+    files = [
+        (path, relative_path, os.path.getsize(path))
+        for path, relative_path in _find_files(paths)
+        if path not in completed
+    ]
+    progress = LoadProgress(len(files), sum(f[2] for f in files))
+    shards = [s for s in _shard_by_size(files, processes) if s]
+
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    workers = []
+    for index, shard in enumerate(shards):
+        settings = {
+            "client_args": client_args,
+            "uri_prefix": uri_prefix,
+            "metadata": metadata,
+            "batch_size": batch_size,
+            "max_batch_bytes": max_batch_bytes,
+            "thread_count": thread_count,
+            "journal": f"{journal}.{index}" if journal else None,
+        }
+        worker = context.Process(
+            target=_load_shard, args=(shard, settings, queue), daemon=True
+        )
+        worker.start()
+        workers.append(worker)
+
+    failures = open(failures_log, "a", encoding="utf-8") if failures_log else None
+    finished = False
+    try:
+        running = len(workers)
+        while running:
+            try:
+                message = queue.get(timeout=1)
+            except Empty:
+                if not any(worker.is_alive() for worker in workers):
+                    message = "Worker processes exited without finishing"
+                    logger.error(message)
+                    progress.errors.append(message)
+                    break
+                continue
+            if message[0] == "done":
+                running -= 1
+                if message[1]:
+                    logger.error(f"Worker process failed; cause: {message[1]}")
+                    progress.errors.append(message[1])
+                continue
+            _, documents, nbytes, batch_failures = message
+            progress.documents += documents
+            progress.bytes += nbytes
+            for uris, error_message in batch_failures:
+                progress.failed.extend(uris)
+                if failures:
+                    failures.write(
+                        json.dumps({"uris": uris, "message": error_message}) + "\n"
+                    )
+                    failures.flush()
+            progress.elapsed = time.monotonic() - progress.started
+            if on_progress:
+                on_progress(progress)
+        finished = True
+    finally:
+        if failures:
+            failures.close()
+        if not finished:
+            # Once this process stops reading the queue - such as on a
+            # KeyboardInterrupt - a worker can block forever on putting a message on
+            # it, so the workers are terminated instead of being waited on. Their
+            # journals remain valid, so the load can be resumed.
+            for worker in workers:
+                worker.terminate()
+            queue.cancel_join_thread()
+        for worker in workers:
+            worker.join()
+    progress.elapsed = time.monotonic() - progress.started
+    return progress
+
+
+def _read_journals(journal: str) -> set:
+    """
+    Returns the paths of the files recorded in the journal of every process.
+    """
+    if not journal:
+        return set()
+    directory = os.path.dirname(journal) or "."
+    prefix = os.path.basename(journal) + "."
+    completed = set()
+    if os.path.isdir(directory):
+        for name in os.listdir(directory):
+            if name.startswith(prefix) and name.removeprefix(prefix).isdigit():
+                path = os.path.join(directory, name)
+                completed.update(read_journal(path))
+    return completed
+
+
+def _shard_by_size(files: list[tuple], count: int) -> list[list[tuple]]:
+    """
+    Assigns each file, largest first, to the shard with the fewest bytes so that each
+    process writes a similar amount of content. Each shard retains the order in which
+    its files were found.
+    """
+    heap = [(0, index) for index in range(count)]
+    assignments = {}
+    for position in sorted(range(len(files)), key=lambda i: -files[i][2]):
+        size, index = heapq.heappop(heap)
+        assignments[position] = index
+        heapq.heappush(heap, (size + files[position][2], index))
+    shards = [[] for _ in range(count)]
+    for position, file in enumerate(files):
+        shards[assignments[position]].append(file)
+    return shards
+
+
+def _load_shard(files: list[tuple], settings: dict, queue) -> None:
+    """
+    Runs in a worker process; writes the given files and puts a message on the queue
+    for each batch, followed by a final "done" message.
+    """
+    error = None
+    try:
+        from marklogic import Client
+        from marklogic.ingest import FileIngester
+
+        client = Client(**settings["client_args"])
+        prefix = settings["uri_prefix"]
+        sizes = {prefix + relative_path: size for _, relative_path, size in files}
+
+        def on_batch(result):
+            failures = [(f.uris, f.message) for f in result.failures]
+            nbytes = sum(sizes.get(uri, 0) for uri in result.succeeded)
+            queue.put(("batch", len(result.succeeded), nbytes, failures))
+
+        ingester = FileIngester(
+            client.documents,
+            uri_function=lambda relative_path: prefix + relative_path,
+            metadata=settings["metadata"],
+            batch_size=settings["batch_size"],
+            max_batch_bytes=settings["max_batch_bytes"],
+            thread_count=settings["thread_count"],
+            journal=settings["journal"],
+        )
+        ingester._ingest_files([f[:2] for f in files], on_batch)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        queue.put(("done", error))
+
+
+def _parse_permissions(values: list[str]) -> dict:
+    """
+    Parses permissions of the form "role=capability,capability".
+    """
+    permissions = {}
+    for value in values or []:
+        role, _, capabilities = value.partition("=")
+        if not capabilities:
+            raise argparse.ArgumentTypeError(
+                f"Permission must be of the form role=capability,...: {value}"
+            )
+        permissions.setdefault(role, []).extend(capabilities.split(","))
+    return permissions
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m marklogic.load",
+        description="Loads files into MarkLogic from many processes at once.",
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="files, directories, or glob patterns to load"
+    )
+    cli.add_client_arguments(parser)
+    parser.add_argument(
+        "--processes", type=int, help="number of processes; defaults to CPU count"
+    )
+    parser.add_argument(
+        "--threads", type=int, default=4, help="requests in parallel per process"
+    )
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--max-batch-bytes", type=int, default=16 * 1024 * 1024)
+    parser.add_argument("--uri-prefix", default="/")
+    parser.add_argument(
+        "--collection", action="append", default=[], help="may be repeated"
+    )
+    parser.add_argument(
+        "--permission",
+        action="append",
+        default=[],
+        help="of the form role=capability,capability; may be repeated",
+    )
+    parser.add_argument("--journal", help="path for recording loaded files")
+    parser.add_argument("--failures-log", help="path for recording failed batches")
+    parser.add_argument("--quiet", action="store_true", help="do not display progress")
+    return parser
+
+
+def main(argv: list[str] = None) -> int:
+    """
+    Runs the command-line loader; returns 0 if every file was loaded and 1 otherwise.
+    """
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    try:
+        permissions = _parse_permissions(args.permission)
+    except argparse.ArgumentTypeError as error:
+        parser.error(str(error))
+
+    client_args = cli.client_args(args, max_connections=args.threads)
+    metadata = None
+    if args.collection or permissions:
+        metadata = DefaultMetadata(
+            collections=args.collection or None, permissions=permissions or None
+        )
+
+    progress = load(
+        args.paths,
+        client_args,
+        processes=args.processes,
+        uri_prefix=args.uri_prefix,
+        metadata=metadata,
+        batch_size=args.batch_size,
+        max_batch_bytes=args.max_batch_bytes,
+        thread_count=args.threads,
+        journal=args.journal,
+        failures_log=args.failures_log,
+        on_progress=None if args.quiet else cli.progress_printer(),
+    )
+    if not args.quiet:
+        print(f"\r{progress}", file=sys.stderr)
+    return 0 if progress.ok and progress.documents == progress.total_documents else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
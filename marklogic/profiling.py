@@ -0,0 +1,157 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+"""
+Supports recording where the time spent on requests to MarkLogic goes - building and
+authenticating each request, exchanging it with MarkLogic, and decoding and parsing
+each response - when a Client is created with "profile=True".
+"""
+
+# The stages recorded by a Profiler, in the order in which they occur for a request.
+STAGES = (
+    # Encoding a request body and preparing the request, excluding authentication.
+    "request_build",
+    # Computing the authentication header of a request.
+    "auth",
+    # Sending a request and waiting for the headers of its response, including any
+    # authentication challenge. Bytes are those of the request body.
+    "send",
+    # Reading the body of a response. Bytes are those of the response body.
+    "receive",
+    # Splitting a multipart response into parts and parsing the headers of each part.
+    "multipart_decode",
+    # Parsing the content of a response or of a part, such as JSON or text.
+    "content_parse",
+    # Parsing the metadata of a document.
+    "metadata_parse",
+)
+
+
+class _Frame:
+    __slots__ = ("bytes", "child_cpu", "child_wall")
+
+    def __init__(self, nbytes: int = 0):
+        self.bytes = nbytes
+        self.child_cpu = 0.0
+        self.child_wall = 0.0
+
+
+class _NoStage:
+    """
+    Returned by 'stage' when profiling is disabled; does nothing.
+    """
+
+    def __enter__(self):
+        return _Frame()
+
+    def __exit__(self, *args):
+        return False
+
+
+_NO_STAGE = _NoStage()
+
+
+class Profiler:
+    """
+    Accumulates the number of calls, CPU time, wall time, and bytes for each stage of
+    the requests sent by a Client. The CPU time of a stage is that of the thread that
+    performed it; a large difference between its wall and CPU time indicates time
+    spent waiting on the network or on MarkLogic. When one stage occurs within
+    another, its time is only counted towards the inner stage.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats = {}
+
+    @contextmanager
+    def stage(self, name: str, nbytes: int = 0):
+        """
+        Records the time spent within the context towards the given stage. The object
+        yielded by the context has a "bytes" attribute that can be set when the
+        number of bytes is not known until the stage completes.
+        """
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        frame = _Frame(nbytes)
+        stack.append(frame)
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield frame
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.thread_time() - cpu
+            stack.pop()
+            if stack:
+                stack[-1].child_wall += wall
+                stack[-1].child_cpu += cpu
+            self.record(
+                name, cpu - frame.child_cpu, wall - frame.child_wall, frame.bytes
+            )
+
+    def record(self, name: str, cpu: float, wall: float, nbytes: int = 0) -> None:
+        """
+        Adds a single call with the given CPU time, wall time, and bytes to a stage.
+        """
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = [0, 0.0, 0.0, 0]
+            stats[0] += 1
+            stats[1] += cpu
+            stats[2] += wall
+            stats[3] += nbytes
+
+    def report(self) -> dict:
+        """
+        Returns a dict of each recorded stage to its "calls", "cpu_seconds",
+        "wall_seconds", and "bytes", with the stages in the order they occur for a
+        request.
+        """
+        with self._lock:
+            stats = {name: list(values) for name, values in self._stats.items()}
+        order = sorted(
+            stats, key=lambda n: STAGES.index(n) if n in STAGES else len(STAGES)
+        )
+        return {
+            name: {
+                "calls": stats[name][0],
+                "cpu_seconds": stats[name][1],
+                "wall_seconds": stats[name][2],
+                "bytes": stats[name][3],
+            }
+            for name in order
+        }
+
+    def to_json(self, indent: int = 2) -> str:
+        return json.dumps(self.report(), indent=indent)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def __repr__(self):
+        return "{!r}".format(self.report())
+
+
+def stage(profiler: Profiler, name: str, nbytes: int = 0):
+    """
+    Returns a context that records the given stage via the given profiler, or one
+    that does nothing if the profiler is None.
+    """
+    return _NO_STAGE if profiler is None else profiler.stage(name, nbytes)
+
+
+def profiler_for(source) -> Profiler:
+    """
+    Returns the Profiler of a Client, or of the Client that received a response, or
+    None if profiling is not enabled.
+    """
+    return getattr(source, "profiler", None)
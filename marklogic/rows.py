@@ -1,10 +1,23 @@
 # Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
 
 
+import hashlib
 import json
-from requests import Session
+from typing import Iterable, Iterator
+from requests import Response, Session
+from requests.utils import get_encoding_from_headers
+from marklogic.bulk import BulkResult
 from marklogic.transactions import Transaction
+from marklogic.internal.batch import chunk_items, run_batches
+from marklogic.internal.cache import TTLCache
 from marklogic.internal.util import response_has_no_content
+from marklogic.profiling import profiler_for, stage
+from marklogic.timeouts import (
+    TIME_ARGUMENTS,
+    DeadlineExceeded,
+    OperationCancelled,
+    checker,
+)
 
 
 """
@@ -14,8 +27,15 @@ https://docs.marklogic.com/REST/client/row-management.
 
 
 class RowManager:
-    def __init__(self, session: Session):
+    """
+    :param session: the requests Session used to send each request.
+    :param result_cache_size: the maximum number of query results retained by the
+    cache shared by every PreparedQuery created via this manager with a cache TTL.
+    """
+
+    def __init__(self, session: Session, result_cache_size: int = 256):
         self._session = session
+        self.result_cache = TTLCache(result_cache_size)
 
     __accept_switch = {
         "json": "application/json",
@@ -41,6 +61,7 @@ class RowManager:
         format: str = "json",
         tx: Transaction = None,
         return_response: bool = False,
+        bindings: dict = None,
         **kwargs,
     ):
         """
@@ -68,6 +89,9 @@ class RowManager:
         object should be returned (True) or if only the data should be returned (False)
         upon a success (2xx) response. Note that if the status code of the response is
         not 2xx, then the entire response is always returned.
+        :param bindings: optional dict of values for the parameters in the query, such
+        as those defined via op.param in Optic; each is sent as a "bind:{name}" request
+        parameter.
         """
         path = "v1/rows/graphql" if graphql else "v1/rows"
         return self.__send_request(
@@ -80,6 +104,7 @@ class RowManager:
             format,
             tx,
             return_response,
+            bindings=bindings,
             **kwargs,
         )
 
@@ -114,6 +139,207 @@ class RowManager:
             path, dsl, plan, None, None, None, format, tx, return_response, **kwargs
         )
 
+    def write_doc_descriptors(
+        self,
+        descriptors: Iterable,
+        batch_size: int = 100,
+        thread_count: int = 4,
+        tx: Transaction = None,
+        **kwargs,
+    ) -> BulkResult:
+        """
+        Writes documents via Optic update plans of the form
+        "op.fromDocDescriptors(descriptors).write()", sent to the endpoint defined at
+        https://docs.marklogic.com/REST/POST/v1/rows/update . The descriptors are split
+        into chunks of the given size, with a plan being constructed for each chunk
+        and plans being sent in parallel; chunks are created as plans are sent, so the
+        iterable can be larger than available memory. This feature requires the use
+        of MarkLogic version 11.2 or later.
+
+        :param descriptors: an iterable of document descriptors, each either a dict as
+        defined at https://docs.marklogic.com/op.fromDocDescriptors or a Document,
+        which is converted to a document descriptor. A plan cannot carry binary
+        content, so a Document with bytes content causes its chunk to fail with a
+        ValueError.
+        :param batch_size: the number of documents to write in each plan.
+        :param thread_count: the number of plans to send in parallel.
+        :param tx: optional REST transaction in which to service each request.
+        """
+        headers = {
+            "Content-Type": "application/vnd.marklogic.querydsl+javascript",
+            "Accept": "application/json",
+        }
+
+        def write_chunk(chunk: list) -> Response:
+            chunk = [_to_doc_descriptor(item) for item in chunk]
+            dsl = f"op.fromDocDescriptors({json.dumps(chunk)}).write()"
+            return self._post("v1/rows/update", dsl, dict(headers), tx, **kwargs)
+
+        chunks = chunk_items(descriptors, batch_size)
+        check = checker(kwargs)
+        result = BulkResult()
+        try:
+            for chunk, response, error in run_batches(
+                write_chunk, chunks, thread_count, check
+            ):
+                uris = [
+                    item.get("uri") if isinstance(item, dict) else item.uri
+                    for item in chunk
+                ]
+                if error is None and response.status_code == 200:
+                    result.add_success(uris)
+                else:
+                    result.add_failure(uris, response, error)
+        except (DeadlineExceeded, OperationCancelled) as error:
+            error.result = result
+            raise
+        return result
+
+    def query_csv(
+        self,
+        dsl: str = None,
+        plan: dict = None,
+        sql: str = None,
+        sparql: str = None,
+        types: dict = None,
+        infer_types: bool = False,
+        tx: Transaction = None,
+        bindings: dict = None,
+        chunk_size: int = 64 * 1024,
+        **kwargs,
+    ) -> Iterator[dict]:
+        """
+        Sends a query as described by 'query' with a format of "csv" and returns a
+        generator that yields a dict for each row, keyed by the column names in the
+        header row. The response is streamed and parsed in chunks, so the full CSV is
+        never held in memory as a single string. Raises an HTTPError if MarkLogic does
+        not return a successful response.
+
+        :param types: optional dict mapping column names to functions, such as int or
+        float, that convert the string value of a column; an empty value is
+        converted to None instead.
+        :param infer_types: if True, the value of each column not in 'types' is
+        converted to an int or a float when possible, and an empty value is
+        converted to None.
+        :param chunk_size: the number of bytes to read from the response at a time.
+        """
+        import csv
+
+        response = self.__send_csv_request(
+            dsl, plan, sql, sparql, tx, bindings, **kwargs
+        )
+        with response:
+            encoding = _csv_encoding(response)
+            lines = _iter_text_lines(response.iter_content(chunk_size), encoding)
+            reader = csv.reader(lines)
+            header = next(reader, None)
+            if header is None:
+                return
+            converters = [
+                _column_converter(name, types, infer_types) for name in header
+            ]
+            for values in reader:
+                if not values:
+                    continue
+                yield {
+                    name: convert(value) if convert else value
+                    for name, convert, value in zip(header, converters, values)
+                }
+
+    def export_csv(
+        self,
+        file,
+        dsl: str = None,
+        plan: dict = None,
+        sql: str = None,
+        sparql: str = None,
+        tx: Transaction = None,
+        bindings: dict = None,
+        chunk_size: int = 64 * 1024,
+        **kwargs,
+    ) -> int:
+        """
+        Sends a query as described by 'query' with a format of "csv" and writes the
+        bytes of the response, as they are received, to the given file. Returns the
+        number of bytes written. Raises an HTTPError if MarkLogic does not return a
+        successful response.
+
+        :param file: a path, or a file-like object opened in binary mode.
+        :param chunk_size: the number of bytes to read from the response at a time.
+        """
+        response = self.__send_csv_request(
+            dsl, plan, sql, sparql, tx, bindings, **kwargs
+        )
+        with response:
+            if isinstance(file, (str, bytes)) or hasattr(file, "__fspath__"):
+                with open(file, "wb") as sink:
+                    return _copy_chunks(response.iter_content(chunk_size), sink)
+            return _copy_chunks(response.iter_content(chunk_size), file)
+
+    def __send_csv_request(
+        self,
+        dsl: str,
+        plan: dict,
+        sql: str,
+        sparql: str,
+        tx: Transaction,
+        bindings: dict,
+        **kwargs,
+    ) -> Response:
+        headers = kwargs.pop("headers", {})
+        data = self.__build_request_data(dsl, plan, sql, sparql, None, "csv", headers)
+        response = self._post(
+            "v1/rows", data, headers, tx, bindings, stream=True, **kwargs
+        )
+        if not response.ok:
+            # Ensures the error details are available before the exception is raised.
+            response.content
+            response.raise_for_status()
+        return response
+
+    def prepare(
+        self,
+        dsl: str = None,
+        plan: dict = None,
+        sql: str = None,
+        sparql: str = None,
+        graphql: str = None,
+        format: str = "json",
+        cache_ttl: float = None,
+        cache_max_bytes: int = 1024 * 1024,
+    ) -> "PreparedQuery":
+        """
+        Prepares a query that can be sent many times with different bindings. The
+        request body and headers are constructed once and reused for each call to the
+        returned PreparedQuery. See the 'query' method for a description of the query
+        and format arguments.
+
+        :param cache_ttl: optional number of seconds for which the result of a query
+        is cached, keyed by the query, its format, and its bindings. Results are
+        cached in this manager's 'result_cache', which evicts the least recently used
+        result when full.
+        :param cache_max_bytes: results larger than this are not cached.
+        """
+        headers = {}
+        data = self.__build_request_data(
+            dsl, plan, sql, sparql, graphql, format, headers
+        )
+        if isinstance(data, dict):
+            data = json.dumps(data)
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        path = "v1/rows/graphql" if graphql else "v1/rows"
+        return PreparedQuery(
+            self,
+            path,
+            data,
+            headers,
+            format,
+            graphql is not None,
+            cache_ttl,
+            cache_max_bytes,
+        )
+
     def __send_request(
         self,
         path: str = None,
@@ -128,38 +354,74 @@ class RowManager:
         **kwargs,
     ):
         headers = kwargs.pop("headers", {})
-        data = None
+        data = self.__build_request_data(
+            dsl, plan, sql, sparql, graphql, format, headers
+        )
+        response = self._post(path, data, headers, tx, **kwargs)
+        return self._to_result(response, graphql is not None, format, return_response)
+
+    def __build_request_data(
+        self,
+        dsl: str,
+        plan: dict,
+        sql: str,
+        sparql: str,
+        graphql: str,
+        format: str,
+        headers: dict,
+    ):
+        """
+        Returns the data to send for the given query and sets the Content-Type and
+        Accept headers on the given headers.
+        """
         if graphql:
-            data = json.dumps({"query": graphql})
             headers["Content-Type"] = "application/graphql"
-        else:
-            request_info = self.__get_request_info(dsl, plan, sql, sparql)
-            data = request_info["data"]
-            headers["Content-Type"] = request_info["content-type"]
-            if format:
-                value = RowManager.__accept_switch.get(format)
-                if value is None:
-                    msg = f"Invalid value for 'format' argument: {format}; "
-                    msg += "must be one of 'json', 'xml', 'csv', or 'json-seq'."
-                    raise ValueError(msg)
-                else:
-                    headers["Accept"] = value
+            return json.dumps({"query": graphql})
 
+        request_info = self.__get_request_info(dsl, plan, sql, sparql)
+        headers["Content-Type"] = request_info["content-type"]
+        if format:
+            value = RowManager.__accept_switch.get(format)
+            if value is None:
+                msg = f"Invalid value for 'format' argument: {format}; "
+                msg += "must be one of 'json', 'xml', 'csv', or 'json-seq'."
+                raise ValueError(msg)
+            else:
+                headers["Accept"] = value
+        return request_info["data"]
+
+    def _post(
+        self,
+        path: str,
+        data,
+        headers: dict,
+        tx: Transaction = None,
+        bindings: dict = None,
+        **kwargs,
+    ) -> Response:
         params = kwargs.pop("params", {})
         if tx:
             params["txid"] = tx.id
+        if bindings:
+            for name, value in bindings.items():
+                params[f"bind:{name}"] = value
 
-        response = self._session.post(
+        return self._session.post(
             path, headers=headers, data=data, params=params, **kwargs
         )
+
+    def _to_result(
+        self, response: Response, graphql: bool, format: str, return_response: bool
+    ):
         if response.ok and not return_response:
             if response_has_no_content(response):
                 return None
-            return (
-                response.json()
-                if graphql
-                else RowManager.__query_format_switch.get(format)(response)
-            )
+            with stage(profiler_for(response), "content_parse", len(response.content)):
+                return (
+                    response.json()
+                    if graphql
+                    else RowManager.__query_format_switch.get(format)(response)
+                )
         return response
 
     def __get_request_info(self, dsl: str, plan: dict, sql: str, sparql: str):
@@ -188,3 +450,172 @@ class RowManager:
             raise ValueError(
                 "No query found; must specify one of: dsl, plan, sql, or sparql"
             )
+
+
+def _csv_encoding(response: Response) -> str:
+    """
+    Returns the charset of the given CSV response, or UTF-8 - the encoding used by
+    MarkLogic - if it has none; requests would otherwise assume ISO-8859-1 for a text
+    response without a charset.
+    """
+    if "charset" in response.headers.get("Content-Type", "").lower():
+        return get_encoding_from_headers(response.headers) or "utf-8"
+    return "utf-8"
+
+
+def _iter_text_lines(chunks: Iterable[bytes], encoding: str) -> Iterator[str]:
+    """
+    Decodes the given chunks of bytes and yields each line, including its line ending,
+    for consumption by a csv reader.
+    """
+    import codecs
+
+    decoder = codecs.getincrementaldecoder(encoding)()
+    remainder = ""
+    for chunk in chunks:
+        text = remainder + decoder.decode(chunk)
+        start = 0
+        end = text.find("\n")
+        while end >= 0:
+            line_end = end + 1
+            yield text[start:line_end]
+            start = line_end
+            end = text.find("\n", start)
+        remainder = text[start:]
+    remainder += decoder.decode(b"", final=True)
+    if remainder:
+        yield remainder
+
+
+def _column_converter(name: str, types: dict, infer_types: bool):
+    convert = types.get(name) if types else None
+    if convert:
+        return lambda value: convert(value) if value != "" else None
+    return _infer_value if infer_types else None
+
+
+def _infer_value(value: str):
+    if value == "":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def _copy_chunks(chunks: Iterable[bytes], sink) -> int:
+    written = 0
+    for chunk in chunks:
+        sink.write(chunk)
+        written += len(chunk)
+    return written
+
+
+def _to_doc_descriptor(item) -> dict:
+    """
+    Returns the given dict as-is, or converts the given Document to a document
+    descriptor as expected by op.fromDocDescriptors.
+    """
+    if isinstance(item, dict):
+        return item
+    content = item.content
+    if isinstance(content, (bytes, bytearray)):
+        raise ValueError(
+            f"Cannot write binary content via a document descriptor: {item.uri}"
+        )
+    if not isinstance(content, str):
+        content = json.dumps(content)
+    descriptor = {"uri": item.uri, "doc": content}
+    if item.collections:
+        descriptor["collections"] = item.collections
+    if item.permissions:
+        descriptor["permissions"] = [
+            {"roleName": role, "capability": capability}
+            for role, capabilities in item.permissions.items()
+            for capability in capabilities
+        ]
+    if item.quality:
+        descriptor["quality"] = item.quality
+    if item.metadata_values:
+        descriptor["metadata"] = item.metadata_values
+    return descriptor
+
+
+class PreparedQuery:
+    """
+    A query whose request body and headers were constructed once via
+    RowManager.prepare and that can be sent many times with different bindings.
+    """
+
+    def __init__(
+        self,
+        manager: RowManager,
+        path: str,
+        data: bytes,
+        headers: dict,
+        format: str,
+        graphql: bool,
+        cache_ttl: float,
+        cache_max_bytes: int,
+    ):
+        self._manager = manager
+        self._path = path
+        self._data = data
+        self._headers = headers
+        self._format = format
+        self._graphql = graphql
+        self._cache_ttl = cache_ttl
+        self._cache_max_bytes = cache_max_bytes
+        digest = hashlib.sha256(path.encode("utf-8") + data)
+        digest.update(json.dumps(headers, sort_keys=True).encode("utf-8"))
+        self.key = digest.hexdigest()
+
+    def query(
+        self,
+        bindings: dict = None,
+        tx: Transaction = None,
+        return_response: bool = False,
+        **kwargs,
+    ):
+        """
+        Sends the prepared query with the given bindings. If the query was prepared
+        with a cache TTL, a cached result is returned when available; a result is not
+        cached or read from the cache when a transaction or request arguments other
+        than timeouts are given.
+
+        :param bindings: optional dict of values for the parameters in the query.
+        :param tx: optional REST transaction in which to service this request.
+        :param return_response: see RowManager.query.
+        """
+        use_cache = (
+            self._cache_ttl and tx is None and not kwargs.keys() - TIME_ARGUMENTS
+        )
+        cache = self._manager.result_cache
+        if use_cache:
+            key = (self.key, json.dumps(bindings, sort_keys=True, default=str))
+            response = cache.get(key)
+            if response is not None:
+                return self._manager._to_result(
+                    response, self._graphql, self._format, return_response
+                )
+
+        headers = {**self._headers, **kwargs.pop("headers", {})}
+        response = self._manager._post(
+            self._path, self._data, headers, tx, bindings, **kwargs
+        )
+        if use_cache and response.ok and len(response.content) <= self._cache_max_bytes:
+            cache.put(key, response, self._cache_ttl)
+        return self._manager._to_result(
+            response, self._graphql, self._format, return_response
+        )
+
+    def invalidate(self) -> int:
+        """
+        Removes every cached result of this query, regardless of its bindings, and
+        returns the number of results removed.
+        """
+        return self._manager.result_cache.invalidate(lambda key: key[0] == self.key)
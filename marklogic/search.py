@@ -0,0 +1,212 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+import hashlib
+import json
+import threading
+from typing import Union
+
+from marklogic.internal.util import query_data_and_content_type
+from requests import Response, Session
+
+"""
+Defines classes for working with the JSON search response returned by the v1/search
+endpoint, which contains the total, facets, and snippets of a search without the
+content of any matching document, and for registering the query options used by
+searches.
+"""
+
+
+class SearchResult:
+    """
+    A single result within a search response, identifying a matching document along
+    with its score and snippets.
+    """
+
+    def __init__(self, result: dict):
+        self._result = result
+
+    @property
+    def uri(self) -> str:
+        return self._result.get("uri")
+
+    @property
+    def index(self) -> int:
+        return self._result.get("index")
+
+    @property
+    def score(self) -> float:
+        return self._result.get("score")
+
+    @property
+    def confidence(self) -> float:
+        return self._result.get("confidence")
+
+    @property
+    def fitness(self) -> float:
+        return self._result.get("fitness")
+
+    @property
+    def format(self) -> str:
+        return self._result.get("format")
+
+    @property
+    def mimetype(self) -> str:
+        return self._result.get("mimetype")
+
+    @property
+    def snippets(self) -> list[dict]:
+        """
+        Returns the "matches" of the result, each containing the "path" of a match
+        and its "match-text", as defined by the snippet format of the search.
+        """
+        return self._result.get("matches", [])
+
+    def __repr__(self):
+        return "{!r}".format({"uri": self.uri, "score": self.score})
+
+
+class SearchResponse:
+    """
+    Wraps a JSON search response. The body of the response is only parsed when one of
+    its properties is first accessed, and each result is only wrapped in a
+    SearchResult when the results are first accessed.
+
+    :param response: the response from a request to the v1/search endpoint with an
+    "Accept" header of "application/json".
+    """
+
+    def __init__(self, response: Response):
+        self.response = response
+        self._body = None
+        self._results = None
+
+    @property
+    def body(self) -> dict:
+        """
+        Returns the parsed JSON search response.
+        """
+        if self._body is None:
+            self._body = self.response.json()
+        return self._body
+
+    @property
+    def total(self) -> int:
+        """
+        Returns the total number of matching documents. Unless the search is
+        configured to be accurate, this is an estimate based on the indexes.
+        """
+        return self.body.get("total")
+
+    @property
+    def start(self) -> int:
+        return self.body.get("start")
+
+    @property
+    def page_length(self) -> int:
+        return self.body.get("page-length")
+
+    @property
+    def results(self) -> list[SearchResult]:
+        if self._results is None:
+            self._results = [SearchResult(r) for r in self.body.get("results", [])]
+        return self._results
+
+    @property
+    def uris(self) -> list[str]:
+        return [result.uri for result in self.results]
+
+    @property
+    def facets(self) -> dict:
+        """
+        Returns a dict of each facet name to a dict of each of its values to the
+        number of matching documents with that value.
+        """
+        return {
+            name: {value["name"]: value["count"] for value in facet["facetValues"]}
+            for name, facet in self.body.get("facets", {}).items()
+        }
+
+    def __repr__(self):
+        return "{!r}".format({"total": self.total, "uris": self.uris})
+
+
+class QueryOptionsManager:
+    """
+    Registers named query options via the endpoint defined at
+    https://docs.marklogic.com/REST/PUT/v1/config/query/[name] so that searches can
+    refer to options by name instead of sending them inline with every request.
+
+    A hash of the options registered under each name is retained so that registering
+    the same options again does not send a request. The hashes are not aware of
+    changes made by other clients; call "forget" to upload options again regardless.
+    """
+
+    def __init__(self, session: Session):
+        self._session = session
+        self._hashes = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self, name: str, options: Union[dict, str], **kwargs
+    ) -> Union[str, Response]:
+        """
+        Uploads the given query options under the given name, unless the same options
+        were already registered under that name by this manager. Returns the name so
+        that it can be passed as the "options" argument of a search, or the response
+        if MarkLogic failed to store the options. Storing options requires the
+        rest-admin role.
+
+        :param name: the name of the query options.
+        :param options: either a dict or a string of JSON or XML. A dict without an
+        "options" key is assumed to contain the options themselves and is wrapped in
+        one.
+        """
+        if isinstance(options, dict):
+            if "options" not in options:
+                options = {"options": options}
+            options = json.dumps(options, sort_keys=True)
+        data, content_type = query_data_and_content_type(options)
+        digest = hashlib.sha256(f"{content_type}\n{data}".encode("utf-8")).hexdigest()
+        with self._lock:
+            if self._hashes.get(name) == digest:
+                return name
+        headers = kwargs.pop("headers", {})
+        headers["Content-type"] = content_type
+        response = self._session.put(
+            f"/v1/config/query/{name}",
+            headers=headers,
+            data=data.encode("utf-8"),
+            **kwargs,
+        )
+        if response.status_code not in (201, 204):
+            return response
+        with self._lock:
+            self._hashes[name] = digest
+        return name
+
+    def delete(self, name: str, **kwargs) -> Response:
+        """
+        Deletes the query options with the given name from MarkLogic.
+        """
+        self.forget(name)
+        return self._session.delete(f"/v1/config/query/{name}", **kwargs)
+
+    def forget(self, name: str = None) -> None:
+        """
+        Forgets the hash of the options registered under the given name - or under
+        every name if no name is given - so that they are uploaded when next
+        registered.
+        """
+        with self._lock:
+            if name is None:
+                self._hashes.clear()
+            else:
+                self._hashes.pop(name, None)
+
+    def is_registered(self, name: str) -> bool:
+        """
+        Returns True if options were registered under the given name by this manager.
+        """
+        with self._lock:
+            return name in self._hashes
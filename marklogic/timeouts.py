@@ -0,0 +1,135 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+import threading
+import time
+from typing import Union
+
+from requests.exceptions import RequestException, Timeout
+
+"""
+Defines classes for bounding the time spent on an operation that sends one or many
+requests to MarkLogic, and for cancelling such an operation from another thread.
+
+Both a Deadline and a CancellationToken are passed to an operation via the "deadline"
+and "cancellation" keyword arguments, which a Client accepts on every request. The
+same objects are used for every request sent by a multi-request operation, such as
+deleting documents in batches.
+"""
+
+# Request arguments that bound how long a request may take without affecting its
+# result, and thus do not prevent a cached result from being used.
+TIME_ARGUMENTS = frozenset({"timeout", "deadline", "cancellation"})
+
+
+class DeadlineExceeded(Timeout):
+    """
+    Raised when a request would be sent after its deadline has passed. An operation
+    that sends many requests and returns a BulkResult sets "result" to the outcome of
+    the requests that were sent before the deadline passed.
+    """
+
+    result = None
+
+
+class OperationCancelled(RequestException):
+    """
+    Raised when a request would be sent after its CancellationToken was cancelled. An
+    operation that sends many requests and returns a BulkResult sets "result" to the
+    outcome of the requests that were sent before it was cancelled.
+    """
+
+    result = None
+
+
+class Deadline:
+    """
+    A point in time after which no further requests are sent on behalf of an
+    operation. The connect and read timeouts of each request are limited to the time
+    remaining until the deadline.
+
+    :param seconds: the number of seconds from now until the deadline.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """
+        Returns the number of seconds until the deadline, which is zero once the
+        deadline has passed.
+        """
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self) -> None:
+        """
+        Raises DeadlineExceeded if the deadline has passed.
+        """
+        if self.expired:
+            raise DeadlineExceeded(f"Deadline of {self.seconds} seconds exceeded")
+
+    def limit(self, timeout) -> Union[float, tuple]:
+        """
+        Returns the given requests timeout - None, a number, or a tuple of connect and
+        read timeouts - with each timeout limited to the time remaining.
+        """
+        remaining = self.remaining()
+        if isinstance(timeout, tuple):
+            return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def __repr__(self):
+        return f"Deadline(remaining={self.remaining():.3f})"
+
+
+class CancellationToken:
+    """
+    Signals that an operation should stop sending requests. Cancellation is
+    cooperative: a request that is already in flight is allowed to complete, but no
+    further requests are sent once the token is cancelled.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self) -> None:
+        """
+        Raises OperationCancelled if the token has been cancelled.
+        """
+        if self.cancelled:
+            raise OperationCancelled("Operation was cancelled")
+
+
+def checker(kwargs: dict):
+    """
+    Normalizes the "deadline" keyword argument in the given request arguments - which
+    may be a number of seconds - to a Deadline, so that every request sent by a
+    multi-request operation shares it. Returns a function that raises if the deadline
+    has passed or the operation has been cancelled, or None if neither was given.
+    """
+    deadline = kwargs.get("deadline")
+    if deadline is not None and not isinstance(deadline, Deadline):
+        deadline = kwargs["deadline"] = Deadline(deadline)
+    cancellation = kwargs.get("cancellation")
+    if deadline is None and cancellation is None:
+        return None
+
+    def check():
+        if cancellation is not None:
+            cancellation.check()
+        if deadline is not None:
+            deadline.check()
+
+    return check
@@ -2,7 +2,12 @@
 
 
 import logging
+import threading
+from contextlib import nullcontext
+from typing import Callable
 from requests import Response, Session
+from requests.adapters import BaseAdapter
+from requests.cookies import RequestsCookieJar
 from requests.exceptions import HTTPError
 
 logger = logging.getLogger(__name__)
@@ -25,15 +30,30 @@ class Transaction:
     transaction will be automatically committed if no error was thrown, and rolled back
     otherwise.
 
+    Each transaction owns the cookies returned when it was created - such as the
+    "HostId" cookie that a load balancer uses for host affinity - and sends them with
+    every request associated with the transaction, regardless of the cookies held by
+    the Session. When the Session is a marklogic Client, each request associated with
+    the transaction is also sent via a connection dedicated to the transaction, which
+    is leased from the Client and returned to it for reuse when the transaction ends.
+    Many transactions can thus be used concurrently with a single Client.
+
     :param id: the ID of the new transaction, which is used for all subsequent
     operations involving the transaction.
     :param session: a requests Session object that is required for either committing or
     rolling back the transaction, as well as for obtaining status of the transaction.
+    :param cookies: optional cookies to send with every request associated with the
+    transaction.
     """
 
-    def __init__(self, id: str, session: Session):
+    def __init__(self, id: str, session: Session, cookies=None):
         self.id = id
         self._session = session
+        self.cookies = RequestsCookieJar()
+        if cookies:
+            self.cookies.update(cookies)
+        self._adapter = None
+        self._adapter_lock = threading.Lock()
 
     def __enter__(self):
         return self
@@ -43,8 +63,10 @@ class Transaction:
         Retrieve transaction status via
         https://docs.marklogic.com/REST/GET/v1/transactions/[txid].
         """
-        return self._session.get(
-            f"/v1/transactions/{self.id}", headers={"Accept": "application/json"}
+        return self.request(
+            "GET",
+            f"/v1/transactions/{self.id}",
+            headers={"Accept": "application/json"},
         ).json()
 
     def commit(self) -> Response:
@@ -54,9 +76,7 @@ class Transaction:
         invoked automatically via a Python context manager.
         """
         logger.debug(f"Committing transaction with ID: {self.id}")
-        return self._session.post(
-            f"/v1/transactions/{self.id}", params={"result": "commit"}
-        )
+        return self._end("commit")
 
     def rollback(self) -> Response:
         """
@@ -65,9 +85,51 @@ class Transaction:
         invoked automatically via a Python context manager.
         """
         logger.debug(f"Rolling back transaction with ID: {self.id}")
-        return self._session.post(
-            f"/v1/transactions/{self.id}", params={"result": "rollback"}
-        )
+        return self._end("rollback")
+
+    def request(self, method: str, url: str, *args, **kwargs) -> Response:
+        """
+        Sends a request via the Session with the cookies owned by this transaction,
+        and with the connection dedicated to this transaction if the Session supports
+        it. Any cookie returned by MarkLogic is retained by this transaction for
+        subsequent requests instead of by the Session. The caller is responsible for
+        associating the request with this transaction, such as by including a "txid"
+        parameter.
+        """
+        cookies = self.cookies.copy()
+        cookies.update(kwargs.pop("cookies", None) or {})
+        pin = getattr(self._session, "pinned_to", None)
+        with pin(self) if pin else nullcontext():
+            response = self._session.request(
+                method, url, *args, cookies=cookies, **kwargs
+            )
+        self.cookies.update(response.cookies)
+        _remove_cookies(self._session.cookies, response)
+        return response
+
+    def get_adapter(self, lease: Callable[[], BaseAdapter]) -> BaseAdapter:
+        """
+        Returns the transport adapter dedicated to this transaction, obtaining it via
+        the given function when first needed. The adapter holds a single connection,
+        and a request that is sent while another request in this transaction is in
+        flight waits for the connection to be available.
+        """
+        with self._adapter_lock:
+            if self._adapter is None:
+                self._adapter = lease()
+            return self._adapter
+
+    def _end(self, result: str) -> Response:
+        try:
+            return self.request(
+                "POST", f"/v1/transactions/{self.id}", params={"result": result}
+            )
+        finally:
+            with self._adapter_lock:
+                adapter, self._adapter = self._adapter, None
+            release = getattr(self._session, "release_adapter", None)
+            if adapter is not None and release:
+                release(adapter)
 
     def __exit__(self, *args):
         response = (
@@ -111,4 +173,24 @@ class TransactionManager:
             "/v1/transactions", params=params, headers={"Accept": "application/json"}
         )
         id = response.json()["transaction-status"]["transaction-id"]
-        return Transaction(id, self._session)
+        transaction = Transaction(id, self._session, response.cookies)
+        _remove_cookies(self._session.cookies, response)
+        register = getattr(self._session, "register_transaction", None)
+        if register:
+            register(transaction)
+        return transaction
+
+
+def _remove_cookies(jar: RequestsCookieJar, response: Response) -> None:
+    """
+    requests stores the cookies of every response - including any response to a
+    digest challenge - in the Session that sent the request; the cookies returned for
+    a request associated with a transaction belong to the transaction alone, and are
+    thus removed from the Session.
+    """
+    for each in response.history + [response]:
+        for cookie in each.cookies:
+            try:
+                jar.clear(cookie.domain, cookie.path, cookie.name)
+            except KeyError:
+                pass
@@ -3,12 +3,22 @@
 
 """
 Supports encoding and decoding vectors using the same approach as the vec:base64-encode and vec:base64-decode
-functions supported by the MarkLogic server.
+functions supported by the MarkLogic server, along with functions for scoring many vectors at once
+when reranking search or rows results on the client. Those functions use NumPy when it is installed - e.g. via
+"pip install marklogic-python-client[vectors]" - and otherwise fall back to pure Python.
 """
 
 import base64
+import binascii
+import heapq
+import math
+import operator
 import struct
-from typing import List
+import sys
+from array import array
+from typing import Iterable, List, Union
+
+_NUMPY = None
 
 
 def base64_encode(vector: List[float]) -> str:
@@ -40,3 +50,212 @@ def base64_decode(encoded_vector: str) -> List[float]:
         )
     floats = struct.unpack("<" + "f" * dimensions, buffer[8 : 8 + 4 * dimensions])
     return list(floats)
+
+
+def float32_bytes(vector) -> bytes:
+    """
+    Returns the little-endian float32 bytes of a vector, which can be either a list of
+    floats or any object supporting the buffer protocol that holds float32 values -
+    such as bytes, an array of type "f", or a float32 NumPy array. The bytes of a
+    buffer are used as-is without converting each value.
+    """
+    if isinstance(vector, (bytes, bytearray)):
+        return bytes(vector)
+    if isinstance(vector, (list, tuple)):
+        values = array("f", vector)
+    else:
+        view = memoryview(vector)
+        if view.format not in ("f", "<f") or view.itemsize != 4:
+            raise ValueError(
+                f"Vector buffer must contain float32 values; format: {view.format}"
+            )
+        if view.format == "<f" or sys.byteorder == "little":
+            return view.tobytes()
+        values = array("f", view.tobytes())
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+def base64_encode_many(vectors: Iterable) -> List[bytes]:
+    """
+    Encodes each vector - either a list of floats or a buffer of float32 values as
+    accepted by 'float32_bytes' - in the same manner as 'base64_encode', returning
+    the ASCII bytes of each encoding so that they can be written to a request body
+    without being decoded to a string first.
+    """
+    encoded = []
+    for vector in vectors:
+        data = float32_bytes(vector)
+        if len(data) % 4:
+            raise ValueError("Vector buffer length must be a multiple of 4 bytes.")
+        header = struct.pack("<ii", 0, len(data) // 4)
+        encoded.append(binascii.b2a_base64(header + data, newline=False))
+    return encoded
+
+
+def _numpy():
+    """
+    Returns the numpy module if it can be imported, and None otherwise; numpy is
+    imported when first needed so that importing this module remains fast.
+    """
+    global _NUMPY
+    if _NUMPY is None:
+        try:
+            import numpy
+
+            _NUMPY = numpy
+        except ImportError:
+            _NUMPY = False
+    return _NUMPY or None
+
+
+def _decode_floats(encoded_vector: Union[str, bytes]) -> bytes:
+    """
+    Returns the little-endian float32 bytes of an encoded vector after validating
+    its header.
+    """
+    buffer = base64.b64decode(encoded_vector)
+    if len(buffer) < 8:
+        raise ValueError("Buffer is too short to contain version and dimensions.")
+    version, dimensions = struct.unpack_from("<ii", buffer)
+    if version != 0:
+        raise ValueError(f"Unsupported vector version: {version}")
+    end = 8 + 4 * dimensions
+    if len(buffer) < end:
+        raise ValueError(
+            f"Buffer is too short for the specified dimensions: expected {end}, got {len(buffer)}"
+        )
+    return buffer[8:end]
+
+
+def decode_matrix(encoded_vectors: Iterable[Union[str, bytes]]):
+    """
+    Decodes many vectors, each encoded as described by 'base64_encode', into a
+    matrix with a row for each vector. Every vector must have the same number of
+    dimensions.
+
+    When NumPy is installed, a contiguous and writable float32 NumPy array with a
+    shape of (vectors, dimensions) is returned; otherwise, a list containing a list of
+    floats for each vector is returned.
+    """
+    rows = [_decode_floats(encoded) for encoded in encoded_vectors]
+    dimensions = len(rows[0]) // 4 if rows else 0
+    for row in rows:
+        if len(row) // 4 != dimensions:
+            raise ValueError(
+                f"Every vector must have {dimensions} dimensions; found {len(row) // 4}"
+            )
+    numpy = _numpy()
+    if numpy is not None:
+        # frombuffer returns a read-only view of the bytes, so the copy made by astype
+        # allows the matrix to be modified in place, such as when normalizing it.
+        matrix = numpy.frombuffer(b"".join(rows), dtype="<f4")
+        return matrix.reshape(len(rows), dimensions).astype(numpy.float32)
+    values = array("f", b"".join(rows))
+    if sys.byteorder == "big":
+        values.byteswap()
+    values = values.tolist()
+    return [values[i : i + dimensions] for i in range(0, len(values), dimensions)]
+
+
+def _query_vector(query):
+    """
+    Returns a query vector - either a list of floats, an encoded vector, or a NumPy
+    array - in the form used by the scoring functions.
+    """
+    if isinstance(query, (str, bytes)):
+        query = base64_decode(query)
+    numpy = _numpy()
+    if numpy is not None:
+        return numpy.asarray(query, dtype=numpy.float32)
+    return list(query)
+
+
+def _matrix(matrix):
+    """
+    Returns a matrix - as returned by 'decode_matrix', a list of lists of floats, or
+    a list of encoded vectors as strings or as the bytes returned by
+    'base64_encode_many' - in the form used by the scoring functions.
+    """
+    if (
+        isinstance(matrix, (list, tuple))
+        and matrix
+        and isinstance(matrix[0], (str, bytes))
+    ):
+        return decode_matrix(matrix)
+    numpy = _numpy()
+    if numpy is not None:
+        return numpy.asarray(matrix, dtype=numpy.float32)
+    return matrix
+
+
+def dot_product(query, matrix):
+    """
+    Returns the dot product of the query vector with each row of the matrix.
+
+    :param query: a list of floats, an encoded vector, or a NumPy array.
+    :param matrix: a matrix as returned by 'decode_matrix', a list of lists of
+    floats, or a list of encoded vectors as strings or bytes.
+    :return: a NumPy array of scores when NumPy is installed, and a list otherwise.
+    """
+    query, matrix = _query_vector(query), _matrix(matrix)
+    if _numpy() is not None:
+        return matrix @ query
+    return [math.fsum(map(operator.mul, row, query)) for row in matrix]
+
+
+def cosine_similarity(query, matrix):
+    """
+    Returns the cosine similarity of the query vector with each row of the matrix,
+    with a similarity of zero for a vector whose magnitude is zero. See
+    'dot_product' for the accepted arguments.
+    """
+    query, matrix = _query_vector(query), _matrix(matrix)
+    numpy = _numpy()
+    if numpy is not None:
+        norms = numpy.linalg.norm(matrix, axis=1) * numpy.linalg.norm(query)
+        dots = matrix @ query
+        return numpy.divide(dots, norms, out=numpy.zeros_like(dots), where=norms != 0)
+    query_norm = math.sqrt(math.fsum(value * value for value in query))
+    scores = []
+    for row in matrix:
+        norm = math.sqrt(math.fsum(value * value for value in row)) * query_norm
+        dot = math.fsum(map(operator.mul, row, query))
+        scores.append(dot / norm if norm else 0.0)
+    return scores
+
+
+def euclidean_distance(query, matrix):
+    """
+    Returns the Euclidean distance between the query vector and each row of the
+    matrix. See 'dot_product' for the accepted arguments.
+    """
+    query, matrix = _query_vector(query), _matrix(matrix)
+    numpy = _numpy()
+    if numpy is not None:
+        return numpy.linalg.norm(matrix - query, axis=1)
+    return [math.dist(row, query) for row in matrix]
+
+
+def top_k(scores, k: int, largest: bool = True) -> List[tuple]:
+    """
+    Returns a list of (index, score) tuples for the k best scores, ordered from best
+    to worst. The largest scores are best by default; set 'largest' to False when
+    the scores are distances. Equal scores are ordered by index, with or without
+    NumPy.
+    """
+    numpy = _numpy()
+    if numpy is not None and not isinstance(scores, list):
+        values = numpy.asarray(scores)
+        k = min(k, len(values))
+        if k <= 0:
+            return []
+        ordered = -values if largest else values
+        indexes = numpy.argsort(ordered, kind="stable")[:k]
+        return [(int(i), float(values[i])) for i in indexes]
+    select = heapq.nlargest if largest else heapq.nsmallest
+    return [
+        (i, float(score))
+        for i, score in select(k, enumerate(scores), key=lambda item: item[1])
+    ]
@@ -40,6 +40,16 @@ def ssl_client():
     )
 
 
+@pytest.fixture
+def http2_client():
+    return Client(BASE_URL, digest=("python-test-user", "password"), http2=True)
+
+
+@pytest.fixture
+def profiled_client():
+    return Client(BASE_URL, digest=("python-test-user", "password"), profile=True)
+
+
 @pytest.fixture
 def client_with_props():
     return Client(host="localhost", port=8030, username="admin", password="admin")
@@ -0,0 +1,100 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+from marklogic import Client
+from marklogic.documents import DefaultMetadata, Document
+
+DEFAULT_METADATA = DefaultMetadata(
+    permissions={"python-tester": ["read", "update"]}, collections=["transform-test"]
+)
+
+
+def test_apply_rest_transform(client: Client):
+    __write_docs(client, 25)
+
+    progress = list(
+        client.documents.apply_transform(
+            transform="envelope", collections=["transform-test"], batch_size=10
+        )
+    )
+
+    assert 3 == len(progress)
+    assert all(p.ok for p in progress)
+    assert 25 == progress[-1].processed
+    msg = "The checkpoint should be the last URI in the URI lexicon"
+    assert "/temp/transform/doc9.json" == progress[-1].checkpoint, msg
+
+    docs = client.documents.search(
+        collections=["transform-test"],
+        page_length=30,
+        categories=["content", "metadata"],
+    )
+    assert 25 == len(docs)
+    for doc in docs:
+        assert "envelope" in doc.content, "The REST transform should have been applied"
+        assert ["transform-test"] == doc.collections, "Metadata should be retained"
+
+
+def test_apply_invoked_module(client: Client):
+    __write_docs(client, 5)
+
+    progress = list(
+        client.documents.apply_transform(
+            module="/mark_reviewed.sjs",
+            params={"reviewer": "python"},
+            q="world",
+            collections=["transform-test"],
+            batch_size=2,
+            thread_count=2,
+        )
+    )
+
+    assert 5 == progress[-1].processed
+    for doc in client.documents.search(collections=["transform-test"]):
+        assert "python" == doc.content["reviewer"]
+
+
+def test_resume_from_checkpoint(client: Client):
+    __write_docs(client, 10)
+
+    progress = list(
+        client.documents.apply_transform(
+            transform="envelope",
+            collections=["transform-test"],
+            checkpoint="/temp/transform/doc4.json",
+        )
+    )
+
+    assert 5 == progress[-1].processed
+    transformed = [
+        doc.uri
+        for doc in client.documents.search(collections=["transform-test"])
+        if "envelope" in doc.content
+    ]
+    assert 5 == len(transformed)
+    assert "/temp/transform/doc3.json" not in transformed
+
+
+def test_failed_batch(client: Client):
+    __write_docs(client, 3)
+
+    progress = list(
+        client.documents.apply_transform(
+            transform="doesnt-exist", collections=["transform-test"]
+        )
+    )
+
+    assert 1 == len(progress)
+    assert not progress[0].ok
+    assert 3 == progress[0].failed
+    assert 500 == progress[0].failure.response.status_code
+
+
+def __write_docs(client: Client, count: int):
+    client.documents.write(
+        [DEFAULT_METADATA]
+        + [
+            Document(f"/temp/transform/doc{i}.json", {"hello": "world", "i": i})
+            for i in range(count)
+        ]
+    )
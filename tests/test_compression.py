@@ -0,0 +1,134 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+import gzip
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from requests_toolbelt.multipart.decoder import MultipartDecoder
+from urllib3.fields import RequestField
+from urllib3.filepost import encode_multipart_formdata
+
+from marklogic import Client
+from marklogic.internal import multipart
+from marklogic.internal.multipart import parse_parts
+
+BOUNDARY = "test-boundary"
+BOUNDARY_TYPE = f"multipart/mixed; boundary={BOUNDARY}"
+
+
+def _multipart_body() -> bytes:
+    fields = []
+    for index in range(3):
+        field = RequestField(name=str(index), data=b"\r\n-" * index + b"content")
+        field.make_multipart(
+            content_disposition=f'attachment; filename="/doc{index}.bin"; category=content',
+            content_type="application/octet-stream",
+        )
+        fields.append(field)
+    return encode_multipart_formdata(fields, boundary=BOUNDARY)[0]
+
+
+def test_accept_encoding():
+    default = requests.utils.default_headers()["Accept-Encoding"]
+    assert default == Client("http://localhost:8030").headers["Accept-Encoding"]
+    client = Client("http://localhost:8030", compression=False)
+    assert "identity" == client.headers["Accept-Encoding"]
+    client = Client("http://localhost:8030", compression="gzip")
+    assert "gzip" == client.headers["Accept-Encoding"]
+
+
+@pytest.fixture
+def gzip_server():
+    """
+    A local HTTP/1.1 server that returns a multipart body of documents for any
+    request, compressed via gzip when the request accepts it, and that records the
+    Accept-Encoding header of each request.
+    """
+    accept_encodings = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            accept_encoding = self.headers.get("Accept-Encoding", "")
+            accept_encodings.append(accept_encoding)
+            body = _multipart_body()
+            self.send_response(200)
+            self.send_header("Content-Type", BOUNDARY_TYPE)
+            if "gzip" in accept_encoding:
+                body = gzip.compress(body)
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    server.accept_encodings = accept_encodings
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_read_gzip_response_while_streaming(gzip_server, monkeypatch):
+    received = []
+    receive = multipart._receive
+
+    def recording_receive(response, chunk_size):
+        assert "gzip" == response.headers["Content-Encoding"]
+        for chunk in receive(response, chunk_size):
+            received.append(chunk)
+            yield chunk
+
+    monkeypatch.setattr(multipart, "_receive", recording_receive)
+    client = Client(gzip_server.url, auth=("user", "password"), compression="gzip")
+    docs = client.documents.read(["/doc0.bin", "/doc1.bin", "/doc2.bin"])
+
+    assert ["gzip"] == gzip_server.accept_encodings
+    assert [b"content", b"\r\n-content", b"\r\n-\r\n-content"] == [
+        doc.content for doc in docs
+    ]
+    assert _multipart_body() == b"".join(received), "Chunks should be decompressed"
+
+
+def test_read_without_compression(gzip_server):
+    client = Client(gzip_server.url, auth=("user", "password"), compression=False)
+    docs = client.documents.read(["/doc0.bin", "/doc1.bin", "/doc2.bin"])
+
+    assert ["identity"] == gzip_server.accept_encodings
+    assert 3 == len(docs)
+
+
+def test_parts_match_when_split_across_chunks():
+    body = _multipart_body()
+    expected = [part.content for part in MultipartDecoder(body, BOUNDARY_TYPE).parts]
+    assert 3 == len(expected)
+
+    for size in (1, 2, 7, len(body)):
+        chunks = [body[i : i + size] for i in range(0, len(body), size)]
+        parts = list(parse_parts(chunks, BOUNDARY.encode()))
+        assert expected == [part.content for part in parts]
+        assert b"/doc2.bin" in parts[2].headers[b"content-disposition"]
+
+
+def test_parts_of_decompressed_stream():
+    body = _multipart_body()
+    compressed = gzip.compress(body)
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    chunks = (
+        decompressor.decompress(compressed[i : i + 16])
+        for i in range(0, len(compressed), 16)
+    )
+    parts = list(parse_parts(chunks, BOUNDARY.encode()))
+    assert [b"content", b"\r\n-content", b"\r\n-\r\n-content"] == [
+        part.content for part in parts
+    ]
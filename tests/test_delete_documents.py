@@ -0,0 +1,88 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+import threading
+
+from marklogic import Client
+from marklogic.documents import Document
+
+DEFAULT_PERMS = {"python-tester": ["read", "update"]}
+
+
+def test_delete_many_documents(client: Client):
+    uris = [f"/temp/delete/doc{i}.json" for i in range(50)]
+    client.documents.write(
+        [Document(uri, {"doc": uri}, permissions=DEFAULT_PERMS) for uri in uris]
+    )
+    assert 50 == len(client.documents.read(uris))
+
+    # A small URL length ensures that the URIs are split across many requests.
+    result = client.documents.delete(uris, max_url_length=300)
+
+    assert result.ok
+    assert sorted(uris) == sorted(result.succeeded)
+    assert 0 == len(client.documents.read(uris))
+
+
+def test_delete_single_uri(client: Client):
+    client.documents.write(Document("/temp/doc1.json", {}, permissions=DEFAULT_PERMS))
+
+    result = client.documents.delete("/temp/doc1.json")
+
+    assert ["/temp/doc1.json"] == result.succeeded
+    assert 0 == len(client.documents.read("/temp/doc1.json"))
+
+
+def test_delete_in_transaction(client: Client):
+    client.documents.write(Document("/temp/doc1.json", {}, permissions=DEFAULT_PERMS))
+
+    with client.transactions.create() as tx:
+        assert client.documents.delete("/temp/doc1.json", tx=tx).ok
+        msg = "The delete should not be visible outside the transaction"
+        assert 1 == len(client.documents.read("/temp/doc1.json")), msg
+
+    assert 0 == len(client.documents.read("/temp/doc1.json"))
+
+
+def test_delete_many_in_transaction_uses_calling_thread(client: Client):
+    uris = [f"/temp/delete/doc{i}.json" for i in range(20)]
+    client.documents.write(
+        [Document(uri, {"doc": uri}, permissions=DEFAULT_PERMS) for uri in uris]
+    )
+    threads = set()
+    client.hooks["response"].append(
+        lambda response, **kwargs: threads.add(threading.get_ident())
+    )
+
+    with client.transactions.create() as tx:
+        result = client.documents.delete(
+            uris, tx=tx, thread_count=8, max_url_length=300
+        )
+        assert result.ok
+
+    msg = "The requests of a transaction share a connection, so they are not parallel"
+    assert {threading.get_ident()} == threads, msg
+    assert 0 == len(client.documents.read(uris))
+
+
+def test_delete_metadata_only(client: Client):
+    client.documents.write(
+        Document("/temp/doc1.json", {}, permissions=DEFAULT_PERMS, collections=["c1"])
+    )
+
+    result = client.documents.delete("/temp/doc1.json", categories=["collections"])
+
+    assert result.ok
+    doc = client.documents.read("/temp/doc1.json", categories=["content", "metadata"])[
+        0
+    ]
+    assert doc.collections == []
+
+
+def test_delete_without_permission(not_rest_user_client: Client):
+    result = not_rest_user_client.documents.delete(["/doc1.json", "/doc2.xml"])
+
+    assert not result.ok
+    assert ["/doc1.json", "/doc2.xml"] == result.failed
+    failure = result.failures_by_uri["/doc1.json"]
+    assert 403 == failure.response.status_code
@@ -3,7 +3,7 @@
 
 import decimal
 
-from marklogic.documents import Document
+from marklogic.documents import CompactDocument, Document
 from pytest import raises
 from requests_toolbelt.multipart.decoder import MultipartDecoder
 
@@ -73,6 +73,14 @@ def test_javascript_specific_primitives(client):
     } == parts[2].content
 
 
+def test_compact_documents(client):
+    parts = client.eval(javascript="fn.head(cts.search('Armstrong'))", compact=True)
+    assert type(parts[0]) is CompactDocument
+    assert "/musicians/musician1.json" == parts[0].uri
+    assert "Armstrong" == parts[0].content["musician"]["lastName"]
+    assert parts[0].collections is None
+
+
 def test_xquery_with_return_response(client):
     response = client.eval(xquery="('A', 1, 1.1, fn:false())", return_response=True)
     assert 200 == response.status_code
@@ -0,0 +1,63 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+from pytest import raises
+
+from marklogic import Client
+from marklogic.documents import Document
+
+
+def test_javascript_batch(client: Client):
+    results = client.eval_batch(
+        [
+            "xdmp.arrayValues([1, 'two', {'three': 3}])",
+            ("word1 + ' ' + word2", {"word1": "hello", "word2": "world"}),
+            "fn.doc('/musicians/musician1.json')",
+            "xdmp.arrayValues([])",
+        ]
+    )
+
+    assert 4 == len(results)
+    assert all(result.ok for result in results)
+    assert [1, "two", {"three": 3}] == results[0].values
+    assert ["hello world"] == results[1].values
+    doc = results[2].values[0]
+    assert type(doc) is Document
+    assert "/musicians/musician1.json" == doc.uri
+    assert results[3].values is None
+
+
+def test_xquery_batch(client: Client):
+    results = client.eval_batch(
+        [
+            "(1, 'two')",
+            (
+                "declare variable $word external; fn:upper-case($word)",
+                {"word": "hello"},
+            ),
+        ],
+        language="xquery",
+    )
+
+    assert [1, "two"] == results[0].values
+    assert ["HELLO"] == results[1].values
+
+
+def test_errors_are_isolated(client: Client):
+    results = client.eval_batch(["'first'", "fn.error(xs.QName('OOPS'))", "'third'"])
+
+    assert ["first"] == results[0].values
+    assert not results[1].ok
+    assert results[1].values is None
+    assert "OOPS" in results[1].error["name"]
+    assert ["third"] == results[2].values
+
+
+def test_invalid_language(client: Client):
+    with raises(ValueError, match="Invalid value for 'language' argument: sql"):
+        client.eval_batch(["select 1"], language="sql")
+
+
+def test_return_response(client: Client):
+    response = client.eval_batch(["1", "2"], return_response=True)
+    assert 200 == response.status_code
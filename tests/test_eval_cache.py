@@ -0,0 +1,102 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+import threading
+
+from marklogic import Client
+from marklogic.internal.cache import TTLCache
+
+VARS = {"word1": "hello", "word2": "world"}
+
+
+def test_cached_invoke(client: Client):
+    first = client.invoke("/simple_vars.sjs", VARS, cache_ttl=60)
+    # The order of the vars should not affect the cache key.
+    second = client.invoke(
+        "/simple_vars.sjs", {"word2": "world", "word1": "hello"}, cache_ttl=60
+    )
+
+    assert ["hello", "world", "hello world"] == first
+    assert first == second
+    stats = client.eval_cache.stats()
+    assert 1 == stats["hits"]
+    assert 1 == stats["misses"]
+
+
+def test_uncached_by_default(client: Client):
+    client.invoke("/simple_vars.sjs", VARS)
+    client.eval(javascript="xdmp.random()")
+    assert 0 == client.eval_cache.stats()["size"]
+
+
+def test_cached_eval(client: Client):
+    first = client.eval(javascript="xdmp.random()", cache_ttl=60)
+    second = client.eval(javascript="xdmp.random()", cache_ttl=60)
+    assert first == second, "The second call should return the cached result"
+
+    assert 1 == client.invalidate_eval_cache(javascript="xdmp.random()")
+    third = client.eval(javascript="xdmp.random()", cache_ttl=60)
+    assert first != third
+
+
+def test_concurrent_calls_are_coalesced(client: Client):
+    results = []
+
+    def invoke():
+        results.append(client.invoke("/simple_vars.sjs", VARS, cache_ttl=60))
+
+    threads = [threading.Thread(target=invoke) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert 10 == len(results)
+    stats = client.eval_cache.stats()
+    assert 1 == stats["size"]
+    assert 9 == stats["hits"] + stats["coalesced"], "Only one request should be sent"
+
+
+def test_errors_are_not_cached(client: Client):
+    response = client.eval(javascript="invalid script", cache_ttl=60)
+    assert 500 == response.status_code
+    assert 0 == client.eval_cache.stats()["size"]
+
+
+def test_invalidate_by_module_and_vars(client: Client):
+    client.invoke("/simple_vars.sjs", VARS, cache_ttl=60)
+    client.invoke("/simple_vars.sjs", {"word1": "a", "word2": "b"}, cache_ttl=60)
+    client.invoke("/simple.sjs", cache_ttl=60)
+
+    assert 1 == client.invalidate_eval_cache(module="/simple_vars.sjs", vars=VARS)
+    assert 1 == client.invalidate_eval_cache(module="/simple_vars.sjs")
+    assert 1 == client.invalidate_eval_cache()
+
+
+def test_return_response_is_not_cached(client: Client):
+    first = client.eval(javascript="xdmp.random()", cache_ttl=60, return_response=True)
+    second = client.eval(javascript="xdmp.random()", cache_ttl=60, return_response=True)
+    assert first is not second
+    assert 0 == client.eval_cache.stats()["size"]
+
+
+def test_load_in_progress_during_invalidation_is_not_cached():
+    cache = TTLCache()
+    loading = threading.Event()
+    invalidated = threading.Event()
+
+    def load():
+        loading.set()
+        invalidated.wait()
+        return "stale"
+
+    thread = threading.Thread(target=cache.get_or_load, args=("key", load, 60))
+    thread.start()
+    loading.wait()
+    cache.invalidate()
+    invalidated.set()
+    thread.join()
+
+    assert cache.get("key") is None
+    assert "fresh" == cache.get_or_load("key", lambda: "fresh", 60)
+    assert "fresh" == cache.get("key")
@@ -0,0 +1,86 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+import json
+import tarfile
+import zipfile
+
+from marklogic import Client
+from marklogic.documents import Document
+from marklogic.export import DocumentExporter, main
+
+DEFAULT_PERMS = {"python-tester": ["read", "update"]}
+
+
+def test_export_collection_to_directory(client: Client, tmp_path):
+    result = DocumentExporter(
+        client.documents, str(tmp_path / "out"), metadata=True, batch_size=2
+    ).export(collections=["search-test"])
+
+    assert result.ok
+    assert 4 == len(result.succeeded)
+    content = (tmp_path / "out" / "doc1.json").read_bytes()
+    assert "hello" in json.loads(content)
+    metadata = json.loads((tmp_path / "out" / "doc1.json.metadata.json").read_text())
+    assert "search-test" in metadata["collections"]
+    assert "<hello>" in (tmp_path / "out" / "doc2.xml").read_text()
+
+
+def test_export_uris_to_archives(client: Client, tmp_path):
+    uris = ["/doc1.json", "/doc2.xml", "/does-not-exist.json"]
+
+    zip_path = str(tmp_path / "export.zip")
+    result = DocumentExporter(client.documents, zip_path, batch_size=1).export(uris)
+    assert result.ok
+    assert ["/doc1.json", "/doc2.xml"] == sorted(result.succeeded)
+    assert ["doc1.json", "doc2.xml"] == sorted(zipfile.ZipFile(zip_path).namelist())
+
+    tar_path = str(tmp_path / "export.tar.gz")
+    DocumentExporter(client.documents, tar_path, metadata=True).export(uris)
+    assert [
+        "doc1.json",
+        "doc1.json.metadata.json",
+        "doc2.xml",
+        "doc2.xml.metadata.json",
+    ] == sorted(tarfile.open(tar_path).getnames())
+
+
+def test_export_to_ndjson(client: Client, tmp_path):
+    client.documents.write(
+        [
+            Document("/temp/export/a.json", {"a": 1}, permissions=DEFAULT_PERMS),
+            Document("/temp/export/b.bin", b"\x00\x01", permissions=DEFAULT_PERMS),
+        ]
+    )
+    target = tmp_path / "export.ndjson"
+
+    DocumentExporter(client.documents, str(target), metadata=True).export(
+        ["/temp/export/a.json", "/temp/export/b.bin"]
+    )
+
+    lines = [json.loads(line) for line in target.read_text().splitlines()]
+    by_uri = {line["uri"]: line for line in lines}
+    assert {"a": 1} == by_uri["/temp/export/a.json"]["content"]
+    assert "python-tester" in json.dumps(by_uri["/temp/export/a.json"]["metadata"])
+    assert "AAE=" == by_uri["/temp/export/b.bin"]["content"]
+    assert "base64" == by_uri["/temp/export/b.bin"]["encoding"]
+
+
+def test_cli(tmp_path):
+    target = tmp_path / "cli.zip"
+    status = main(
+        [
+            str(target),
+            "--collection",
+            "search-test",
+            "--port",
+            "8030",
+            "--username",
+            "python-test-user",
+            "--password",
+            "password",
+            "--quiet",
+        ]
+    )
+    assert 0 == status
+    assert 4 == len(zipfile.ZipFile(target).namelist())
@@ -0,0 +1,134 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from requests.exceptions import ConnectTimeout
+
+from marklogic import Client
+from marklogic.documents import Document
+from tests.conftest import BASE_URL
+
+# The HTTP/2 transport is only available when the "http2" extra is installed.
+pytest.importorskip("httpx")
+
+
+def test_write_and_read(http2_client: Client):
+    response = http2_client.documents.write(
+        Document(
+            "/http2/doc1.json",
+            {"hello": "world"},
+            permissions={"rest-reader": "read", "rest-writer": "update"},
+        )
+    )
+    assert 200 == response.status_code
+
+    docs = http2_client.documents.read("/http2/doc1.json")
+    assert 1 == len(docs)
+    assert {"hello": "world"} == docs[0].content
+
+
+def test_rows_and_eval(http2_client: Client):
+    rows = http2_client.rows.query(
+        'op.fromView("test","musician").orderBy(op.col("lastName"))'
+    )
+    assert 4 == len(rows["rows"])
+
+    assert [1, "two"] == http2_client.eval(javascript="xdmp.arrayValues([1, 'two'])")
+
+
+def test_parallel_reads(http2_client: Client):
+    from concurrent.futures import ThreadPoolExecutor
+
+    uris = [f"/musicians/musician{i}.json" for i in range(1, 5)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(http2_client.documents.read, uris * 5))
+    assert all(1 == len(docs) for docs in results)
+
+
+def test_basic_auth():
+    client = Client(BASE_URL, auth=("python-test-user", "password"), http2=True)
+    response = client.get("v1/search", headers={"Accept": "application/json"})
+    assert 200 == response.status_code
+
+
+def test_verify_false():
+    client = Client(
+        host="localhost",
+        scheme="https",
+        port=8031,
+        digest=("python-test-user", "password"),
+        verify=False,
+        http2=True,
+    )
+    response = client.get("v1/search", headers={"Accept": "application/json"})
+    assert 200 == response.status_code
+    assert 10 == response.json()["page-length"]
+
+
+def test_streamed_response(http2_client: Client):
+    response = http2_client.get(
+        "v1/documents", params={"uri": "/musicians/musician1.json"}, stream=True
+    )
+    content = b"".join(response.iter_content(16))
+    assert b"Armstrong" in content
+
+
+@pytest.fixture
+def local_server():
+    """
+    A local HTTP/1.1 server that waits for the number of seconds in the "X-Delay"
+    header of each request before responding with the request's target, which is an
+    absolute URL when the request is sent via a proxy.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            time.sleep(float(self.headers.get("X-Delay", 0)))
+            body = self.path.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_proxies_are_used(local_server, monkeypatch):
+    client = Client("http://example.org", auth=("user", "password"), http2=True)
+    response = client.get("/v1/ping", proxies={"http": local_server.url})
+    assert "http://example.org/v1/ping" == response.text
+
+    monkeypatch.setenv("HTTP_PROXY", local_server.url)
+    response = client.get("/v1/ping")
+    assert "http://example.org/v1/ping" == response.text, "Env proxies should apply"
+
+
+def test_pool_timeout_is_a_connect_timeout(local_server):
+    client = Client(
+        local_server.url, auth=("user", "password"), http2=True, max_connections=1
+    )
+    thread = threading.Thread(
+        target=client.get, args=("/a",), kwargs={"headers": {"X-Delay": "1"}}
+    )
+    thread.start()
+    time.sleep(0.2)
+    try:
+        with pytest.raises(ConnectTimeout):
+            client.get("/b", timeout=0.3)
+    finally:
+        thread.join()
@@ -0,0 +1,75 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+import logging
+import subprocess
+import sys
+
+logger = logging.getLogger(__name__)
+
+# Modules that are only needed for working with documents or eval/invoke responses,
+# and thus should not be imported when only querying for rows.
+LAZY_MODULES = [
+    "decimal",
+    "marklogic.internal.multipart",
+    "concurrent.futures",
+    "marklogic.documents",
+    "marklogic.internal.eval",
+]
+
+
+def test_rows_do_not_import_codecs():
+    script = f"""
+import sys
+from marklogic import Client
+client = Client("http://localhost:8030", digest=("python-test-user", "password"))
+data = client.rows.query(sql="select * from test.musician")
+assert type(data) is dict, f"The query should have succeeded: {{data}}"
+assert 4 == len(data["rows"])
+imported = [m for m in {LAZY_MODULES!r} if m in sys.modules]
+assert not imported, f"Unexpectedly imported: {{imported}}"
+"""
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+
+def test_documents_import_codecs_on_first_use():
+    script = """
+import sys
+from marklogic import Client
+client = Client("http://localhost:8030", digest=("python-test-user", "password"))
+assert "marklogic.internal.multipart" not in sys.modules
+client.documents.read("/doc1.json")
+assert "marklogic.internal.multipart" in sys.modules
+"""
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+
+def test_import_time():
+    """
+    Uses "python -X importtime" to measure the cumulative time, in microseconds, of
+    importing the marklogic package. The threshold is intentionally generous, as its
+    purpose is to catch a regression such as a large library being imported eagerly,
+    not to benchmark a particular machine.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import marklogic"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_time, name = line.split("|")
+        if cumulative_time.strip().isdigit():
+            cumulative[name.strip()] = int(cumulative_time)
+
+    marklogic_time = cumulative["marklogic"]
+    requests_time = cumulative["requests"]
+    logger.info(f"Import time of marklogic: {marklogic_time}us")
+    logger.info(f"Import time of requests: {requests_time}us")
+    for module in LAZY_MODULES:
+        assert module not in cumulative, f"{module} should not be imported eagerly"
+    msg = "Beyond requests, importing marklogic should be a small fraction of the cost"
+    assert marklogic_time - requests_time < requests_time, msg
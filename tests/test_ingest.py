@@ -0,0 +1,107 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+import json
+
+from marklogic import Client
+from marklogic.documents import DefaultMetadata
+from marklogic.ingest import FileIngester
+
+DEFAULT_METADATA = DefaultMetadata(
+    permissions={"python-tester": ["read", "update"]}, collections=["ingest-test"]
+)
+
+
+def test_ingest_directory(client: Client, tmp_path):
+    __make_files(tmp_path)
+    batches = []
+
+    ingester = FileIngester(
+        client.documents,
+        uri_function=lambda path: f"/temp/ingest/{path}",
+        metadata=DEFAULT_METADATA,
+        batch_size=3,
+    )
+    result = ingester.ingest(str(tmp_path), on_batch=batches.append)
+
+    assert result.ok
+    assert 7 == len(result.succeeded)
+    assert 3 == len(batches)
+
+    docs = client.documents.read(
+        [
+            "/temp/ingest/doc0.json",
+            "/temp/ingest/xml/doc.xml",
+            "/temp/ingest/bin/big.bin",
+        ]
+    )
+    assert 3 == len(docs)
+    doc = next(doc for doc in docs if doc.uri == "/temp/ingest/doc0.json")
+    assert {"doc": 0} == doc.content
+    doc = next(doc for doc in docs if doc.uri == "/temp/ingest/xml/doc.xml")
+    assert "<hello>world</hello>" in doc.content
+    doc = next(doc for doc in docs if doc.uri == "/temp/ingest/bin/big.bin")
+    assert b"x" * 1000 == doc.content, "Binary content should be written as-is"
+
+
+def test_ingest_glob(client: Client, tmp_path):
+    __make_files(tmp_path)
+
+    result = FileIngester(client.documents, metadata=DEFAULT_METADATA).ingest(
+        str(tmp_path / "**" / "*.json")
+    )
+
+    assert 5 == len(result.succeeded)
+    assert "/doc0.json" in result.succeeded
+
+
+def test_glob_retains_directories(client: Client, tmp_path):
+    for name in ["a", "b"]:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "x.json").write_text(json.dumps({"dir": name}))
+
+    result = FileIngester(
+        client.documents,
+        uri_function=lambda path: f"/temp/ingest/{path}",
+        metadata=DEFAULT_METADATA,
+    ).ingest(str(tmp_path / "**" / "*.json"))
+
+    assert ["/temp/ingest/a/x.json", "/temp/ingest/b/x.json"] == sorted(
+        result.succeeded
+    )
+
+
+def test_resume_with_journal(client: Client, tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    __make_files(data)
+    (data / "invalid.json").write_text("not valid JSON")
+    journal = str(tmp_path / "journal.txt")
+
+    ingester = FileIngester(
+        client.documents,
+        uri_function=lambda path: f"/temp/ingest/{path}",
+        metadata=DEFAULT_METADATA,
+        batch_size=1,
+        journal=journal,
+    )
+    result = ingester.ingest(str(data))
+    assert 7 == len(result.succeeded)
+    assert ["/temp/ingest/invalid.json"] == result.failed
+
+    (data / "invalid.json").write_text('{"now": "valid"}')
+    result = ingester.ingest(str(data))
+    msg = "Only the file that failed should be written when ingesting again"
+    assert ["/temp/ingest/invalid.json"] == result.succeeded, msg
+    assert 8 == len(
+        client.documents.search(collections=["ingest-test"], page_length=20)
+    )
+
+
+def __make_files(directory):
+    for i in range(5):
+        (directory / f"doc{i}.json").write_text(json.dumps({"doc": i}))
+    (directory / "xml").mkdir()
+    (directory / "xml" / "doc.xml").write_text("<hello>world</hello>")
+    (directory / "bin").mkdir()
+    (directory / "bin" / "big.bin").write_bytes(b"x" * 1000)
@@ -0,0 +1,134 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+import json
+import time
+
+from pytest import raises
+
+from marklogic import Client
+from marklogic.documents import DefaultMetadata
+from marklogic.load import _shard_by_size, load, main
+
+CLIENT_ARGS = {
+    "base_url": "http://localhost:8030",
+    "digest": ("python-test-user", "password"),
+}
+
+
+def test_load_with_many_processes(client: Client, tmp_path):
+    data = tmp_path / "data"
+    __make_files(data, 20)
+    updates = []
+
+    progress = load(
+        str(data),
+        CLIENT_ARGS,
+        processes=3,
+        uri_prefix="/temp/load/",
+        metadata=DefaultMetadata(
+            permissions={"python-tester": ["read", "update"]}, collections=["load-test"]
+        ),
+        batch_size=4,
+        on_progress=lambda p: updates.append(p.documents),
+    )
+
+    assert progress.ok
+    assert 20 == progress.documents == progress.total_documents
+    assert progress.bytes == progress.total_bytes
+    assert updates[-1] == 20
+    docs = client.documents.search(collections=["load-test"], page_length=50)
+    assert 20 == len(docs)
+    assert "/temp/load/sub/doc0.json" in [doc.uri for doc in docs]
+
+
+def test_worker_error_is_not_ok(tmp_path):
+    data = tmp_path / "data"
+    __make_files(data, 4)
+
+    progress = load(str(data), {"no_such_argument": True}, processes=2)
+
+    assert not progress.ok
+    assert 2 == len(progress.errors)
+    assert "TypeError" in progress.errors[0]
+    assert 0 == progress.documents
+
+
+def test_interrupted_load_does_not_wait_for_workers(client: Client, tmp_path):
+    """
+    Once the parent process stops reading the queue, workers writing many small
+    batches fill it and would block forever, so they must be terminated.
+    """
+    data = tmp_path / "data"
+    __make_files(data, 3000)
+
+    def on_progress(progress):
+        time.sleep(1)
+        # Stands in for a KeyboardInterrupt.
+        raise RuntimeError("Interrupted")
+
+    started = time.monotonic()
+    with raises(RuntimeError, match="Interrupted"):
+        load(
+            str(data),
+            CLIENT_ARGS,
+            processes=2,
+            uri_prefix="/temp/load/",
+            metadata=DefaultMetadata(permissions={"python-tester": ["read", "update"]}),
+            batch_size=1,
+            on_progress=on_progress,
+        )
+    assert time.monotonic() - started < 30
+
+
+def test_resume_and_log_failures(client: Client, tmp_path):
+    data = tmp_path / "data"
+    __make_files(data, 6)
+    (data / "invalid.json").write_text("not valid JSON")
+    journal = str(tmp_path / "journal")
+    failures_log = tmp_path / "failures.txt"
+    args = [
+        str(data),
+        "--port",
+        "8030",
+        "--username",
+        "python-test-user",
+        "--password",
+        "password",
+        "--processes",
+        "2",
+        "--batch-size",
+        "1",
+        "--uri-prefix",
+        "/temp/load/",
+        "--collection",
+        "load-test",
+        "--permission",
+        "python-tester=read,update",
+        "--journal",
+        journal,
+        "--failures-log",
+        str(failures_log),
+        "--quiet",
+    ]
+
+    assert 1 == main(args), "The invalid file should cause a failure"
+    failure = json.loads(failures_log.read_text().splitlines()[0])
+    assert ["/temp/load/invalid.json"] == failure["uris"]
+
+    (data / "invalid.json").write_text('{"now": "valid"}')
+    assert 0 == main(args[:-1] + ["--processes", "3", "--quiet"])
+    assert 7 == len(client.documents.search(collections=["load-test"]))
+
+
+def test_shard_by_size():
+    files = [(f"f{i}", f"f{i}", size) for i, size in enumerate([100, 1, 1, 50, 50])]
+    shards = _shard_by_size(files, 2)
+    assert [["f0", "f1"], ["f2", "f3", "f4"]] == [[f[0] for f in s] for s in shards]
+
+
+def __make_files(directory, count):
+    (directory / "sub").mkdir(parents=True)
+    for i in range(count):
+        folder = directory / "sub" if i % 2 == 0 else directory
+        (folder / f"doc{i}.json").write_text(json.dumps({"doc": i}))
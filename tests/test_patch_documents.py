@@ -0,0 +1,54 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+from marklogic import Client
+from marklogic.documents import Document
+
+DEFAULT_PERMS = {"python-tester": ["read", "update"]}
+
+
+def test_patch_single_document(client: Client):
+    client.documents.write(
+        Document("/temp/doc1.json", {"hello": "world"}, permissions=DEFAULT_PERMS)
+    )
+
+    response = client.documents.patch(
+        "/temp/doc1.json",
+        {"patch": [{"replace": {"select": "/hello", "content": "python"}}]},
+    )
+
+    assert 204 == response.status_code
+    assert {"hello": "python"} == client.documents.read("/temp/doc1.json")[0].content
+
+
+def test_patch_many_documents(client: Client):
+    uris = [f"/temp/patch/doc{i}.json" for i in range(10)]
+    client.documents.write(
+        [Document(uri, {"count": 0}, permissions=DEFAULT_PERMS) for uri in uris]
+    )
+
+    result = client.documents.patch(
+        uris + ["/temp/patch/doesnt-exist.json"],
+        '{"patch": [{"replace": {"select": "/count", "content": 1}}]}',
+    )
+
+    assert sorted(uris) == sorted(result.succeeded)
+    assert ["/temp/patch/doesnt-exist.json"] == result.failed
+    for doc in client.documents.read(uris):
+        assert {"count": 1} == doc.content
+
+
+def test_patch_xml_document(client: Client):
+    client.documents.write(
+        Document("/temp/doc1.xml", "<hello>world</hello>", permissions=DEFAULT_PERMS)
+    )
+
+    response = client.documents.patch(
+        "/temp/doc1.xml",
+        """<rapi:patch xmlns:rapi="http://marklogic.com/rest-api">
+        <rapi:replace select="/hello"><hello>python</hello></rapi:replace>
+        </rapi:patch>""",
+    )
+
+    assert 204 == response.status_code
+    assert "<hello>python</hello>" in client.documents.read("/temp/doc1.xml")[0].content
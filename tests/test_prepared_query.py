@@ -0,0 +1,65 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+from marklogic import Client
+
+PARAM_QUERY = (
+    'op.fromView("test", "musician").where(op.eq(op.col("lastName"), op.param("name")))'
+)
+
+
+def test_query_with_bindings(client: Client):
+    data = client.rows.query(dsl=PARAM_QUERY, bindings={"name": "Armstrong"})
+    assert 1 == len(data["rows"])
+    assert "Louis" == data["rows"][0]["test.musician.firstName"]["value"]
+
+
+def test_prepared_query(client: Client):
+    query = client.rows.prepare(dsl=PARAM_QUERY)
+
+    for name in ["Armstrong", "Davis", "Coltrane"]:
+        data = query.query({"name": name})
+        assert 1 == len(data["rows"])
+        assert name == data["rows"][0]["test.musician.lastName"]["value"]
+
+    assert 0 == client.rows.result_cache.stats()["size"], "No TTL means no caching"
+
+
+def test_prepared_sql_with_format(client: Client):
+    query = client.rows.prepare(
+        sql="select * from musician order by lastName", format="csv"
+    )
+    data = query.query()
+    assert 5 == len(data.split("\n"))
+    assert "Armstrong,Louis,1901-08-04" in data
+
+
+def test_cached_results(client: Client):
+    query = client.rows.prepare(dsl=PARAM_QUERY, cache_ttl=60)
+
+    first = query.query({"name": "Armstrong"})
+    second = query.query({"name": "Armstrong"})
+    query.query({"name": "Davis"})
+
+    assert first == second
+    stats = client.rows.result_cache.stats()
+    assert 1 == stats["hits"]
+    assert 2 == stats["misses"]
+    assert 2 == stats["size"]
+
+    assert 2 == query.invalidate()
+    query.query({"name": "Armstrong"})
+    assert 3 == client.rows.result_cache.stats()["misses"]
+
+
+def test_cache_eviction(client: Client):
+    client.rows.result_cache.max_size = 1
+    query = client.rows.prepare(dsl=PARAM_QUERY, cache_ttl=60)
+
+    query.query({"name": "Armstrong"})
+    query.query({"name": "Davis"})
+    query.query({"name": "Armstrong"})
+
+    stats = client.rows.result_cache.stats()
+    assert 0 == stats["hits"], "Armstrong should have been evicted by Davis"
+    assert 2 == stats["evictions"]
@@ -0,0 +1,72 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+import json
+import time
+
+from marklogic import Client
+from marklogic.documents import Document
+from marklogic.profiling import Profiler
+
+DEFAULT_PERMS = {"python-tester": ["read", "update"]}
+
+
+def test_profile_documents(profiled_client: Client):
+    client = profiled_client
+    client.documents.write(
+        Document("/temp/profiled.json", {"hello": "world"}, permissions=DEFAULT_PERMS)
+    )
+    docs = client.documents.read(
+        "/temp/profiled.json", categories=["content", "metadata"]
+    )
+    assert docs[0].content == {"hello": "world"}
+
+    report = client.profiler.report()
+    assert list(report.keys()) == [
+        "request_build",
+        "auth",
+        "send",
+        "receive",
+        "multipart_decode",
+        "content_parse",
+        "metadata_parse",
+    ]
+    assert report["multipart_decode"]["calls"] == 1
+    assert report["content_parse"]["calls"] == 1
+    assert report["metadata_parse"]["calls"] == 1
+    assert report["send"]["bytes"] > 0, "The written document should be counted"
+    assert report["receive"]["bytes"] > 0
+    for stats in report.values():
+        assert stats["wall_seconds"] >= 0
+
+    assert json.loads(client.profiler.to_json()) == report
+    client.profiler.reset()
+    assert client.profiler.report() == {}
+
+
+def test_profile_rows(profiled_client: Client):
+    data = profiled_client.rows.query('op.fromView("test", "musician")')
+    assert type(data) is dict, f"The query should have succeeded: {data}"
+    assert 4 == len(data["rows"])
+    report = profiled_client.profiler.report()
+    assert report["content_parse"]["calls"] == 1
+    assert "multipart_decode" not in report
+
+
+def test_not_profiled_by_default(client: Client):
+    assert client.profiler is None
+    client.documents.read("/doc1.json")
+
+
+def test_nested_stages_are_exclusive():
+    profiler = Profiler()
+    with profiler.stage("outer"):
+        time.sleep(0.05)
+        with profiler.stage("inner", 10) as frame:
+            time.sleep(0.05)
+            frame.bytes += 5
+
+    report = profiler.report()
+    assert report["inner"]["bytes"] == 15
+    assert 0.05 <= report["inner"]["wall_seconds"] < 0.1
+    assert 0.05 <= report["outer"]["wall_seconds"] < 0.1
@@ -0,0 +1,51 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+from marklogic import Client
+
+OPTIONS = {"constraint": [{"name": "c1", "value": {"element": {"name": "hello"}}}]}
+
+
+def test_register_and_search(admin_client: Client, client: Client):
+    name = admin_client.query_options.register("python-registered-options", OPTIONS)
+    try:
+        assert name == "python-registered-options"
+        assert admin_client.query_options.is_registered(name)
+
+        docs = client.documents.search(q="c1:world", options=name)
+        assert len(docs) == 1
+        assert docs[0].uri == "/doc2.xml"
+    finally:
+        assert admin_client.query_options.delete(name).status_code == 204
+    assert not admin_client.query_options.is_registered(name)
+
+
+def test_register_uploads_only_on_change(admin_client: Client):
+    sent = []
+    admin_client.hooks["response"].append(lambda r, *args, **kwargs: sent.append(r))
+    manager = admin_client.query_options
+    name = "python-registered-options"
+    try:
+        manager.register(name, OPTIONS)
+        manager.register(name, {"options": OPTIONS})
+        assert len(sent) == 1, "The same options should not be uploaded again"
+
+        xml = (
+            "<options xmlns='http://marklogic.com/appservices/search'>"
+            "<constraint name='c1'><word><element ns='' name='hello'/></word>"
+            "</constraint></options>"
+        )
+        manager.register(name, xml)
+        assert len(sent) == 2, "Changed options should be uploaded"
+
+        manager.forget(name)
+        manager.register(name, xml)
+        assert len(sent) == 3, "Forgotten options should be uploaded again"
+    finally:
+        manager.delete(name)
+
+
+def test_register_without_rest_admin(client: Client):
+    response = client.query_options.register("python-registered-options", OPTIONS)
+    assert response.status_code == 403
+    assert not client.query_options.is_registered("python-registered-options")
@@ -4,7 +4,7 @@
 from requests import Response
 
 from marklogic import Client
-from marklogic.documents import Document
+from marklogic.documents import CompactDocument, Document
 
 DEFAULT_PERMS = {"python-tester": ["read", "update"]}
 
@@ -115,6 +115,50 @@ def test_read_only_collections(client: Client):
     assert doc2.properties is None
 
 
+def test_read_compact(client: Client):
+    docs = client.documents.read(
+        ["/doc1.json", "/doc2.xml"], categories=["content", "metadata"], compact=True
+    )
+    assert 2 == len(docs)
+
+    doc1 = docs[0]
+    assert type(doc1) is CompactDocument
+    assert "/doc1.json" == doc1.uri
+    assert {"hello": "world"} == doc1.content
+    assert "application/json" == doc1.content_type
+    assert "test-data" in doc1.collections
+    assert "read" in doc1.permissions["python-tester"]
+    assert doc1.metadata["collections"] == doc1.collections
+
+    assert "/doc2.xml" == docs[1].uri
+    assert "<hello>world</hello>" in docs[1].content
+
+
+def test_compact_document_is_a_document():
+    doc = CompactDocument("/a.json", {}, raw_metadata=b'{"collections": ["c1"]}')
+    assert isinstance(doc, Document)
+
+    doc.version_id = "123"
+    doc.temporal_document = "/logical.json"
+    disposition = doc.to_request_field().headers["Content-Disposition"]
+    assert "versionId=123" in disposition
+    assert "temporal-document=/logical.json" in disposition
+    assert ["c1"] == doc.collections
+
+
+def test_write_compact_document(client: Client):
+    doc = client.documents.read("/doc1.json", categories=["content"], compact=True)[0]
+    doc.uri = "/temp/compact-copy.json"
+    doc.permissions = DEFAULT_PERMS
+    doc.collections = ["compact"]
+
+    assert 200 == client.documents.write(doc).status_code
+
+    copy = client.documents.read(doc.uri, categories=["content", "collections"])[0]
+    assert {"hello": "world"} == copy.content
+    assert ["compact"] == copy.collections
+
+
 def test_with_accept_header(client: Client):
     """
     Verifies that any Accept header provided by the user will be ignored, as it's
@@ -2,6 +2,7 @@
 
 
 from pytest import raises
+from requests import HTTPError
 from marklogic.documents import Document
 import uuid
 
@@ -51,6 +52,46 @@ def test_dsl_csv(client):
     verify_four_musicians_are_returned_in_csv(data)
 
 
+def test_query_csv(client):
+    rows = list(client.rows.query_csv(dsl_query, chunk_size=16))
+    assert 4 == len(rows)
+    assert ["Armstrong", "Louis", "1901-08-04"] == list(rows[0].values())[:3]
+    assert "test.musician.lastName" in rows[0]
+
+
+def test_query_csv_with_non_ascii_value(client):
+    query = 'op.fromLiterals([{"name": "Zoë Ørsted – 東京"}])'
+    rows = list(client.rows.query_csv(query, chunk_size=3))
+    assert [{"name": "Zoë Ørsted – 東京"}] == rows
+
+
+def test_query_csv_with_types(client):
+    year = 'op.call("http://www.w3.org/2005/xpath-functions", "year-from-date", op.col("dob"))'
+    query = (
+        'op.fromView("test","musician").orderBy(op.col("lastName"))'
+        f'.select([op.col("lastName"), op.as("year", {year})])'
+    )
+    rows = list(client.rows.query_csv(query, infer_types=True))
+    assert [1901, 1958, 1926, 1926] == [row["year"] for row in rows]
+
+    rows = list(client.rows.query_csv(query, types={"year": str}))
+    assert "1901" == rows[0]["year"]
+
+
+def test_export_csv(client, tmp_path):
+    path = tmp_path / "musicians.csv"
+    count = client.rows.export_csv(path, dsl_query)
+
+    data = path.read_bytes()
+    assert count == len(data)
+    verify_four_musicians_are_returned_in_csv(data.decode("utf-8"))
+
+
+def test_query_csv_error(client):
+    with raises(HTTPError):
+        list(client.rows.query_csv('op.fromView("test","not-a-view")'))
+
+
 def test_dsl_json_seq(client):
     data = client.rows.query(dsl_query, format="json-seq")
     verify_four_musicians_are_returned_in_json_seq(data)
@@ -75,3 +75,66 @@ def test_update_via_serialized_plan(client):
     assert 200 == response.status_code
     docs = client.documents.read(DOC_URI)
     assert 0 == len(docs)
+
+
+def test_write_doc_descriptors(client):
+    perms = {"python-tester": ["read", "update"]}
+    docs = (
+        Document(f"/temp/descriptors/doc{i}.json", {"doc": i}, permissions=perms)
+        for i in range(25)
+    )
+    descriptor = {
+        "uri": "/temp/descriptors/from-dict.json",
+        "doc": json.dumps({"doc": "dict"}),
+        "permissions": [
+            {"capability": "read", "roleName": "python-tester"},
+            {"capability": "update", "roleName": "python-tester"},
+        ],
+        "collections": ["descriptors"],
+    }
+
+    result = client.rows.write_doc_descriptors(
+        list(docs) + [descriptor], batch_size=10, thread_count=2
+    )
+
+    assert result.ok
+    assert 26 == len(result.succeeded)
+    docs = client.documents.read(
+        result.succeeded, categories=["content", "collections"]
+    )
+    assert 26 == len(docs)
+    doc = next(d for d in docs if d.uri == "/temp/descriptors/from-dict.json")
+    assert {"doc": "dict"} == doc.content
+    assert ["descriptors"] == doc.collections
+
+
+def test_write_doc_descriptors_with_failure(client):
+    descriptors = [
+        {
+            "uri": f"/temp/descriptors/doc{i}.json",
+            "doc": json.dumps({"doc": i}),
+            "permissions": [{"capability": "update", "roleName": "python-tester"}],
+        }
+        for i in range(6)
+    ]
+    descriptors[4]["permissions"] = [{"capability": "read", "roleName": "no-such-role"}]
+
+    result = client.rows.write_doc_descriptors(descriptors, batch_size=3)
+
+    assert [f"/temp/descriptors/doc{i}.json" for i in range(3)] == result.succeeded
+    assert [f"/temp/descriptors/doc{i}.json" for i in range(3, 6)] == result.failed
+    assert not result.failures[0].response.ok
+
+
+def test_write_doc_descriptors_with_binary_content(client):
+    perms = {"python-tester": ["read", "update"]}
+    docs = [
+        Document("/temp/descriptors/doc0.json", {"doc": 0}, permissions=perms),
+        Document("/temp/descriptors/doc1.bin", b"\xff\x00", permissions=perms),
+    ]
+
+    result = client.rows.write_doc_descriptors(docs, batch_size=1)
+
+    assert ["/temp/descriptors/doc0.json"] == result.succeeded
+    assert ["/temp/descriptors/doc1.bin"] == result.failed
+    assert isinstance(result.failures[0].error, ValueError)
@@ -0,0 +1,77 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+import json
+
+from requests import Response
+
+from marklogic import Client
+from marklogic.search import SearchResponse
+
+
+def test_search_summary(client: Client):
+    summary = client.documents.search_summary(q="world")
+    assert summary.total == 2
+    assert len(summary.results) == 2
+    assert sorted(summary.uris) == sorted(result.uri for result in summary.results)
+    for result in summary.results:
+        assert result.score is not None
+        assert len(result.snippets) > 0
+
+
+def test_search_summary_with_options_and_page_length(client: Client):
+    summary = client.documents.search_summary(
+        q="hello:world", options="test-options", page_length=1
+    )
+    assert summary.total == 1
+    assert summary.page_length == 1
+    assert summary.uris == ["/doc2.xml"]
+
+
+def test_search_summary_facets_view(client: Client):
+    summary = client.documents.search_summary(q="world", view="facets")
+    assert summary.total == 2
+    assert summary.results == [], "The facets view should not include any results"
+
+
+def test_search_summary_with_original_response(client: Client):
+    response = client.documents.search_summary(q="world", return_response=True)
+    assert response.status_code == 200
+    assert response.headers["Content-type"].startswith("application/json")
+
+
+def test_estimate(client: Client):
+    assert 2 == client.documents.estimate("world")
+    assert 4 == client.documents.estimate(collections=["search-test"])
+    assert 0 == client.documents.estimate(
+        query={"query": {"term-query": {"text": "no matches"}}}
+    )
+
+
+def test_estimate_not_rest_user(not_rest_user_client: Client):
+    response = not_rest_user_client.documents.estimate("hello")
+    assert response.status_code == 403
+
+
+def test_facets():
+    response = Response()
+    response.status_code = 200
+    response._content = json.dumps(
+        {
+            "total": 4,
+            "facets": {
+                "color": {
+                    "type": "xs:string",
+                    "facetValues": [
+                        {"name": "red", "count": 3, "value": "red"},
+                        {"name": "blue", "count": 1, "value": "blue"},
+                    ],
+                }
+            },
+        }
+    ).encode("utf-8")
+
+    summary = SearchResponse(response)
+    assert summary.total == 4
+    assert summary.facets == {"color": {"red": 3, "blue": 1}}
+    assert summary.results == []
@@ -0,0 +1,75 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+import json
+
+from marklogic import Client
+from marklogic.documents import Document
+
+DEFAULT_PERMS = {"python-tester": ["read", "update"]}
+COLLECTION = "sync-test"
+
+
+def _write(client: Client, uri: str, content: dict) -> None:
+    client.documents.write(
+        Document(uri, content, permissions=DEFAULT_PERMS, collections=[COLLECTION])
+    )
+
+
+def test_sync_reads_only_changed_documents(client: Client, tmp_path):
+    for i in range(5):
+        _write(client, f"/temp/sync/{i}.json", {"value": i})
+    index = str(tmp_path / "index.json")
+    local = {}
+
+    def on_documents(docs):
+        local.update({doc.uri: doc.content for doc in docs})
+
+    def on_delete(uris):
+        for uri in uris:
+            del local[uri]
+
+    result = client.documents.sync(
+        index, on_documents, on_delete, collections=[COLLECTION], batch_size=2
+    )
+    assert result.ok
+    assert 5 == len(result.succeeded)
+    assert 0 == result.unchanged
+    assert 5 == len(local)
+    assert 5 == len(json.loads((tmp_path / "index.json").read_text())["versions"])
+
+    result = client.documents.sync(
+        index, on_documents, on_delete, collections=[COLLECTION]
+    )
+    assert [] == result.succeeded
+    assert 5 == result.unchanged
+
+    _write(client, "/temp/sync/1.json", {"value": "changed"})
+    _write(client, "/temp/sync/new.json", {"value": "new"})
+    client.documents.delete("/temp/sync/2.json")
+
+    result = client.documents.sync(
+        index, on_documents, on_delete, collections=[COLLECTION]
+    )
+    assert ["/temp/sync/1.json", "/temp/sync/new.json"] == sorted(result.succeeded)
+    assert ["/temp/sync/2.json"] == result.deleted
+    assert 3 == result.unchanged
+    assert "changed" == local["/temp/sync/1.json"]["value"]
+    assert "/temp/sync/2.json" not in local
+
+
+def test_failed_batch_is_read_again(client: Client, tmp_path):
+    _write(client, "/temp/sync/a.json", {"value": "a"})
+    index = str(tmp_path / "index.json")
+
+    result = client.documents.sync(
+        index,
+        lambda docs: None,
+        collections=[COLLECTION],
+        categories=["not-a-category"],
+    )
+    assert not result.ok
+    assert ["/temp/sync/a.json"] == result.failed
+
+    result = client.documents.sync(index, lambda docs: None, collections=[COLLECTION])
+    assert ["/temp/sync/a.json"] == result.succeeded
@@ -0,0 +1,154 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from marklogic import Client
+
+THREAD_COUNT = 64
+REQUESTS_PER_THREAD = 25
+
+
+class _Server(ThreadingHTTPServer):
+    # Accepts every thread's connection at once instead of the default of 5.
+    request_queue_size = THREAD_COUNT * 2
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # A connection reset by a client that discarded it is expected.
+        pass
+
+
+class StubServer:
+    """
+    A local HTTP/1.1 server that echoes the "id" parameter of each request and tracks
+    the connections it receives, so that a Client can be exercised by many threads
+    without a MarkLogic server. A request whose bearer token is not the current token
+    receives a 401, and each call to the "/token" endpoint issues a new token.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.client_ports = set()
+        self.tokens_issued = 0
+        self.token = None
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                self.rfile.read(length)
+                if self.path.startswith("/token"):
+                    with stub.lock:
+                        stub.tokens_issued += 1
+                        stub.token = f"token-{stub.tokens_issued}"
+                        body = {"access_token": stub.token}
+                    return self._send(200, body)
+                self.do_GET()
+
+            def do_GET(self):
+                with stub.lock:
+                    stub.client_ports.add(self.client_address[1])
+                    token = stub.token
+                authorization = self.headers.get("Authorization", "")
+                if token and authorization != f"Bearer {token}":
+                    return self._send(401, {"message": "Expired token"})
+                params = parse_qs(urlparse(self.path).query)
+                self._send(200, {"id": params.get("id", [None])[0]})
+
+            def _send(self, status, body):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = _Server(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def expire_token(self):
+        with self.lock:
+            self.token = "expired"
+
+
+@pytest.fixture
+def stub_server():
+    stub = StubServer()
+    thread = threading.Thread(target=stub.server.serve_forever, daemon=True)
+    thread.start()
+    yield stub
+    stub.server.shutdown()
+    stub.server.server_close()
+
+
+def _run_concurrently(function):
+    barrier = threading.Barrier(THREAD_COUNT)
+
+    def run(thread_id):
+        barrier.wait()
+        return function(thread_id)
+
+    with ThreadPoolExecutor(max_workers=THREAD_COUNT) as executor:
+        return list(executor.map(run, range(THREAD_COUNT)))
+
+
+def test_managers_are_shared_across_threads(stub_server):
+    client = Client(stub_server.url, auth=("user", "password"))
+    managers = _run_concurrently(
+        lambda i: (
+            client.documents,
+            client.rows,
+            client.transactions,
+            client.query_options,
+        )
+    )
+    assert len(set(managers)) == 1, "Every thread should see the same managers"
+
+
+def test_single_client_serves_many_threads(stub_server):
+    client = Client(
+        stub_server.url, auth=("user", "password"), max_connections=THREAD_COUNT
+    )
+
+    def send_requests(thread_id):
+        mismatches = 0
+        for i in range(REQUESTS_PER_THREAD):
+            expected = f"{thread_id}-{i}"
+            response = client.get("/v1/ping", params={"id": expected})
+            if response.status_code != 200 or response.json()["id"] != expected:
+                mismatches += 1
+        return mismatches
+
+    assert sum(_run_concurrently(send_requests)) == 0
+    assert (
+        len(stub_server.client_ports) <= THREAD_COUNT
+    ), "Connections should be reused via the shared pool rather than discarded"
+
+
+def test_cloud_token_renewed_once_by_many_threads(stub_server):
+    client = Client(
+        stub_server.url, cloud_api_key="some-key", max_connections=THREAD_COUNT
+    )
+    assert stub_server.tokens_issued == 1
+    stub_server.expire_token()
+
+    def send_request(thread_id):
+        response = client.get("/v1/ping", params={"id": str(thread_id)})
+        return response.status_code
+
+    assert set(_run_concurrently(send_request)) == {200}
+    assert (
+        stub_server.tokens_issued == 2
+    ), "Only the first thread to receive a 401 should generate a new token"
@@ -0,0 +1,136 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+import time
+
+from pytest import raises
+from requests.exceptions import ReadTimeout, Timeout
+
+from marklogic import Client
+from marklogic.documents import Document
+from marklogic.timeouts import (
+    CancellationToken,
+    Deadline,
+    DeadlineExceeded,
+    OperationCancelled,
+)
+from tests.conftest import BASE_URL
+
+DEFAULT_PERMS = {"python-tester": ["read", "update"]}
+
+
+def test_client_default_timeout():
+    client = Client(BASE_URL, digest=("python-test-user", "password"), timeout=0.5)
+    with raises(ReadTimeout):
+        client.eval(javascript="xdmp.sleep(2000)")
+
+    assert [1] == client.eval(javascript="1"), "Fast requests are unaffected"
+    msg = "A per-request timeout overrides the default"
+    assert client.eval(javascript="xdmp.sleep(1000); 1", timeout=5) == [1], msg
+
+
+def test_deadline_limits_request_timeout(client: Client):
+    start = time.monotonic()
+    with raises(Timeout):
+        client.eval(javascript="xdmp.sleep(3000)", deadline=0.5)
+    assert time.monotonic() - start < 2
+
+
+def test_expired_deadline(client: Client):
+    deadline = Deadline(0)
+    with raises(DeadlineExceeded):
+        client.documents.read("/musicians/musician1.json", deadline=deadline)
+
+
+def test_deadline_spans_batches(client: Client):
+    uris = [f"/temp/timeouts/doc{i}.json" for i in range(20)]
+    client.documents.write(
+        [Document(uri, {"doc": uri}, permissions=DEFAULT_PERMS) for uri in uris]
+    )
+
+    def slow_uris():
+        for index, uri in enumerate(uris):
+            if index == 5:
+                # Ensures the deadline passes after 5 requests have been sent.
+                time.sleep(1)
+            yield uri
+
+    with raises(DeadlineExceeded) as exc_info:
+        client.documents.patch(
+            slow_uris(),
+            {
+                "patch": [
+                    {
+                        "insert": {
+                            "context": "/doc",
+                            "position": "after",
+                            "content": {"a": 1},
+                        }
+                    }
+                ]
+            },
+            thread_count=1,
+            deadline=0.5,
+        )
+
+    result = exc_info.value.result
+    assert 5 == len(result.succeeded)
+    assert result.ok
+
+
+def test_cancellation(client: Client):
+    client.documents.write(
+        [
+            Document(
+                f"/temp/timeouts/doc{i}.json",
+                {"doc": i},
+                permissions=DEFAULT_PERMS,
+                collections=["timeouts-test"],
+            )
+            for i in range(20)
+        ]
+    )
+
+    token = CancellationToken()
+    progress = []
+    with raises(OperationCancelled):
+        for batch in client.documents.apply_transform(
+            module="/mark_reviewed.sjs",
+            params={"reviewer": "python"},
+            collections=["timeouts-test"],
+            batch_size=5,
+            thread_count=1,
+            cancellation=token,
+        ):
+            progress.append(batch)
+            token.cancel()
+
+    assert 1 == len(progress)
+    assert progress[0].ok
+    reviewed = client.documents.search(collections=["timeouts-test"], page_length=20)
+    assert 5 == len([doc for doc in reviewed if "reviewer" in doc.content])
+
+
+def test_cancelled_token_prevents_request(client: Client):
+    token = CancellationToken()
+    token.cancel()
+    with raises(OperationCancelled):
+        client.rows.query('op.fromView("test","musician")', cancellation=token)
+
+
+def test_cancelled_transactional_write_is_rolled_back(client: Client):
+    token = CancellationToken()
+
+    def documents():
+        for i in range(10):
+            if i == 5:
+                token.cancel()
+            yield Document(f"/temp/tx/doc{i}.json", {}, permissions=DEFAULT_PERMS)
+
+    with raises(OperationCancelled) as exc_info:
+        client.documents.write_in_transaction(
+            documents(), batch_size=2, cancellation=token
+        )
+
+    assert not exc_info.value.result.ok
+    assert 0 == len(client.documents.read([f"/temp/tx/doc{i}.json" for i in range(10)]))
@@ -2,6 +2,7 @@
 
 
 import requests
+import threading
 import time
 from marklogic import Client
 from marklogic.documents import Document
@@ -89,3 +90,81 @@ def test_database_and_name_args(client: Client):
         assert tx_name == status["transaction-status"]["transaction-name"]
 
     assert 1 == len(client.documents.read("/t1.json"))
+
+
+def test_concurrent_transactions(client: Client):
+    """
+    Verifies that many transactions can be used concurrently with a single client,
+    with each transaction sending its requests via its own connection and cookies.
+    """
+    errors = []
+    transactions = []
+
+    def write_in_transaction(index: int):
+        try:
+            with client.transactions.create() as tx:
+                transactions.append(tx)
+                # Stands in for the session-affinity cookie of a load balancer.
+                tx.cookies.set("affinity", tx.id)
+                for i in range(5):
+                    uri = f"/temp/tx{index}/doc{i}.json"
+                    client.documents.write(
+                        Document(uri, {}, permissions=PERMS), tx=tx
+                    ).raise_for_status()
+                uris = [f"/temp/tx{index}/doc{i}.json" for i in range(5)]
+                assert 5 == len(client.documents.read(uris, tx=tx))
+        except Exception as error:
+            errors.append(error)
+
+    threads = [
+        threading.Thread(target=write_in_transaction, args=(i,)) for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [] == errors
+    msg = "Each transaction should only send and receive its own cookies"
+    for tx in transactions:
+        assert tx.id == tx.cookies.get("affinity"), msg
+        for cookie in tx.cookies:
+            assert client.cookies.get(cookie.name) is None, msg
+    uris = [f"/temp/tx{index}/doc{i}.json" for index in range(8) for i in range(5)]
+    assert 40 == len(client.documents.read(uris))
+
+
+def test_transaction_cookies_are_sent(client: Client):
+    with client.transactions.create() as tx:
+        tx.cookies.set("python-test", "value")
+        response = client.documents.write(
+            Document("/t1.json", {}, permissions=PERMS), tx=tx
+        )
+        assert "python-test=value" in response.request.headers["Cookie"]
+
+
+def test_transaction_connection_is_reused(client: Client):
+    with client.transactions.create() as tx:
+        client.documents.write(Document("/t1.json", {}, permissions=PERMS), tx=tx)
+        adapter = tx._adapter
+        assert adapter is not None
+
+    with client.transactions.create() as tx:
+        client.documents.write(Document("/t2.json", {}, permissions=PERMS), tx=tx)
+        assert adapter is tx._adapter, "The connection should be leased again"
+
+
+def test_cookies_of_later_requests_stay_with_transaction(client: Client):
+    with client.transactions.create() as tx:
+        client.documents.write(Document("/t1.json", {}, permissions=PERMS), tx=tx)
+        tx.get_status()
+        assert 1 == len(client.documents.read("/t1.json", tx=tx))
+        names = [cookie.name for cookie in tx.cookies]
+        for name in names:
+            assert client.cookies.get(name) is None, f"{name} should not leak"
+
+    # A request outside the transaction must not be pinned to its host.
+    response = client.get("/v1/documents", params={"uri": "/t1.json"})
+    cookie_header = response.request.headers.get("Cookie", "")
+    for name in names:
+        assert f"{name}=" not in cookie_header
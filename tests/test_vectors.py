@@ -3,7 +3,22 @@
 
 import math
 import ast
-from marklogic.vectors import base64_encode, base64_decode
+from array import array
+
+from pytest import fixture, raises
+
+from marklogic import vectors
+from marklogic.documents import Document
+from marklogic.vectors import (
+    base64_encode,
+    base64_decode,
+    base64_encode_many,
+    cosine_similarity,
+    decode_matrix,
+    dot_product,
+    euclidean_distance,
+    top_k,
+)
 from marklogic import Client
 
 VECTOR = [3.14, 1.59, 2.65]
@@ -56,3 +71,120 @@ def test_encode_with_server_and_decode_with_python(client: Client):
     assert len(decoded) == len(VECTOR)
     for a, b in zip(decoded, VECTOR):
         assert math.isclose(a, b, abs_tol=ACCEPTABLE_DELTA)
+
+
+def test_encode_many():
+    buffer = array("f", VECTOR)
+    encoded = base64_encode_many([VECTOR, buffer, buffer.tobytes()])
+    assert [EXPECTED_BASE64.encode("ascii")] * 3 == encoded
+
+
+def test_encode_many_rejects_non_float32_buffer():
+    with raises(ValueError):
+        base64_encode_many([array("d", VECTOR)])
+
+
+def test_write_embeddings(client: Client):
+    perms = {"python-tester": ["read", "update"]}
+    docs = [
+        Document("/temp/embedding1.json", {"title": "one"}, permissions=perms),
+        Document("/temp/embedding2.json", None, permissions=perms),
+    ]
+    embeddings = [VECTOR, array("f", [1.0, 2.0]).tobytes()]
+
+    response = client.documents.write_embeddings(docs, embeddings)
+    assert 200 == response.status_code
+    assert {"title": "one"} == docs[0].content, "The document should not be modified"
+
+    docs = client.documents.read(["/temp/embedding1.json", "/temp/embedding2.json"])
+    assert "one" == docs[0].content["title"]
+    assert EXPECTED_BASE64 == docs[0].content["embedding"]
+    assert [1.0, 2.0] == base64_decode(docs[1].content["embedding"])
+
+    # Verifies that the server can decode the embedding as well.
+    dimension = client.eval(
+        javascript="vec.dimension(vec.base64Decode(cts.doc('/temp/embedding1.json').toObject().embedding))"
+    )
+    assert [3] == dimension
+
+
+def test_write_embeddings_count_mismatch(client: Client):
+    with raises(ValueError, match="Number of embeddings"):
+        client.documents.write_embeddings([Document("/temp/a.json", {})], [])
+
+
+@fixture(params=["numpy", "python"])
+def vector_impl(request, monkeypatch):
+    """
+    Runs a test once with NumPy, if it is installed, and once with the pure Python
+    fallback.
+    """
+    if request.param == "python":
+        monkeypatch.setattr(vectors, "_NUMPY", False)
+    return request.param
+
+
+MATRIX = [[1.0, 0.0], [0.0, 2.0], [3.0, 4.0], [0.0, 0.0]]
+
+
+def test_decode_matrix(vector_impl):
+    matrix = decode_matrix([base64_encode(vector) for vector in MATRIX])
+    assert len(matrix) == 4
+    assert [[float(value) for value in row] for row in matrix] == MATRIX
+    if vector_impl == "numpy" and vectors._numpy() is not None:
+        assert matrix.shape == (4, 2)
+        assert matrix.dtype == "float32"
+        assert matrix.flags["C_CONTIGUOUS"]
+
+
+def test_decode_matrix_rejects_mismatched_dimensions(vector_impl):
+    with raises(ValueError, match="Every vector must have 1 dimensions"):
+        decode_matrix([base64_encode([1.0]), base64_encode([1.0, 2.0])])
+
+
+def test_scores(vector_impl):
+    encoded = [base64_encode(vector) for vector in MATRIX]
+    matrix = decode_matrix(encoded)
+
+    scores = [float(s) for s in cosine_similarity([1.0, 0.0], matrix)]
+    assert [1.0, 0.0, 0.6, 0.0] == [round(s, 5) for s in scores]
+
+    assert [3.0, 8.0, 25.0, 0.0] == [float(s) for s in dot_product(encoded[2], encoded)]
+    assert [1.0, 2.0, 5.0, 0.0] == [
+        float(s) for s in euclidean_distance([0.0, 0.0], matrix)
+    ]
+
+
+def test_top_k(vector_impl):
+    matrix = decode_matrix([base64_encode(vector) for vector in MATRIX])
+
+    best = top_k(cosine_similarity([1.0, 2.0], matrix), 2)
+    assert [2, 1] == [index for index, score in best]
+    assert math.isclose(best[0][1], 0.98387, abs_tol=ACCEPTABLE_DELTA)
+
+    nearest = top_k(euclidean_distance([0.0, 0.0], matrix), 2, largest=False)
+    assert [(3, 0.0), (0, 1.0)] == nearest
+
+    assert 4 == len(top_k(dot_product([1.0, 1.0], matrix), 10))
+    assert [] == top_k(dot_product([1.0, 1.0], matrix), 0)
+
+
+def test_top_k_orders_ties_by_index(vector_impl):
+    matrix = decode_matrix([base64_encode(vector) for vector in MATRIX])
+    # Rows 0 and 1 have the same cosine similarity to the query.
+    best = top_k(cosine_similarity([1.0, 1.0], matrix), 3)
+    assert [2, 0, 1] == [index for index, score in best]
+
+    nearest = top_k(dot_product([0.0, 0.0], matrix), 2, largest=False)
+    assert [0, 1] == [index for index, score in nearest]
+
+
+def test_decoded_matrix_is_writable(vector_impl):
+    matrix = decode_matrix([base64_encode(vector) for vector in MATRIX])
+    matrix[2][0] = 6.0
+    assert 6.0 == float(matrix[2][0])
+
+
+def test_scores_of_encoded_bytes(vector_impl):
+    encoded = base64_encode_many(MATRIX)
+    assert [3.0, 8.0, 25.0, 0.0] == [float(s) for s in dot_product(encoded[2], encoded)]
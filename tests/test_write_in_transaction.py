@@ -0,0 +1,68 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+from marklogic import Client
+from marklogic.documents import DefaultMetadata, Document
+
+DEFAULT_METADATA = DefaultMetadata(
+    permissions={"python-tester": ["read", "update"]}, collections=["tx-bulk-test"]
+)
+
+
+def test_single_transaction(client: Client):
+    docs = (Document(f"/temp/tx/doc{i}.json", {"doc": i}) for i in range(25))
+
+    result = client.documents.write_in_transaction(
+        docs, metadata=DEFAULT_METADATA, batch_size=10
+    )
+
+    assert result.ok
+    assert 25 == len(result.succeeded)
+    assert 25 == __count_docs(client)
+
+
+def test_single_transaction_is_rolled_back(client: Client):
+    docs = [Document(f"/temp/tx/doc{i}.json", {"doc": i}) for i in range(25)]
+    docs[12].content = "invalid JSON"
+
+    result = client.documents.write_in_transaction(
+        docs, metadata=DEFAULT_METADATA, batch_size=10
+    )
+
+    assert not result.ok
+    assert 0 == len(result.succeeded)
+    assert 20 == len(result.failed), "The first two batches should have been written"
+    assert 400 == result.failures_by_uri["/temp/tx/doc12.json"].response.status_code
+    assert 0 == __count_docs(client), "The entire transaction should be rolled back"
+
+
+def test_commit_every(client: Client):
+    docs = [Document(f"/temp/tx/doc{i}.json", {"doc": i}) for i in range(25)]
+    docs[12].content = "invalid JSON"
+
+    result = client.documents.write_in_transaction(
+        docs, metadata=DEFAULT_METADATA, batch_size=5, commit_every=10
+    )
+
+    assert 20 == len(result.succeeded)
+    msg = "Only the failed batch should be rolled back, as it starts a transaction"
+    assert [f"/temp/tx/doc{i}.json" for i in range(10, 15)] == result.failed, msg
+    assert 20 == __count_docs(client)
+
+
+def test_time_limit(client: Client):
+    docs = (Document(f"/temp/tx/doc{i}.json", {"doc": i}) for i in range(20))
+
+    result = client.documents.write_in_transaction(
+        docs, metadata=DEFAULT_METADATA, batch_size=5, commit_every=20, time_limit=5
+    )
+
+    assert result.ok
+    assert 20 == __count_docs(client)
+
+
+def __count_docs(client: Client) -> int:
+    response = client.get(
+        "/v1/search", params={"collection": "tx-bulk-test", "format": "json"}
+    )
+    return response.json()["total"]
@@ -0,0 +1,90 @@
+# Copyright (c) 2023-2025 Progress Software Corporation and/or its subsidiaries or affiliates. All Rights Reserved.
+
+
+from marklogic import Client
+from marklogic.documents import DefaultMetadata, Document
+
+DEFAULT_METADATA = DefaultMetadata(
+    permissions={"python-tester": ["read", "update"]}, collections=["write-many"]
+)
+
+
+def test_write_many(client: Client):
+    docs = (Document(f"/temp/many/doc{i}.json", {"doc": i}) for i in range(250))
+
+    result = client.documents.write_many(docs, DEFAULT_METADATA, batch_size=100)
+
+    assert result.ok
+    assert 250 == len(result.succeeded)
+    assert 250 == len(
+        client.documents.search(collections=["write-many"], page_length=300)
+    )
+
+
+def test_invalid_document_is_isolated(client: Client):
+    docs = [Document(f"/temp/many/doc{i}.json", {"doc": i}) for i in range(50)]
+    docs[17] = Document("/temp/many/bad.xml", "<not-closed>")
+
+    result = client.documents.write_many(docs, DEFAULT_METADATA, batch_size=50)
+
+    assert ["/temp/many/bad.xml"] == result.failed
+    assert 49 == len(result.succeeded)
+    details = result.failures[0].details
+    assert 400 == details["statusCode"]
+    assert details["messageCode"].startswith("XDMP-")
+    assert 49 == len(
+        client.documents.search(collections=["write-many"], page_length=100)
+    )
+
+
+def test_many_invalid_documents(client: Client):
+    docs = []
+    for i in range(20):
+        if i % 5 == 0:
+            docs.append(Document(f"/temp/many/bad{i}.xml", "<not-closed>"))
+        else:
+            docs.append(Document(f"/temp/many/doc{i}.json", {"doc": i}))
+
+    result = client.documents.write_many(docs, DEFAULT_METADATA, batch_size=10)
+
+    assert sorted(f"/temp/many/bad{i}.xml" for i in [0, 5, 10, 15]) == sorted(
+        result.failed
+    )
+    assert 16 == len(result.succeeded)
+
+
+def test_without_isolation(client: Client):
+    docs = [Document(f"/temp/many/doc{i}.json", {"doc": i}) for i in range(10)]
+    docs[3] = Document("/temp/many/bad.xml", "<not-closed>")
+
+    result = client.documents.write_many(
+        docs, DEFAULT_METADATA, batch_size=5, isolate_failures=False
+    )
+
+    assert 5 == len(result.succeeded)
+    assert 1 == len(result.failures)
+    assert 5 == len(result.failures[0].uris)
+
+
+def test_params_and_headers_are_not_shared(client: Client):
+    """
+    Each batch sets its own multipart boundary in the Content-Type header, so batches
+    written in parallel must not share the headers - or params - passed by the caller.
+    """
+    docs = (Document(f"/temp/many/doc{i}.json", {"doc": i}) for i in range(100))
+    params = {"database": "python-client-test-content"}
+    headers = {"X-Test": "write-many"}
+
+    result = client.documents.write_many(
+        docs,
+        DEFAULT_METADATA,
+        batch_size=5,
+        thread_count=8,
+        params=params,
+        headers=headers,
+    )
+
+    assert result.ok, result.failures
+    assert 100 == len(result.succeeded)
+    assert {"database": "python-client-test-content"} == params
+    assert {"X-Test": "write-many"} == headers